@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Client-side Call Overhead
+เปรียบเทียบจำนวน calls/sec ของ call path เดิม (closure ใหม่ทุกครั้ง + uuid4 + dict)
+กับ fast path ปัจจุบัน (stub ที่ cache ไว้ + id แบบเลขเพิ่ม + ชื่อฟังก์ชัน encode ไว้แล้ว)
+
+วัด 2 แบบ:
+  - client only: ตัด network ออก (คืนคำตอบสำเร็จทันที) เพื่อวัดเฉพาะ overhead ฝั่ง Python
+  - end-to-end: ส่งจริงไปยัง MockCoppeliaSimServer ผ่าน tcp loopback
+
+Usage:
+    python benchmarks/bench_call_overhead.py --calls 200000
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cbor2 as cbor
+from coppelia_mock_server import MockCoppeliaSimServer
+from zmqRemoteApi import RemoteAPIClient
+
+_OK = cbor.dumps({'success': True, 'ret': None})
+
+class LegacyObject:
+    """RemoteAPIObject แบบเดิม: สร้าง closure ใหม่ทุกครั้งที่เข้าถึง attribute"""
+    def __init__(self, name, client):
+        self._name = name
+        self._client = client
+
+    def __getattr__(self, name):
+        def wrapper(*args):
+            full_func_name = f'{self._name}.{name}'
+            return self._client.legacy_call(full_func_name, args)
+        return wrapper
+
+class BenchClient(RemoteAPIClient):
+    """RemoteAPIClient ที่เลือกได้ว่าจะส่งจริงหรือคืนคำตอบทันที"""
+    def __init__(self, port, offline):
+        super().__init__(port=port)
+        self.offline = offline
+
+    def legacy_call(self, funcName, args):
+        msg = {'func': funcName, 'args': args, 'id': str(uuid.uuid4())}
+        response = self._request(msg)
+        if response.get('success', False):
+            return response.get('ret')
+        raise Exception(response.get('error'))
+
+    def _exchange(self, rawMsg, statsKey, timeout=None):
+        if self.offline:
+            return cbor.loads(_OK)
+        return super()._exchange(rawMsg, statsKey, timeout)
+
+def run(sim, handle, calls):
+    """จำลอง trajectory 20 Hz: setObjectPosition ต่อเนื่อง"""
+    start = time.perf_counter()
+    for i in range(calls):
+        sim.setObjectPosition(handle, -1, [i * 0.001, 0.0, 1.0])
+    return calls / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--calls', type=int, default=100000, help='calls for the client-only run')
+    parser.add_argument('--e2e-calls', type=int, default=10000, help='calls for the end-to-end run')
+    parser.add_argument('--port', type=int, default=23100)
+    args = parser.parse_args()
+
+    with MockCoppeliaSimServer(endpoint=f'tcp://127.0.0.1:{args.port}'):
+        for offline, calls in ((True, args.calls), (False, args.e2e_calls)):
+            client = BenchClient(args.port, offline)
+            handle = 1 if offline else client.getObject('sim').getObject('/Quadcopter')
+            legacy = run(LegacyObject('sim', client), handle, calls)
+            fast = run(client.getObject('sim'), handle, calls)
+            label = 'client only' if offline else 'end-to-end (tcp)'
+            print(f"{label:<18} legacy {legacy:>10,.0f} calls/s   fast {fast:>10,.0f} calls/s"
+                  f"   x{fast / legacy:.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Capture Completion Latency
+เปรียบเทียบเวลาตั้งแต่สั่งเก็บภาพจนได้ชื่อไฟล์ ระหว่างการวน getStringSignal
+ทุก 50 ms (เดิม) กับการเรียก captureImage ใน Lua script แบบ blocking
+
+ใช้ MockCoppeliaSimServer ที่จำลองเวลา render/บันทึกภาพด้วย --capture-delay
+
+Usage:
+    python benchmarks/bench_capture_latency.py --captures 200 --capture-delay 0.015
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from coppelia_mock_server import MockCoppeliaSimServer
+from zmqRemoteApi import RemoteAPIClient
+
+def run(server, camera, captures):
+    """เก็บภาพต่อเนื่อง คืน (latency ต่อภาพ, จำนวนคำสั่งต่อภาพ)"""
+    latencies = []
+    calls_before = server.calls
+    for _ in range(captures):
+        start = time.perf_counter()
+        camera.simcapture()
+        latencies.append(time.perf_counter() - start)
+    return np.array(latencies), (server.calls - calls_before) / captures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--port', type=int, default=23100)
+    parser.add_argument('--captures', type=int, default=200)
+    parser.add_argument('--capture-delay', type=float, default=0.015,
+                        help='seconds the camera script takes to save an image')
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        from drone_controller import DroneCamera
+
+    # DroneCamera สร้างโฟลเดอร์ภาพตาม path ใน config - ให้ไปอยู่ในโฟลเดอร์ชั่วคราว
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        with MockCoppeliaSimServer(endpoint=f'tcp://127.0.0.1:{args.port}',
+                                   capture_delay=args.capture_delay) as server:
+            client = RemoteAPIClient(port=args.port)
+            sim = client.getObject('sim')
+            drone = sim.getObject('/Quadcopter')
+            cases = [
+                ('signal polling', DroneCamera(sim)),
+                ('blocking call', DroneCamera(sim, script_handle=drone)),
+            ]
+
+            print(f"capture delay {args.capture_delay * 1000:.1f} ms, {args.captures} captures")
+            print(f"{'method':<16}{'p50':>10}{'p99':>10}{'max':>10}{'calls/img':>11}")
+            for label, camera in cases:
+                latencies, calls = run(server, camera, args.captures)
+                p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+                print(f"{label:<16}{p50:>8.1f}ms{p99:>8.1f}ms{latencies.max() * 1000:>8.1f}ms"
+                      f"{calls:>11.1f}")
+
+if __name__ == '__main__':
+    main()
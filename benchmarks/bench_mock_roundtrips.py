@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Round Trips vs Wall Time
+วัดว่าจำนวน round trip ไปยัง simulator ส่งผลต่อเวลาสร้างสนามและเวลาบินอย่างไร
+โดยใช้ MockCoppeliaSimServer แทน CoppeliaSim จริง (รันบน CI ได้)
+
+Usage:
+    python benchmarks/bench_mock_roundtrips.py --latency 0 0.001 0.005
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from coppelia_mock_server import MockCoppeliaSimServer
+from zmqRemoteApi import RemoteAPIClient
+
+# วิธีส่ง batch: (ชื่อ, ใช้ multi-call message, ใช้ Lua helper ใน sandbox script)
+# - 'sandbox script' คือทางที่ใช้กับ CoppeliaSim จริง (ไม่มี multi-call)
+FIELD_MODES = [
+    ('one call per trip', False, False),
+    ('sandbox script', False, True),
+    ('mock multi-call', True, True),
+]
+
+def run_field_build(port, latency, multicall, script):
+    """สร้างสนาม create_complete_field_with_fence แล้วคืน (เวลา, stats)"""
+    from create_field import FieldManager
+
+    with MockCoppeliaSimServer(endpoint=f'tcp://127.0.0.1:{port}', latency=latency) as server:
+        client = RemoteAPIClient(port=port)
+        client._batchSupported = multicall
+        if not script:
+            client._batchScript = False
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager = FieldManager(client=client)
+            client.reset_stats()
+            start = time.perf_counter()
+            manager.create_complete_field_with_fence()
+            elapsed = time.perf_counter() - start
+        return elapsed, client.stats(), server.calls
+
+def run_mission(port, latency, stepping):
+    """บินภารกิจสั้นๆ ด้วย NaturalDroneController แล้วคืน (เวลา, stats)"""
+    from drone_controller import NaturalDroneController
+
+    with MockCoppeliaSimServer(endpoint=f'tcp://127.0.0.1:{port}', latency=latency) as server:
+        client = RemoteAPIClient(port=port)
+        with contextlib.redirect_stdout(io.StringIO()):
+            drone = NaturalDroneController(use_simulation=True, client=client, stepping=stepping)
+            client.reset_stats()
+            start = time.perf_counter()
+            drone.takeoff(1.0)
+            drone.move_forward(1.0)
+            drone.rotate_clockwise(90)
+            drone.hover(2)
+            drone.land()
+            elapsed = time.perf_counter() - start
+        return elapsed, client.stats(), server.calls
+
+def report(label, elapsed, stats, server_calls):
+    print(f"{label:<34}{elapsed:>9.3f}s{stats['calls']:>8} trips{server_calls:>8} calls"
+          f"{stats['bytes_sent'] + stats['bytes_received']:>10} B")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--port', type=int, default=23100)
+    parser.add_argument('--latency', type=float, nargs='+', default=[0.0, 0.001, 0.005],
+                        help='artificial per-request latency in seconds')
+    parser.add_argument('--skip-mission', action='store_true', help='only benchmark field building')
+    args = parser.parse_args()
+
+    for latency in args.latency:
+        print(f"\n⏱️ latency {latency * 1e3:.1f} ms per round trip")
+        for name, multicall, script in FIELD_MODES:
+            report(f"field build ({name})", *run_field_build(args.port, latency, multicall, script))
+        if not args.skip_mission:
+            for stepping in (False, True):
+                label = f"mission ({'stepping' if stepping else 'real-time'})"
+                report(label, *run_mission(args.port, latency, stepping))
+
+if __name__ == '__main__':
+    main()
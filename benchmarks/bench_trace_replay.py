@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Client Overhead from a Recorded Trace
+เล่นซ้ำ trace ของการสร้างสนามด้วย TraceReplayServer แล้ววัดเวลาฝั่ง client
+โดยไม่มีเวลาประมวลผลของ simulator ปนอยู่
+
+ถ้าไม่ระบุ --trace จะบันทึก trace ใหม่จาก MockCoppeliaSimServer ก่อน
+(บันทึกจาก CoppeliaSim จริงด้วย client.start_recording() แล้วส่งไฟล์มาที่ --trace)
+
+Usage:
+    python benchmarks/bench_trace_replay.py --runs 5
+    python benchmarks/bench_trace_replay.py --trace field.rat
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from coppelia_mock_server import MockCoppeliaSimServer
+from remote_api_trace import TraceReplayServer, summarize
+from zmqRemoteApi import RemoteAPIClient
+
+def build_field(client):
+    from create_field import FieldManager
+
+    # ตำแหน่งลูกปิงปองสุ่ม - ใช้ seed เดิมทุกครั้งเพื่อให้ request ตรงกับ trace
+    random.seed(0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager = FieldManager(client=client)
+        manager.create_complete_field_with_fence()
+
+def record_trace(port, path):
+    """บันทึก trace การสร้างสนามจาก mock server"""
+    with MockCoppeliaSimServer(endpoint=f'tcp://127.0.0.1:{port}'):
+        client = RemoteAPIClient(port=port)
+        client.start_recording(path)
+        build_field(client)
+        return client.stop_recording()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--port', type=int, default=23100)
+    parser.add_argument('--trace', default=None, help='trace to replay (default: record one)')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    path = args.trace
+    if path is None:
+        path = os.path.join(tempfile.gettempdir(), 'bench_field_build.rat')
+        print(f"📼 recorded {record_trace(args.port, path)} calls to {path}")
+
+    summary = summarize(path)
+    print(f"📼 trace: {summary['records']} calls, {summary['elapsed']:.3f}s recorded, "
+          f"{summary['wait_total']:.3f}s waiting on server")
+
+    with TraceReplayServer(path, endpoint=f'tcp://127.0.0.1:{args.port}') as server:
+        for run in range(args.runs):
+            server.rewind()
+            client = RemoteAPIClient(port=args.port)
+            start = time.perf_counter()
+            build_field(client)
+            elapsed = time.perf_counter() - start
+            print(f"run {run + 1}: {elapsed:.3f}s ({server.served} replies, "
+                  f"{server.mismatches} mismatches)")
+            server.served = 0
+            server.mismatches = 0
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Transport Latency (tcp vs ipc vs inproc)
+วัด latency ของ sim.setObjectPosition หนึ่งคำสั่งผ่าน transport แต่ละแบบ
+กับ MockCoppeliaSimServer บนเครื่องเดียวกัน
+
+ipc:// ใช้ได้บน Linux/macOS เท่านั้น - บน Windows จะถูกข้าม
+
+Usage:
+    python benchmarks/bench_transport_latency.py --calls 20000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import zmq
+from coppelia_mock_server import MockCoppeliaSimServer
+from zmqRemoteApi import RemoteAPIClient
+
+def endpoints(port):
+    """(ชื่อ, endpoint ฝั่ง server, endpoint ฝั่ง client, ใช้ context ร่วมหรือไม่)"""
+    yield 'tcp loopback', f'tcp://127.0.0.1:{port}', f'tcp://127.0.0.1:{port}', False
+    if zmq.has('ipc'):
+        path = os.path.join(tempfile.gettempdir(), f'coppeliasim-bench-{port}')
+        yield 'ipc', f'ipc://{path}', f'ipc://{path}', False
+    yield 'inproc', 'inproc://coppeliasim-bench', 'inproc://coppeliasim-bench', True
+
+def run(server_endpoint, client_endpoint, shared, calls, warmup):
+    """ส่ง setObjectPosition ต่อเนื่องแล้วคืน (calls/sec, latency snapshot)"""
+    context = zmq.Context() if shared else None
+    with MockCoppeliaSimServer(endpoint=server_endpoint, context=context):
+        client = RemoteAPIClient(endpoint=client_endpoint, context=context)
+        sim = client.getObject('sim')
+        handle = sim.getObject('/Quadcopter')
+
+        for _ in range(warmup):
+            sim.setObjectPosition(handle, -1, [0.0, 0.0, 1.0])
+        client.reset_stats()
+
+        start = time.perf_counter()
+        for i in range(calls):
+            sim.setObjectPosition(handle, -1, [i * 1e-4, 0.0, 1.0])
+        elapsed = time.perf_counter() - start
+        latency = client.stats()['functions']['sim.setObjectPosition']
+
+        del sim, client
+    if context is not None:
+        context.term()
+    return calls / elapsed, latency
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--port', type=int, default=23100)
+    parser.add_argument('--calls', type=int, default=20000)
+    parser.add_argument('--warmup', type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'transport':<14}{'calls/s':>10}{'p50':>10}{'p99':>10}{'max':>10}")
+    for name, server_endpoint, client_endpoint, shared in endpoints(args.port):
+        rate, latency = run(server_endpoint, client_endpoint, shared, args.calls, args.warmup)
+        print(f"{name:<14}{rate:>10,.0f}{latency['p50'] * 1e6:>8.1f}us"
+              f"{latency['p99'] * 1e6:>8.1f}us{latency['max'] * 1e6:>8.1f}us")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Typed Array Encoding
+เปรียบเทียบเวลา encode/decode และขนาด message ของ trajectory ที่ส่งเป็น
+list ของ float (เดิม) กับ CBOR typed array (RFC 8746) จาก numpy array
+
+Usage:
+    python benchmarks/bench_typed_arrays.py --points 100 1000 10000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from zmqRemoteApi import _CallEncoder, _dumps, _loads
+
+def measure(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - start) / repeat, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--points', type=int, nargs='+', default=[100, 1000, 10000],
+                        help='trajectory lengths (x, y, z per point)')
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    plain = _CallEncoder()
+    typed = _CallEncoder(typedArrays=True)
+
+    print(f"{'points':>8}{'encoding':>14}{'encode':>12}{'decode':>12}{'bytes':>12}")
+    for points in args.points:
+        trajectory = np.random.default_rng(0).uniform(-2.5, 2.5, (points, 3))
+        cases = [
+            ('list', plain, trajectory.tolist()),
+            ('flat list', typed, trajectory.ravel().tolist()),
+            ('ndarray', typed, trajectory),
+        ]
+        for label, encoder, value in cases:
+            encode_time, raw = measure(
+                lambda: encoder.encode('sim.setObjectPosition', [value], 1), args.repeat)
+            decode_time, _ = measure(lambda: _loads(raw), args.repeat)
+            print(f"{points:>8}{label:>14}{encode_time * 1e6:>10.1f}us{decode_time * 1e6:>10.1f}us"
+                  f"{len(raw):>12}")
+
+    # ตรวจว่า decode กลับมาได้ค่าเดิม
+    sample = np.arange(12, dtype=np.float64).reshape(4, 3)
+    assert np.array_equal(_loads(_dumps(sample, typedArrays=True)), sample)
+
+if __name__ == '__main__':
+    main()
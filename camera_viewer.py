@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Camera Viewer
+แสดงภาพจากกล้อง (โดรนจริงหรือ simulator) ในหน้าต่าง OpenCV
+
+วาดใหม่เฉพาะเมื่อมีภาพใหม่ (sequence เพิ่มขึ้น) และไม่เกิน max_fps
+จึงไม่กิน CPU ทั้ง core เมื่อภาพไม่เปลี่ยน พร้อม overlay แสดง FPS ที่ได้จริงและ latency
+
+Usage:
+    # โดรนจริง
+    viewer = CameraViewer(drone.video_reader.read, title='Tello Camera Feed')
+
+    # simulator - ภาพจาก frame buffer ที่ FrameStream เติมให้
+    viewer = CameraViewer(buffer.wait, title='Front Camera')
+
+    viewer.start()   # หรือ viewer.run() ใน main thread
+    ...
+    viewer.stop()
+"""
+
+import threading
+import time
+from collections import deque
+
+import cv2
+
+try:
+    from config import GENERAL_CONFIG
+except ImportError:
+    GENERAL_CONFIG = {}
+
+class CameraViewer:
+    def __init__(self, source, title='Camera', max_fps=None, overlay=True, alive=None):
+        """
+        Args:
+            source: ฟังก์ชัน source(after, timeout) คืนภาพที่ sequence มากกว่า after หรือ None
+                    เมื่อหมดเวลา - ภาพต้องมี .image และ .sequence และเวลาที่ได้ภาพเป็น
+                    .received หรือ .timestamp (time.monotonic) เช่น TelloVideoReader.read
+                    หรือ FrameRingBuffer.wait
+            title: ชื่อหน้าต่าง
+            max_fps: อัตราวาดสูงสุด (None = GENERAL_CONFIG['display_fps'])
+            overlay: แสดง FPS, latency และ sequence บนภาพ
+            alive: ฟังก์ชันคืน False เมื่อ source หยุดแล้ว (เช่น decoder ปิด) - viewer จะหยุดตาม
+        """
+        self.source = source
+        self.title = title
+        self.max_fps = max_fps or GENERAL_CONFIG.get('display_fps', 30)
+        self.overlay = overlay
+        self.alive = alive
+
+        # สถิติ
+        self.displayed = 0
+        self.skipped = 0
+        self.latency = None
+        self._draw_times = deque(maxlen=30)
+
+        # พร้อมแสดงตั้งแต่สร้าง - stop() ที่เรียกก่อน run() เริ่มจะยังมีผล
+        self._running = threading.Event()
+        self._running.set()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._running.is_set()
+
+    @property
+    def fps(self):
+        """อัตราวาดที่ได้จริง (เฉลี่ยจาก 30 ภาพล่าสุด)"""
+        if len(self._draw_times) < 2:
+            return 0.0
+        span = self._draw_times[-1] - self._draw_times[0]
+        return (len(self._draw_times) - 1) / span if span > 0 else 0.0
+
+    def start(self):
+        """แสดงภาพใน background thread"""
+        self._running.set()
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """หยุดแสดงภาพและปิดหน้าต่าง"""
+        self._running.clear()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def stats(self):
+        """สถิติ: ภาพที่วาด / ภาพที่ข้ามเพราะวาดไม่ทัน, FPS และ latency ล่าสุด (วินาที)"""
+        return {
+            'title': self.title,
+            'max_fps': self.max_fps,
+            'fps': self.fps,
+            'displayed': self.displayed,
+            'skipped': self.skipped,
+            'latency': self.latency,
+        }
+
+    def run(self):
+        """วนแสดงภาพจนกว่าจะกด 'q' หรือ stop()"""
+        period = 1.0 / self.max_fps
+        last_sequence = None
+        next_draw = time.monotonic()
+        try:
+            while self._running.is_set():
+                frame = self.source(last_sequence, 0.5)
+                if frame is None:
+                    if self.alive is not None and not self.alive():
+                        break
+                    # ไม่มีภาพใหม่ - ให้หน้าต่างยังตอบสนองได้
+                    if self._poll_quit():
+                        break
+                    continue
+
+                if last_sequence is not None:
+                    self.skipped += max(0, frame.sequence - last_sequence - 1)
+                last_sequence = frame.sequence
+                self._draw(frame)
+                if self._poll_quit():
+                    break
+
+                # จำกัดอัตราวาด - ภาพที่มาระหว่างนี้ถูกข้ามไปที่ภาพล่าสุด
+                next_draw += period
+                delay = next_draw - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_draw = time.monotonic()
+        finally:
+            self._running.clear()
+            if self.displayed:
+                cv2.destroyWindow(self.title)
+
+    def _draw(self, frame):
+        now = time.monotonic()
+        captured = getattr(frame, 'received', None)
+        if captured is None:
+            captured = getattr(frame, 'timestamp', None)
+        self.latency = None if captured is None else now - captured
+
+        image = frame.image
+        if self.overlay:
+            image = image.copy()
+            text = f'{self.fps:5.1f} fps  #{frame.sequence}'
+            if self.latency is not None:
+                text += f'  {self.latency * 1000:.0f} ms'
+            cv2.putText(image, text, (8, 22), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 3)
+            cv2.putText(image, text, (8, 22), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 1)
+
+        cv2.imshow(self.title, image)
+        self.displayed += 1
+        self._draw_times.append(now)
+
+    def _poll_quit(self):
+        return cv2.waitKey(1) & 0xFF == ord('q')
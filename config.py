@@ -10,8 +10,17 @@ USE_SIMULATOR = True  # True = CoppeliaSim, False = โดรนจริง
 COPPELIA_CONFIG = {
     'host': 'localhost',
     'port': 23000,
+    # ZMQ endpoint แทน host/port เมื่อ simulator อยู่เครื่องเดียวกัน เช่น
+    # 'ipc:///tmp/coppeliasim-23000' (None = tcp://host:port)
+    'endpoint': None,
+    # เวลารอคำตอบสูงสุดต่อคำสั่ง (วินาที) - None = รอไม่จำกัด (ตั้งค่าแล้วจะใช้ RemoteAPIClient
+    # ของโปรเจกต์ซึ่งสร้าง socket ใหม่และส่งคำสั่งอ่านค่าซ้ำหลัง timeout)
+    'timeout': None,
     'image_folder': './captured_images/',
-    'vision_sensor_name': '/Quadcopter/visionSensor'
+    # โฟลเดอร์ที่ Lua script ของกล้องบันทึกภาพ (ต้องตรงกับใน scene)
+    'script_image_folder': 'D:/pythonforcoppelia/captured_images',
+    'vision_sensor_name': '/Quadcopter/visionSensor',
+    'bottom_vision_sensor_name': '/Quadcopter/bottomVisionSensor'
 }
 
 # การตั้งค่าโดรนจริง
@@ -27,5 +36,9 @@ GENERAL_CONFIG = {
     'default_speed': 50,
     'default_height': 100,  # ซม.
     'qr_timeout': 5.0,
-    'photo_quality': 90
+    'photo_quality': 90,
+    'frame_buffer_size': 8,  # จำนวนภาพล่าสุดที่เก็บไว้ต่อกล้อง
+    'writer_threads': 2,  # thread ที่ encode และบันทึกภาพ
+    'writer_queue_size': 16,  # ภาพที่รอบันทึกได้สูงสุดก่อนผู้ส่งต้องรอ
+    'display_fps': 30  # อัตราวาดสูงสุดของหน้าต่างแสดงภาพกล้อง
 }
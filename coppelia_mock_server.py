@@ -0,0 +1,617 @@
+#!/usr/bin/env python3
+"""
+Mock CoppeliaSim Server
+เซิร์ฟเวอร์ ZMQ จำลอง CoppeliaSim สำหรับทดสอบและ benchmark โดยไม่ต้องมี simulator
+
+ใช้ protocol เดียวกับ zmqRemoteApi.RemoteAPIClient (CBOR {func, args, id})
+และรองรับเฉพาะ sim.* ที่โปรเจกต์นี้ใช้ พร้อม scene graph ในหน่วยความจำ
+
+Usage:
+    python coppelia_mock_server.py --port 23000 --latency 0.002
+
+    # หรือใน Python
+    with MockCoppeliaSimServer(latency=0.002) as server:
+        client = RemoteAPIClient()
+        ...
+        print(server.requests, server.calls)
+"""
+
+import argparse
+import math
+import struct
+import threading
+import time
+
+import zmq
+import cbor2 as cbor
+
+# RFC 8746 typed arrays ที่ mock รองรับ: tag -> (struct format, ขนาดต่อค่า)
+TYPED_ARRAY_FORMATS = {85: ('<f', 4), 86: ('<d', 8)}
+
+# list ของ float ที่ยาวตั้งแต่ค่านี้ถูกตอบเป็น typed array (เหมือน zmqRemoteApi)
+TYPED_ARRAY_MIN_LENGTH = 8
+
+def decode_typed_array(*hook_args):
+    """typed array float32/float64 (และ multi-dimensional tag 40) -> list ของ float"""
+    # cbor2 5.x เรียก tag_hook(decoder, tag) ส่วน 6.x เรียก tag_hook(tag, immutable)
+    tag = hook_args[0] if isinstance(hook_args[0], cbor.CBORTag) else hook_args[1]
+    if tag.tag in TYPED_ARRAY_FORMATS and isinstance(tag.value, bytes):
+        fmt, size = TYPED_ARRAY_FORMATS[tag.tag]
+        return list(struct.unpack(f'{fmt[0]}{len(tag.value) // size}{fmt[1]}', tag.value))
+    if tag.tag == 40 and isinstance(tag.value, (list, tuple)) and len(tag.value) == 2:
+        shape, values = tag.value
+        for size in reversed(shape[1:]):
+            values = [values[i:i + size] for i in range(0, len(values), size)]
+        return values
+    return tag
+
+def pack_typed_arrays(value):
+    """list ของ float ที่ยาวพอ -> typed array float64"""
+    if isinstance(value, (list, tuple)):
+        if len(value) >= TYPED_ARRAY_MIN_LENGTH and all(type(v) is float for v in value):
+            return cbor.CBORTag(86, struct.pack(f'<{len(value)}d', *value))
+        return [pack_typed_arrays(v) for v in value]
+    if isinstance(value, dict):
+        return {k: pack_typed_arrays(v) for k, v in value.items()}
+    return value
+
+class MockSceneObject:
+    def __init__(self, handle, alias, obj_type, parent=-1, position=None, size=None):
+        """วัตถุหนึ่งชิ้นใน scene graph จำลอง (ตำแหน่งเก็บแบบสัมพัทธ์กับ parent)"""
+        self.handle = handle
+        self.alias = alias
+        self.type = obj_type
+        self.parent = parent
+        self.position = list(position or [0.0, 0.0, 0.0])
+        self.orientation = [0.0, 0.0, 0.0]
+        self.size = list(size or [0.0, 0.0, 0.0])
+        self.color = None
+        self.texture = None
+        self.mass = 0.0
+        self.int_params = {}
+
+class MockScene:
+    def __init__(self, with_drone=True):
+        """
+        Scene graph ในหน่วยความจำ
+
+        Args:
+            with_drone: สร้าง /Quadcopter พร้อม sensor ไว้ตั้งแต่เริ่ม
+        """
+        self.objects = {}
+        self.textures = {}
+        self._next_handle = 1
+        self._next_texture = 1
+
+        if with_drone:
+            self.add_drone()
+
+    def add(self, alias, obj_type, parent=-1, position=None, size=None):
+        """เพิ่มวัตถุแล้วคืน handle"""
+        handle = self._next_handle
+        self._next_handle += 1
+        self.objects[handle] = MockSceneObject(handle, alias, obj_type, parent, position, size)
+        return handle
+
+    def add_drone(self, position=None):
+        """สร้างโดรน /Quadcopter พร้อม proximity sensor และกล้องหน้า/ล่าง"""
+        drone = self.add('Quadcopter', 'model', position=position or [0.0, 0.0, 0.05])
+        self.add('proximitySensor', 'proximity_sensor', parent=drone)
+        self.add('visionSensor', 'vision_sensor', parent=drone, position=[0.1, 0.0, 0.0])
+        self.add('bottomVisionSensor', 'vision_sensor', parent=drone, position=[0.0, 0.0, -0.02])
+        return drone
+
+    def get(self, handle):
+        obj = self.objects.get(handle)
+        if obj is None:
+            raise KeyError(f'Object handle {handle} does not exist')
+        return obj
+
+    def path_of(self, handle):
+        obj = self.get(handle)
+        if obj.parent == -1:
+            return '/' + obj.alias
+        return self.path_of(obj.parent) + '/' + obj.alias
+
+    def find(self, path):
+        """ค้นหา handle จาก path ('/A/B'), alias ที่ root ('/A') หรือ alias ใดก็ได้ ('A')"""
+        for handle, obj in self.objects.items():
+            if path.startswith('/'):
+                if self.path_of(handle) == path:
+                    return handle
+            elif obj.alias == path:
+                return handle
+        raise KeyError(f'object does not exist: {path}')
+
+    def world_position(self, handle):
+        obj = self.get(handle)
+        if obj.parent == -1:
+            return list(obj.position)
+        parent = self.world_position(obj.parent)
+        return [p + o for p, o in zip(parent, obj.position)]
+
+    def set_world_position(self, handle, position):
+        obj = self.get(handle)
+        parent = [0.0, 0.0, 0.0] if obj.parent == -1 else self.world_position(obj.parent)
+        obj.position = [p - o for p, o in zip(position, parent)]
+
+    def remove(self, handles):
+        """ลบวัตถุพร้อมลูกทั้งหมด"""
+        pending = list(handles)
+        while pending:
+            handle = pending.pop()
+            if self.objects.pop(handle, None) is not None:
+                pending.extend(h for h, obj in self.objects.items() if obj.parent == handle)
+
+class MockCoppeliaSimServer:
+    # ค่าคงที่ของ sim ที่โปรเจกต์นี้ใช้ (ค่าตาม CoppeliaSim 4.x)
+    CONSTANTS = {
+        'handle_world': -1,
+        'handle_parent': -11,
+        'primitiveshape_plane': 1,
+        'primitiveshape_disc': 2,
+        'primitiveshape_cuboid': 3,
+        'primitiveshape_spheroid': 4,
+        'primitiveshape_cylinder': 5,
+        'shapeintparam_static': 3003,
+        'shapeintparam_respondable': 3004,
+        'colorcomponent_ambient_diffuse': 0,
+        'texturemap_plane': 0,
+        'floatparam_simulation_time_step': 3,
+        'boolparam_realtime_simulation': 25,
+        'simulation_stopped': 0,
+        'simulation_paused': 8,
+        'simulation_advancing_running': 17,
+        'scripttype_sandboxscript': 8,
+    }
+
+    # ระยะตรวจจับของ proximity sensor (เมตร)
+    PROXIMITY_RANGE = 3.0
+
+    # ความละเอียดของ vision sensor (กว้าง, สูง)
+    VISION_RESOLUTION = (320, 240)
+
+    # signal สั่งเก็บภาพของ Lua script -> (signal ตอบชื่อไฟล์, prefix ชื่อไฟล์)
+    CAPTURE_SIGNALS = {
+        'capture_image': ('image_saved', 'front'),
+        'capture_bottom_image': ('bottom_camera_image_saved', 'bottom'),
+    }
+
+    def __init__(self, endpoint='tcp://*:23000', latency=0.0, call_latency=0.0,
+                 scene=None, context=None, verbose=False, typed_arrays=False,
+                 capture_delay=0.0):
+        """
+        เซิร์ฟเวอร์ REP ที่ตอบคำสั่ง sim.* จาก scene graph ในหน่วยความจำ
+
+        Args:
+            endpoint: ZMQ endpoint ที่จะ bind (tcp://*:23000, ipc://..., inproc://...)
+            latency: หน่วงเวลาต่อ request (วินาที) - จำลอง round trip
+            call_latency: หน่วงเวลาต่อคำสั่ง (วินาที) - จำลองเวลาประมวลผลใน simulator
+            scene: MockScene ที่ต้องการใช้ (None = สร้างใหม่พร้อมโดรน)
+            context: zmq.Context ที่ใช้ร่วม (จำเป็นสำหรับ inproc://)
+            verbose: แสดงข้อความ debug หรือไม่
+            typed_arrays: ตอบ list ของ float ยาวๆ เป็น CBOR typed array (request รับได้เสมอ)
+            capture_delay: เวลาที่ Lua script ใช้ render และบันทึกภาพหนึ่งภาพ (วินาที)
+        """
+        self.endpoint = endpoint
+        self.typed_arrays = typed_arrays
+        self.latency = latency
+        self.call_latency = call_latency
+        self.scene = scene if scene is not None else MockScene()
+        self.verbose = verbose
+        self.capture_delay = capture_delay
+
+        self._own_context = context is None
+        self.context = context or zmq.Context()
+        self._thread = None
+        self._running = threading.Event()
+        self._ready = threading.Event()
+        self._bind_error = None
+
+        # สถานะ simulation
+        self.signals = {}
+        self.script_functions = {}
+        self.state = self.CONSTANTS['simulation_stopped']
+        self.stepping = False
+        self.time_step = 0.05
+        self.sim_time = 0.0
+        self._started_at = None
+        self.float_params = {}
+        self.bool_params = {}
+
+        # สถิติ
+        self.requests = 0
+        self.calls = 0
+        self.call_counts = {}
+
+        # ภาพทดสอบ (ไล่ระดับ) - เลื่อนตำแหน่งทุกครั้งที่อ่าน ภาพแต่ละเฟรมจึงต่างกัน
+        width, height = self.VISION_RESOLUTION
+        self._image_size = width * height * 3
+        self._image_pattern = bytes(range(256)) * (self._image_size // 256 + 2)
+        self.frames_rendered = 0
+
+        # ภาพที่ถูกสั่งผ่าน signal และยังบันทึกไม่เสร็จ: signal ตอบกลับ -> (เวลาเสร็จ, prefix)
+        self._pending_captures = {}
+        self.captures = 0
+
+        self._register_default_script_functions()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        return False
+
+    # ===============================================================
+    # SERVER LOOP
+    # ===============================================================
+
+    def start(self):
+        """เริ่มเซิร์ฟเวอร์ใน background thread"""
+        self._running.set()
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._bind_error is not None:
+            raise self._bind_error
+        if self.verbose:
+            print(f"🧪 Mock CoppeliaSim listening on {self.endpoint}")
+
+    def stop(self):
+        """หยุดเซิร์ฟเวอร์"""
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._own_context:
+            self.context.term()
+
+    def serve_forever(self):
+        """รับ request และตอบจนกว่าจะถูกสั่งหยุด"""
+        self._running.set()
+        socket = self.context.socket(zmq.REP)
+        try:
+            socket.bind(self.endpoint)
+        except zmq.ZMQError as e:
+            self._bind_error = e
+            self._ready.set()
+            socket.close(linger=0)
+            return
+        self._ready.set()
+
+        poller = zmq.Poller()
+        poller.register(socket, zmq.POLLIN)
+        try:
+            while self._running.is_set():
+                if not poller.poll(100):
+                    continue
+                request = cbor.loads(socket.recv(), tag_hook=decode_typed_array)
+                response = self.handle(request)
+                if self.typed_arrays:
+                    response = pack_typed_arrays(response)
+                if self.latency:
+                    time.sleep(self.latency)
+                if request.get('binary') and response.get('success'):
+                    # bytes ใน ret ส่งเป็น frame แยก แทนที่ด้วย {'@frame': i}
+                    frames = []
+                    response['ret'] = self._detach_frames(response['ret'], frames)
+                    socket.send_multipart([cbor.dumps(response)] + frames, copy=False)
+                else:
+                    socket.send(cbor.dumps(response))
+        finally:
+            socket.close(linger=0)
+
+    def handle(self, request):
+        """ประมวลผล message หนึ่งข้อความ (คำสั่งเดียวหรือ multi-call) แล้วคืน response"""
+        self.requests += 1
+        response = {'id': request.get('id')}
+
+        if 'batch' in request:
+            # คำสั่งที่ล้มเหลวไม่หยุดคำสั่งอื่น - แจ้งใน errors เป็น [index, ข้อความ]
+            results, errors = self._run_calls(request['batch'])
+            response.update(success=True, ret=results)
+            if errors:
+                response['errors'] = errors
+            return response
+
+        try:
+            response.update(success=True, ret=self.call(request['func'], request.get('args', [])))
+        except Exception as e:
+            response.update(success=False, error=str(e))
+        return response
+
+    def call(self, func_name, args):
+        """เรียกฟังก์ชันจำลองตามชื่อ เช่น 'sim.getObject'"""
+        self.calls += 1
+        self.call_counts[func_name] = self.call_counts.get(func_name, 0) + 1
+        if self.call_latency:
+            time.sleep(self.call_latency)
+        if self.verbose:
+            print(f'🧪 {func_name}{tuple(args)}')
+
+        module, _, name = func_name.partition('.')
+        handler = getattr(self, f'_{module}_{name}', None)
+        if handler is None:
+            raise NameError(f'Unknown function: {func_name}')
+        return handler(*args)
+
+    def register_script_function(self, name, function):
+        """ลงทะเบียนฟังก์ชันที่ sim.callScriptFunction(name, ...) จะเรียก"""
+        self.script_functions[name] = function
+
+    def _detach_frames(self, value, frames):
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            frames.append(value)
+            return {'@frame': len(frames) - 1}
+        if isinstance(value, (list, tuple)):
+            return [self._detach_frames(v, frames) for v in value]
+        return value
+
+    def _run_calls(self, calls):
+        """รันคำสั่งของ batch ตามลำดับ - คืน (ผลลัพธ์, [[index, error], ...])"""
+        results, errors = [], []
+        failed = set()
+        for index, call in enumerate(calls):
+            try:
+                args = self._resolve_refs(call.get('args', []), results, failed)
+                results.append(self.call(call['func'], args))
+            except Exception as e:
+                results.append(None)
+                errors.append([index, str(e)])
+                failed.add(index)
+        return results, errors
+
+    def _resolve_refs(self, value, results, failed):
+        if isinstance(value, dict) and set(value) == {'@ref'}:
+            if value['@ref'] in failed:
+                raise RuntimeError(f"depends on failed call #{value['@ref']}")
+            return results[value['@ref']]
+        if isinstance(value, list):
+            return [self._resolve_refs(v, results, failed) for v in value]
+        if isinstance(value, dict):
+            return {k: self._resolve_refs(v, results, failed) for k, v in value.items()}
+        return value
+
+    def _zmqRemoteApi_info(self, name):
+        """รายการสมาชิกของ object แบบเดียวกับ server จริง: ฟังก์ชันเป็น {'func': {}}
+        ส่วนค่าคงที่เป็น {'const': ค่า}"""
+        if name != 'sim':
+            raise NameError(f'Unknown object: {name}')
+        members = {attr[len('_sim_'):]: {'func': {}} for attr in dir(self) if attr.startswith('_sim_')}
+        members.update({key: {'const': value} for key, value in self.CONSTANTS.items()})
+        return members
+
+    # ===============================================================
+    # OBJECTS
+    # ===============================================================
+
+    def _sim_getObject(self, path, options=None):
+        return self.scene.find(path)
+
+    def _sim_getObjectAlias(self, handle, options=-1):
+        return self.scene.get(handle).alias
+
+    def _sim_setObjectAlias(self, handle, alias):
+        self.scene.get(handle).alias = alias
+
+    def _sim_getObjectPosition(self, handle, relative_to=-1):
+        position = self.scene.world_position(handle)
+        if relative_to != -1:
+            origin = self.scene.world_position(relative_to)
+            position = [p - o for p, o in zip(position, origin)]
+        return position
+
+    def _sim_setObjectPosition(self, handle, *args):
+        # รองรับทั้ง (handle, relative_to, position) และ (handle, position)
+        position = args[-1]
+        relative_to = args[0] if len(args) > 1 else -1
+        if relative_to != -1:
+            origin = self.scene.world_position(relative_to)
+            position = [p + o for p, o in zip(position, origin)]
+        self.scene.set_world_position(handle, position)
+
+    def _sim_getObjectOrientation(self, handle, relative_to=-1):
+        return list(self.scene.get(handle).orientation)
+
+    def _sim_setObjectOrientation(self, handle, *args):
+        self.scene.get(handle).orientation = list(args[-1])
+
+    def _sim_createPrimitiveShape(self, shape_type, size, options=0):
+        handle = self.scene.add(f'Shape{self.scene._next_handle}', 'shape', size=size)
+        self.scene.get(handle).int_params['primitive'] = shape_type
+        return handle
+
+    def _sim_removeObjects(self, handles, *args):
+        self.scene.remove(handles)
+
+    def _sim_loadModel(self, path):
+        return self.scene.add_drone()
+
+    def _sim_setObjectInt32Parameter(self, handle, param, value):
+        self.scene.get(handle).int_params[param] = value
+        return 1
+
+    def _sim_setShapeColor(self, handle, color_name, component, color):
+        self.scene.get(handle).color = list(color)
+
+    def _sim_setShapeMass(self, handle, mass):
+        self.scene.get(handle).mass = mass
+
+    def _sim_loadTexture(self, path, *args):
+        texture_id = self.scene._next_texture
+        self.scene._next_texture += 1
+        self.scene.textures[texture_id] = path
+        return texture_id
+
+    def _sim_setShapeTexture(self, handle, texture_id, mapping_mode, options, uv_scaling, *args):
+        self.scene.get(handle).texture = texture_id
+
+    # ===============================================================
+    # SENSORS AND SIGNALS
+    # ===============================================================
+
+    def _sim_readProximitySensor(self, handle):
+        """วัดระยะจาก sensor ถึงพื้น (z = 0)"""
+        distance = self.scene.world_position(handle)[2]
+        if 0.0 <= distance <= self.PROXIMITY_RANGE:
+            return [1, distance, [0.0, 0.0, distance], -1, [0.0, 0.0, 1.0]]
+        return [0, 0.0, [0.0, 0.0, 0.0], -1, [0.0, 0.0, 0.0]]
+
+    def _sim_getVisionSensorImg(self, handle, *args):
+        """ภาพ RGB (bytes) และความละเอียด เหมือน sim.getVisionSensorImg ของ CoppeliaSim 4.x"""
+        self.scene.get(handle)
+        offset = self.frames_rendered % 256
+        self.frames_rendered += 1
+        image = self._image_pattern[offset:offset + self._image_size]
+        return [image, list(self.VISION_RESOLUTION)]
+
+    def _sim_getVisionSensorResolution(self, handle):
+        self.scene.get(handle)
+        return list(self.VISION_RESOLUTION)
+
+    def _sim_setStringSignal(self, name, value):
+        self.signals[name] = value
+        if name in self.CAPTURE_SIGNALS:
+            # Lua script เห็น signal แล้วบันทึกภาพเสร็จหลัง capture_delay
+            reply, prefix = self.CAPTURE_SIGNALS[name]
+            self._pending_captures[reply] = (time.perf_counter() + self.capture_delay, prefix)
+
+    def _sim_getStringSignal(self, name):
+        pending = self._pending_captures.get(name)
+        if pending is not None and time.perf_counter() >= pending[0]:
+            del self._pending_captures[name]
+            self.signals[name] = self._save_capture(pending[1])
+        return self.signals.get(name)
+
+    def _sim_clearStringSignal(self, name):
+        self.signals.pop(name, None)
+
+    def _sim_callScriptFunction(self, name, script_handle, *args):
+        function = self.script_functions.get(name.split('@')[0])
+        if function is None:
+            raise NameError(f'Script function not found: {name}')
+        return function(*args)
+
+    def _sim_executeScriptString(self, code, script_handle):
+        """mock รัน Lua ไม่ได้ - รับเฉพาะการติดตั้ง helper ของ RemoteAPIBatch ซึ่งมีฟังก์ชัน
+        Python ที่ทำงานเหมือนกันแทน"""
+        if 'function remoteApiBatch' not in code:
+            raise NotImplementedError('mock cannot execute Lua code')
+        self.register_script_function('remoteApiBatch', self._script_batch)
+        return [0, None]
+
+    def _script_batch(self, calls):
+        """remoteApiBatch ของ RemoteAPIBatch.SCRIPT: {true, ค่า} หรือ {false, error} ต่อคำสั่ง"""
+        results, errors = self._run_calls(calls)
+        errors = dict(errors)
+        return [[False, errors[i]] if i in errors else [True, value]
+                for i, value in enumerate(results)]
+
+    def _register_default_script_functions(self):
+        """ฟังก์ชันลมใน Lua script ของโดรน"""
+        wind = {'strength': 0, 'global_wind': [0, 0, 0], 'gust_active': False,
+                'current_zone': None, 'turbulence_enabled': True, 'zones': []}
+
+        def set_value(key):
+            def setter(value):
+                wind[key] = value
+                return True
+            return setter
+
+        self.register_script_function('setWindStrength', set_value('strength'))
+        self.register_script_function('setWindDirection', set_value('global_wind'))
+        self.register_script_function('enableTurbulence', set_value('turbulence_enabled'))
+        self.register_script_function('enableWindGusts', set_value('gust_active'))
+        self.register_script_function('createCustomWindZone', lambda zone: wind['zones'].append(zone) or True)
+        self.register_script_function('getWindStatus', lambda: dict(wind))
+
+        # เก็บภาพแบบ blocking: คืนชื่อไฟล์เมื่อบันทึกเสร็จ
+        def capture(prefix):
+            def capture_image():
+                if self.capture_delay:
+                    time.sleep(self.capture_delay)
+                return self._save_capture(prefix)
+            return capture_image
+
+        self.register_script_function('captureImage', capture('front'))
+        self.register_script_function('captureBottomImage', capture('bottom'))
+
+    def _save_capture(self, prefix):
+        """จำลองการ render และบันทึกภาพของ Lua script - คืนชื่อไฟล์"""
+        self.frames_rendered += 1
+        self.captures += 1
+        return f'{prefix}_{self.captures:05d}.png'
+
+    # ===============================================================
+    # SIMULATION
+    # ===============================================================
+
+    def _sim_startSimulation(self):
+        self.state = self.CONSTANTS['simulation_advancing_running']
+        self.sim_time = 0.0
+        self._started_at = time.perf_counter()
+
+    def _sim_stopSimulation(self):
+        self.state = self.CONSTANTS['simulation_stopped']
+
+    def _sim_pauseSimulation(self):
+        self.state = self.CONSTANTS['simulation_paused']
+
+    def _sim_getSimulationState(self):
+        return self.state
+
+    def _sim_setStepping(self, enabled):
+        self.stepping = bool(enabled)
+        return 0
+
+    def _sim_step(self):
+        self.sim_time += self.time_step
+
+    def _sim_getSimulationTime(self):
+        if not self.stepping and self.state == self.CONSTANTS['simulation_advancing_running']:
+            # โหมด real-time: เวลาเดินตามนาฬิกาจริง
+            steps = math.floor((time.perf_counter() - self._started_at) / self.time_step)
+            return steps * self.time_step
+        return self.sim_time
+
+    def _sim_getSimulationTimeStep(self):
+        return self.time_step
+
+    def _sim_setFloatParameter(self, param, value):
+        self.float_params[param] = value
+        if param == self.CONSTANTS['floatparam_simulation_time_step']:
+            self.time_step = value
+
+    def _sim_setBoolParameter(self, param, value):
+        self.bool_params[param] = value
+
+def main():
+    parser = argparse.ArgumentParser(description='Mock CoppeliaSim ZMQ remote API server')
+    parser.add_argument('--endpoint', default=None, help='ZMQ endpoint (default tcp://*:PORT)')
+    parser.add_argument('--port', type=int, default=23000)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added per request')
+    parser.add_argument('--call-latency', type=float, default=0.0, help='seconds added per call')
+    parser.add_argument('--typed-arrays', action='store_true', help='reply with CBOR typed arrays')
+    parser.add_argument('--capture-delay', type=float, default=0.0,
+                        help='seconds the camera script takes to save an image')
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    server = MockCoppeliaSimServer(
+        endpoint=args.endpoint or f'tcp://*:{args.port}',
+        latency=args.latency,
+        call_latency=args.call_latency,
+        verbose=args.verbose,
+        typed_arrays=args.typed_arrays,
+        capture_delay=args.capture_delay
+    )
+    print(f"🧪 Mock CoppeliaSim listening on {server.endpoint} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n📊 {server.requests} requests, {server.calls} calls")
+
+if __name__ == '__main__':
+    main()
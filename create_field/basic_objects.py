@@ -10,34 +10,45 @@ class BasicObjectsCreator:
     """คลาสสำหรับสร้างวัตถุพื้นฐาน"""
     
     def __init__(self, sim_manager, config):
+        self.sim_manager = sim_manager
         self.sim = sim_manager.sim
         self.config = config
         
-    def create_floor_tile(self, grid_x, grid_y, tile_index):
-        """สร้างแผ่นพื้นหนึ่งแผ่น"""
+    def create_floor_tile(self, grid_x, grid_y, tile_index, batch=None):
+        """สร้างแผ่นพื้นหนึ่งแผ่น
+        
+        batch: ส่งคำสั่งรวมกับ batch ของผู้เรียก - 'handle' ที่คืนเป็น BatchResult
+               จนกว่าจะ resolve ด้วย sim_manager.resolve_handles() หลังส่ง batch
+        """
         try:
             position = self.config.get_grid_position(grid_x, grid_y)
             position.append(0.0010)  # ความสูง 2cm
             
-            tile_handle = self.sim.createPrimitiveShape(
-                self.sim.primitiveshape_cuboid,
-                [self.config.tile_size, self.config.tile_size, 0.002]
-            )
-            
-            self.sim.setObjectPosition(tile_handle, position)
-            
-            # ตั้งชื่อ
             tile_name = f"FloorTile_{grid_x}_{grid_y}"
-            self.sim.setObjectAlias(tile_handle, tile_name)
-            
-            # ตั้งค่าคุณสมบัติ
-            self.sim.setObjectInt32Parameter(tile_handle, self.sim.shapeintparam_static, 1)
-            self.sim.setObjectInt32Parameter(tile_handle, self.sim.shapeintparam_respondable, 1)
-            # Note: shapeintparam_collidable ไม่มีใน CoppeliaSim version นี้
             
-            # ตั้งสี
-            self.sim.setShapeColor(tile_handle, None, self.sim.colorcomponent_ambient_diffuse, 
-                                 self.config.colors['floor'])
+            # ส่งทุกคำสั่งของแผ่นนี้ใน round trip เดียว (หรือรวมกับ batch ของผู้เรียก)
+            with self.sim_manager.batch(batch) as current:
+                bsim = current.getObject('sim')
+                tile_handle = bsim.createPrimitiveShape(
+                    self.sim.primitiveshape_cuboid,
+                    [self.config.tile_size, self.config.tile_size, 0.002]
+                )
+                
+                bsim.setObjectPosition(tile_handle, position)
+                
+                # ตั้งชื่อ
+                bsim.setObjectAlias(tile_handle, tile_name)
+                
+                # ตั้งค่าคุณสมบัติ
+                bsim.setObjectInt32Parameter(tile_handle, self.sim.shapeintparam_static, 1)
+                bsim.setObjectInt32Parameter(tile_handle, self.sim.shapeintparam_respondable, 1)
+                # Note: shapeintparam_collidable ไม่มีใน CoppeliaSim version นี้
+                
+                # ตั้งสี
+                bsim.setShapeColor(tile_handle, None, self.sim.colorcomponent_ambient_diffuse, 
+                                   self.config.colors['floor'])
+            if batch is None:
+                tile_handle = tile_handle.result()
             
             # สร้างข้อมูลวัตถุ
             tile_info = {
@@ -54,8 +65,8 @@ class BasicObjectsCreator:
             print(f"❌ Error creating floor tile at ({grid_x},{grid_y}): {e}")
             return None
     
-    def create_obstacle_box(self, grid_x, grid_y, height_cm=80, texture_side=None):
-        """สร้างกล่องสิ่งกีดขวาง"""
+    def create_obstacle_box(self, grid_x, grid_y, height_cm=80, texture_side=None, batch=None):
+        """สร้างกล่องสิ่งกีดขวาง (batch: ดู create_floor_tile)"""
         try:
             position = self.config.get_grid_position(grid_x, grid_y)
             height_m = height_cm / 100.0
@@ -69,24 +80,30 @@ class BasicObjectsCreator:
                 # กล่องปกติ - ใช้ขนาดเดิม
                 size = [self.config.obstacle_size[0], self.config.obstacle_size[1], height_m]
             
-            box_handle = self.sim.createPrimitiveShape(self.sim.primitiveshape_cuboid, size)
-            self.sim.setObjectPosition(box_handle, position)
-            
-            # ตั้งชื่อ
             box_name = f"Box_{height_cm}cm_{self.config.grid_to_string(grid_x, grid_y)}"
-            self.sim.setObjectAlias(box_handle, box_name)
-            
-            # ตั้งค่าคุณสมบัติ
-            self.sim.setObjectInt32Parameter(box_handle, self.sim.shapeintparam_static, 1)
-            self.sim.setObjectInt32Parameter(box_handle, self.sim.shapeintparam_respondable, 1)
-            
-            # ตั้งสี
             color = self._get_box_color(height_cm)
-            self.sim.setShapeColor(box_handle, None, self.sim.colorcomponent_ambient_diffuse, color)
             
-            # เพิ่ม texture ถ้ามี
-            if texture_side:
-                self._create_image_board_for_box(grid_x, grid_y, texture_side, height_cm)
+            # ส่งทุกคำสั่งของกล่องนี้รวมถึงป้ายรูปใน round trip เดียว
+            with self.sim_manager.batch(batch) as current:
+                bsim = current.getObject('sim')
+                box_handle = bsim.createPrimitiveShape(self.sim.primitiveshape_cuboid, size)
+                bsim.setObjectPosition(box_handle, position)
+                
+                # ตั้งชื่อ
+                bsim.setObjectAlias(box_handle, box_name)
+                
+                # ตั้งค่าคุณสมบัติ
+                bsim.setObjectInt32Parameter(box_handle, self.sim.shapeintparam_static, 1)
+                bsim.setObjectInt32Parameter(box_handle, self.sim.shapeintparam_respondable, 1)
+                
+                # ตั้งสี
+                bsim.setShapeColor(box_handle, None, self.sim.colorcomponent_ambient_diffuse, color)
+                
+                # เพิ่ม texture ถ้ามี
+                if texture_side:
+                    self._create_image_board_for_box(grid_x, grid_y, texture_side, height_cm, current)
+            if batch is None:
+                box_handle = box_handle.result()
             
             # สร้างข้อมูลวัตถุ
             box_info = {
@@ -106,36 +123,41 @@ class BasicObjectsCreator:
             print(f"❌ Error creating obstacle box: {e}")
             return None
     
-    def create_mission_pad(self, grid_x, grid_y, pad_number):
-        """สร้าง Mission Pad"""
+    def create_mission_pad(self, grid_x, grid_y, pad_number, batch=None):
+        """สร้าง Mission Pad (batch: ดู create_floor_tile)"""
         try:
             position = self.config.get_grid_position(grid_x, grid_y)
             position.append(0.021)  # วางบนพื้น
             
             # สร้างป้าย
-            pad_handle = self.sim.createPrimitiveShape(
-                self.sim.primitiveshape_cuboid, 
-                self.config.qr_board_size
-            )
-            self.sim.setObjectPosition(pad_handle, position)
-            
-            # หมุนให้หันขึ้น
-            self.sim.setObjectOrientation(pad_handle, [0, 0, 0])
-            
-            # ตั้งชื่อ
             pad_name = f"MissionPad_{pad_number}_{self.config.grid_to_string(grid_x, grid_y)}"
-            self.sim.setObjectAlias(pad_handle, pad_name)
-            
-            # ตั้งค่าคุณสมบัติ
-            self.sim.setObjectInt32Parameter(pad_handle, self.sim.shapeintparam_static, 1)
-            self.sim.setObjectInt32Parameter(pad_handle, self.sim.shapeintparam_respondable, 1)
-            
-            # ตั้งสี
             color = self.config.get_mission_pad_color(pad_number)
-            self.sim.setShapeColor(pad_handle, None, self.sim.colorcomponent_ambient_diffuse, color)
             
-            # ใส่ texture QR Code
-            self._add_qr_texture(pad_handle, pad_number)
+            with self.sim_manager.batch(batch) as current:
+                bsim = current.getObject('sim')
+                pad_handle = bsim.createPrimitiveShape(
+                    self.sim.primitiveshape_cuboid, 
+                    self.config.qr_board_size
+                )
+                bsim.setObjectPosition(pad_handle, position)
+                
+                # หมุนให้หันขึ้น
+                bsim.setObjectOrientation(pad_handle, [0, 0, 0])
+                
+                # ตั้งชื่อ
+                bsim.setObjectAlias(pad_handle, pad_name)
+                
+                # ตั้งค่าคุณสมบัติ
+                bsim.setObjectInt32Parameter(pad_handle, self.sim.shapeintparam_static, 1)
+                bsim.setObjectInt32Parameter(pad_handle, self.sim.shapeintparam_respondable, 1)
+                
+                # ตั้งสี
+                bsim.setShapeColor(pad_handle, None, self.sim.colorcomponent_ambient_diffuse, color)
+                
+                # ใส่ texture QR Code
+                self._add_qr_texture(pad_handle, pad_number, current)
+            if batch is None:
+                pad_handle = pad_handle.result()
             
             # สร้างข้อมูลวัตถุ
             pad_info = {
@@ -154,13 +176,14 @@ class BasicObjectsCreator:
             print(f"❌ Error creating mission pad: {e}")
             return None
     
-    def create_qrcode_box(self, grid_x, grid_y, qr_image_path=None):
+    def create_qrcode_box(self, grid_x, grid_y, qr_image_path=None, batch=None):
         """สร้างกล่อง QR code ความสูง 230cm พร้อมแผ่นป้ายสีขาว
         
         Args:
             grid_x: ตำแหน่ง X ในกริด
             grid_y: ตำแหน่ง Y ในกริด  
             qr_image_path: path ของไฟล์ QR code (ถ้าไม่ระบุจะใช้ default)
+            batch: ส่งคำสั่งรวมกับ batch ของผู้เรียก (ดู create_floor_tile)
         """
         try:
             # ใช้ default path ถ้าไม่ระบุ
@@ -173,22 +196,32 @@ class BasicObjectsCreator:
             
             # สร้างกล่อง
             size = [self.config.obstacle_size[0], self.config.obstacle_size[1], height_m]
-            box_handle = self.sim.createPrimitiveShape(self.sim.primitiveshape_cuboid, size)
-            self.sim.setObjectPosition(box_handle, position)
-            
-            # ตั้งชื่อ
             box_name = f"QRBox_230cm_{self.config.grid_to_string(grid_x, grid_y)}"
-            self.sim.setObjectAlias(box_handle, box_name)
-            
-            # ตั้งค่าคุณสมบัติ
-            self.sim.setObjectInt32Parameter(box_handle, self.sim.shapeintparam_static, 1)
-            self.sim.setObjectInt32Parameter(box_handle, self.sim.shapeintparam_respondable, 1)
-            
-            # ตั้งสีกล่องเป็นสีเทา
-            self.sim.setShapeColor(box_handle, None, self.sim.colorcomponent_ambient_diffuse, [0.5, 0.5, 0.5])
             
-            # สร้างแผ่นป้าย QR code สีขาวข้างกล่อง
-            qr_board_handle = self._create_qr_board_on_side(grid_x, grid_y, height_m, qr_image_path)
+            with self.sim_manager.batch(batch) as current:
+                bsim = current.getObject('sim')
+                box_handle = bsim.createPrimitiveShape(self.sim.primitiveshape_cuboid, size)
+                bsim.setObjectPosition(box_handle, position)
+                
+                # ตั้งชื่อ
+                bsim.setObjectAlias(box_handle, box_name)
+                
+                # ตั้งค่าคุณสมบัติ
+                bsim.setObjectInt32Parameter(box_handle, self.sim.shapeintparam_static, 1)
+                bsim.setObjectInt32Parameter(box_handle, self.sim.shapeintparam_respondable, 1)
+                
+                # ตั้งสีกล่องเป็นสีเทา
+                bsim.setShapeColor(box_handle, None, self.sim.colorcomponent_ambient_diffuse, [0.5, 0.5, 0.5])
+                
+                # สร้างแผ่นป้าย QR code สีขาวข้างกล่อง
+                qr_board_handle = self._create_qr_board_on_side(grid_x, grid_y, height_m, qr_image_path, current)
+            if batch is None:
+                box_handle = box_handle.result()
+                # ป้ายที่สร้างไม่สำเร็จไม่ทำให้เสียกล่อง (callback ของป้ายแจ้ง error แล้ว)
+                if qr_board_handle is not None and self._call_error(qr_board_handle) is None:
+                    qr_board_handle = qr_board_handle.result()
+                else:
+                    qr_board_handle = None
             
             # สร้างข้อมูลวัตถุ
             box_info = {
@@ -203,8 +236,6 @@ class BasicObjectsCreator:
             }
             
             print(f"📦 Created QR code box (230cm) at {self.config.grid_to_string(grid_x, grid_y)}")
-            if qr_board_handle:
-                print(f"🎯 Added white QR board on side with image: {qr_image_path}")
             
             return box_info
             
@@ -212,8 +243,8 @@ class BasicObjectsCreator:
             print(f"❌ Error creating QR code box: {e}")
             return None
     
-    def _create_qr_board_on_side(self, grid_x, grid_y, box_height, qr_image_path):
-        """สร้างแผ่นป้าย QR code สีขาวข้างกล่อง"""
+    def _create_qr_board_on_side(self, grid_x, grid_y, box_height, qr_image_path, batch):
+        """สร้างแผ่นป้าย QR code สีขาวข้างกล่อง - คำสั่งอยู่ใน batch เดียวกับกล่อง คืน BatchResult ของ handle"""
         try:
             # คำนวณตำแหน่งแผ่นป้าย (ติดข้างกล่อง)
             box_pos = self.config.get_grid_position(grid_x, grid_y)
@@ -231,47 +262,49 @@ class BasicObjectsCreator:
             board_y = box_pos[1] + (box_width/2) + (board_thickness/2)  # ข้างหน้ากล่อง
             board_z = box_height * 0.75  # เลื่อนขึ้นไปด้านบน (3/4 ของความสูงกล่อง)
             
-            # สร้างแผ่นป้าย
-            board_handle = self.sim.createPrimitiveShape(
+            # สร้างแผ่นป้าย - ผลรู้ได้หลังส่ง batch จึงแจ้งผลผ่าน callback
+            bsim = batch.getObject('sim')
+            board_handle = bsim.createPrimitiveShape(
                 self.sim.primitiveshape_cuboid, 
                 [board_width, board_thickness, board_height]
             )
             
-            if board_handle == -1:
-                print("❌ Failed to create QR board")
-                return None
+            def report_board(result):
+                error = self._call_error(result)
+                if error is None:
+                    print(f"⬜ Created white QR board on side at ({board_x:.3f}, {board_y:.3f}, {board_z:.3f})")
+                else:
+                    print(f"❌ Failed to create QR board: {error}")
+            board_handle.add_done_callback(report_board)
             
-            self.sim.setObjectPosition(board_handle, [board_x, board_y, board_z])
-            self.sim.setObjectOrientation(board_handle, [0, 0, 0])  # หันหน้าออกจากกล่อง
+            bsim.setObjectPosition(board_handle, [board_x, board_y, board_z])
+            bsim.setObjectOrientation(board_handle, [0, 0, 0])  # หันหน้าออกจากกล่อง
             
             # ตั้งชื่อ
             grid_name = self.config.grid_to_string(grid_x, grid_y)
             board_name = f"QRBoard_{grid_name}_side"
-            self.sim.setObjectAlias(board_handle, board_name)
+            bsim.setObjectAlias(board_handle, board_name)
             
             # ตั้งสีขาว
-            self.sim.setShapeColor(board_handle, None, 
+            bsim.setShapeColor(board_handle, None, 
                 self.sim.colorcomponent_ambient_diffuse, [1.0, 1.0, 1.0])  # สีขาวสะอาด
             
             # ตั้งค่าฟิสิกส์
-            self.sim.setObjectInt32Parameter(board_handle, self.sim.shapeintparam_static, 1)
-            self.sim.setObjectInt32Parameter(board_handle, self.sim.shapeintparam_respondable, 1)
+            bsim.setObjectInt32Parameter(board_handle, self.sim.shapeintparam_static, 1)
+            bsim.setObjectInt32Parameter(board_handle, self.sim.shapeintparam_respondable, 1)
             
-            # เพิ่ม QR code texture ถ้ามีไฟล์
+            # เพิ่ม QR code texture ถ้ามีไฟล์ - texture id ส่งต่อด้วย @ref ใน batch เดียวกัน
             if os.path.exists(qr_image_path):
-                texture_id = self.sim.loadTexture(qr_image_path)
-                if texture_id != -1:
-                    # ใช้ texture บนหน้าหน้า (face ที่หันออกจากกล่อง)
-                    self.sim.setShapeTexture(board_handle, texture_id, self.sim.texturemap_plane, 0, [1.0, 1.0])
-                    print(f"✅ Added QR texture to white board: {qr_image_path}")
-                else:
-                    print(f"⚠️ Failed to load QR texture: {qr_image_path}")
+                texture_id = bsim.loadTexture(qr_image_path)
+                # ใช้ texture บนหน้าหน้า (face ที่หันออกจากกล่อง)
+                applied = bsim.setShapeTexture(board_handle, texture_id, self.sim.texturemap_plane, 0, [1.0, 1.0])
+                self._report_texture(texture_id, applied,
+                                     f"✅ Added QR texture to white board: {qr_image_path}",
+                                     f"⚠️ Failed to load QR texture: {qr_image_path}")
             else:
                 print(f"⚠️ QR image file not found: {qr_image_path}")
                 print("📋 White board created without QR texture")
             
-            print(f"⬜ Created white QR board on side at ({board_x:.3f}, {board_y:.3f}, {board_z:.3f})")
-            
             return board_handle
             
         except Exception as e:
@@ -287,8 +320,8 @@ class BasicObjectsCreator:
         else:
             return [1.0, 0.5, 0.0]  # สีส้ม (สูงมาก)
     
-    def _create_image_board_for_box(self, grid_x, grid_y, direction, height_cm=80):
-        """สร้างป้ายรูปข้างกล่อง - แก้ไขการหมุนบนล่าง"""
+    def _create_image_board_for_box(self, grid_x, grid_y, direction, height_cm, batch):
+        """สร้างป้ายรูปข้างกล่อง - แก้ไขการหมุนบนล่าง (คำสั่งอยู่ใน batch เดียวกับกล่อง)"""
         # คำนวณตำแหน่งป้าย
         box_pos = self.config.get_grid_position(grid_x, grid_y)
         
@@ -348,30 +381,27 @@ class BasicObjectsCreator:
             return None
         
         # สร้างป้าย
-        image_handle = self.sim.createPrimitiveShape(
+        bsim = batch.getObject('sim')
+        image_handle = bsim.createPrimitiveShape(
             self.sim.primitiveshape_cuboid, 
             board_size
         )
         
-        if image_handle == -1:
-            print(f"❌ Failed to create image board for {actual_direction}")
-            return None
-        
-        self.sim.setObjectPosition(image_handle, [image_x, image_y, image_z])
-        self.sim.setObjectOrientation(image_handle, rotation)
+        bsim.setObjectPosition(image_handle, [image_x, image_y, image_z])
+        bsim.setObjectOrientation(image_handle, rotation)
         
         # ตั้งชื่อ
         grid_name = self.config.grid_to_string(grid_x, grid_y)
         image_name = f"ImageBoard_{grid_name}_{actual_direction}_{height_cm}cm"
-        self.sim.setObjectAlias(image_handle, image_name)
+        bsim.setObjectAlias(image_handle, image_name)
         
         # ใช้สีที่เด่นชัดขึ้น - สีม่วงอ่อนสำหรับป้ายรูป
-        self.sim.setShapeColor(image_handle, None, 
+        bsim.setShapeColor(image_handle, None, 
             self.sim.colorcomponent_ambient_diffuse, [0.8, 0.4, 0.8])  # สีม่วงอ่อน
         
         # ตั้งค่าฟิสิกส์
-        self.sim.setObjectInt32Parameter(image_handle, self.sim.shapeintparam_static, 1)
-        self.sim.setObjectInt32Parameter(image_handle, self.sim.shapeintparam_respondable, 1)
+        bsim.setObjectInt32Parameter(image_handle, self.sim.shapeintparam_static, 1)
+        bsim.setObjectInt32Parameter(image_handle, self.sim.shapeintparam_respondable, 1)
         
         # สร้างข้อมูลวัตถุ
         image_info = {
@@ -394,8 +424,8 @@ class BasicObjectsCreator:
         
         return image_info
     
-    def _add_qr_texture(self, object_handle, pad_number):
-        """เพิ่ม QR Code texture"""
+    def _add_qr_texture(self, object_handle, pad_number, batch):
+        """เพิ่ม QR Code texture - texture id ส่งต่อด้วย @ref ใน batch เดียวกับป้าย"""
         try:
             # พาธไฟล์ QR สำหรับแต่ละหมายเลข
             qr_path = f"../mission_pad_templates/number_{pad_number}/missionpad_{pad_number}.png"
@@ -406,14 +436,36 @@ class BasicObjectsCreator:
             
             # สร้าง texture
             if os.path.exists(qr_path):
-                texture_id = self.sim.loadTexture(qr_path)
-                if texture_id != -1:
-                    self.sim.setShapeTexture(object_handle, texture_id, self.sim.texturemap_plane, 0, [1.0, 1.0])
-                    print(f"✅ Added QR texture {pad_number}")
-                else:
-                    print(f"⚠️ Failed to load QR texture {pad_number}")
+                bsim = batch.getObject('sim')
+                texture_id = bsim.loadTexture(qr_path)
+                applied = bsim.setShapeTexture(object_handle, texture_id, self.sim.texturemap_plane, 0, [1.0, 1.0])
+                self._report_texture(texture_id, applied,
+                                     f"✅ Added QR texture {pad_number}",
+                                     f"⚠️ Failed to load QR texture {pad_number}")
             else:
                 print(f"⚠️ QR texture file not found: {qr_path}")
                 
         except Exception as e:
             print(f"❌ Error adding QR texture: {e}")
+    
+    @staticmethod
+    def _call_error(result):
+        """error ของคำสั่งใน batch ที่ส่งแล้ว - handle/texture id -1 ถือว่าล้มเหลวเหมือนเดิม"""
+        error = result.exception()
+        if error is None and result.result() == -1:
+            error = f'{result.funcName} returned -1'
+        return error
+    
+    def _report_texture(self, texture_id, applied, success_message, failure_message):
+        """แจ้งผลการใส่ texture เมื่อ batch ถูกส่งแล้ว (ไม่ใช่ตอนเพิ่มคำสั่งเข้า batch)
+        
+        loadTexture ที่ล้มเหลวทำให้ setShapeTexture ที่อ้างถึงมันล้มเหลวตามโดยไม่ถูกรัน
+        ส่วน texture id -1 ทำให้ setShapeTexture แค่ล้าง texture ของป้าย
+        """
+        def report(_):
+            error = self._call_error(texture_id) or applied.exception()
+            if error is None:
+                print(success_message)
+            else:
+                print(f"{failure_message} ({error})")
+        applied.add_done_callback(report)
@@ -12,9 +12,9 @@ from .field_parser import FieldParser
 class FieldManager:
     """คลาสหลักสำหรับจัดการสนาม Drone Odyssey Challenge"""
     
-    def __init__(self):
+    def __init__(self, client=None):
         # สร้าง components
-        self.sim_manager = SimulationManager()
+        self.sim_manager = SimulationManager(client)
         self.config = FieldConfig()
         self.objects_creator = BasicObjectsCreator(self.sim_manager, self.config)
         self.pingpong_system = PingPongSystem(self.sim_manager, self.config)
@@ -86,22 +86,41 @@ class FieldManager:
     # ===============================================================
     
     def create_tiled_floor(self):
-        """สร้างพื้นสนามแบ่งช่อง 5×5"""
+        """สร้างพื้นสนามแบ่งช่อง 5×5 - ทุกแผ่นส่งใน batch เดียว"""
+        tiles = self._build_batched(self._queue_tiled_floor)
+        self.field_objects.extend(tiles)
+        
+        print(f"✅ Created {len(tiles)} floor tiles")
+        return len(tiles) > 0
+    
+    def _queue_tiled_floor(self, batch):
+        """เพิ่มคำสั่งสร้างพื้น 5×5 เข้า batch - คืนข้อมูลแผ่นพื้น (handle ยังเป็น BatchResult)"""
         print("🟫 Creating tiled floor (5×5 grid)...")
         
         # ตั้งค่า physics ก่อน
         self.sim_manager.setup_physics_engine(self.config)
         
-        floor_count = 0
+        tiles = []
         for row in range(5):
             for col in range(5):
-                tile_info = self.objects_creator.create_floor_tile(col, row, floor_count)
+                tile_info = self.objects_creator.create_floor_tile(col, row, len(tiles), batch)
                 if tile_info:
-                    self.field_objects.append(tile_info)
-                    floor_count += 1
+                    tiles.append(tile_info)
+        return tiles
+    
+    def _build_batched(self, queue_objects):
+        """ส่งคำสั่งสร้างวัตถุทั้งหมดจาก queue_objects(batch) ใน batch เดียว แล้ว resolve handle
         
-        print(f"✅ Created {floor_count} floor tiles")
-        return floor_count > 0
+        คำสั่งที่ล้มเหลวไม่หยุด batch - วัตถุที่สร้างไม่สำเร็จถูกตัดออกทีละชิ้นเหมือนตอนสร้าง
+        ทีละวัตถุ ส่วน exception ที่นี่คือการส่งล้มเหลวทั้ง batch (เช่น timeout)
+        """
+        objects = []
+        try:
+            with self.sim_manager.batch() as batch:
+                objects.extend(queue_objects(batch))
+        except Exception as e:
+            print(f"❌ Batch error while creating field objects: {e}")
+        return self.sim_manager.resolve_handles(objects)
     
     # ===============================================================
     # STRING INPUT FIELD CREATION
@@ -128,35 +147,39 @@ class FieldManager:
                     print(f"  - {warning}")
             
             print("🏗️ Creating field objects...")
-            created_count = 0
             
-            for item in field_data:
-                grid_x, grid_y = item['grid_x'], item['grid_y']
-                code = item['code']
-                position = item['position']
-                
-                print(f"  Creating '{code}' at {position}")
-                
-                parsed = self.parser.parse_cell_code(code)
-                obj_info = self._create_object_from_parsed(grid_x, grid_y, parsed)
-                
-                if obj_info:
-                    if isinstance(obj_info, list):
-                        self.field_objects.extend(obj_info)
-                        created_count += len(obj_info)
-                    else:
-                        self.field_objects.append(obj_info)
-                        created_count += 1
+            def queue_objects(batch):
+                objects = []
+                for item in field_data:
+                    grid_x, grid_y = item['grid_x'], item['grid_y']
+                    code = item['code']
+                    position = item['position']
+                    
+                    print(f"  Creating '{code}' at {position}")
+                    
+                    parsed = self.parser.parse_cell_code(code)
+                    obj_info = self._create_object_from_parsed(grid_x, grid_y, parsed, batch)
+                    
+                    if obj_info:
+                        if isinstance(obj_info, list):
+                            objects.extend(obj_info)
+                        else:
+                            objects.append(obj_info)
+                return objects
+            
+            # ทุกช่องของสนามส่งใน batch เดียว
+            objects = self._build_batched(queue_objects)
+            self.field_objects.extend(objects)
             
-            print(f"✅ Created {created_count} objects from string")
-            return created_count > 0
+            print(f"✅ Created {len(objects)} objects from string")
+            return len(objects) > 0
             
         except Exception as e:
             print(f"❌ Error creating field from string: {e}")
             return False
     
-    def _create_object_from_parsed(self, grid_x, grid_y, parsed):
-        """สร้างวัตถุจากข้อมูลที่แปลงแล้ว"""
+    def _create_object_from_parsed(self, grid_x, grid_y, parsed, batch=None):
+        """สร้างวัตถุจากข้อมูลที่แปลงแล้ว (batch: เพิ่มคำสั่งเข้า batch ของผู้เรียก)"""
         obj_type = parsed['type']
         
         if obj_type == 'empty':
@@ -166,13 +189,15 @@ class FieldManager:
             return self.objects_creator.create_obstacle_box(
                 grid_x, grid_y, 
                 parsed['height_cm'], 
-                parsed.get('texture_side')
+                parsed.get('texture_side'),
+                batch=batch
             )
         
         elif obj_type == 'mission_pad':
             return self.objects_creator.create_mission_pad(
                 grid_x, grid_y, 
-                parsed['pad_number']
+                parsed['pad_number'],
+                batch=batch
             )
         
         elif obj_type == 'predefined_fence':
@@ -180,12 +205,12 @@ class FieldManager:
             objects = []
             
             # สร้างรั้วพิเศษ
-            fence_objects = self.pingpong_system.create_predefined_fence()
+            fence_objects = self.pingpong_system.create_predefined_fence(batch)
             if fence_objects:
                 objects.extend(fence_objects)
             
             # สร้างลูกปิงปองในพื้นที่ A3
-            balls = self.pingpong_system.create_pingpong_balls(0, 2, 8)  # A3 area
+            balls = self.pingpong_system.create_pingpong_balls(0, 2, 8, batch=batch)  # A3 area
             if balls:
                 objects.extend(balls)
             
@@ -197,14 +222,14 @@ class FieldManager:
             
             # สร้างรั้วรอบๆ พื้นที่
             fence_segments = self._create_fence_segments_for_position(grid_x, grid_y)
-            fence_objects = self.pingpong_system.create_fence_boundary(fence_segments)
+            fence_objects = self.pingpong_system.create_fence_boundary(fence_segments, batch)
             
             if fence_objects:
                 objects.extend(fence_objects)
             
             # สร้างลูกปิงปองถ้ามี
             if parsed['has_balls']:
-                balls = self.pingpong_system.create_pingpong_balls(grid_x, grid_y)
+                balls = self.pingpong_system.create_pingpong_balls(grid_x, grid_y, batch=batch)
                 if balls:
                     objects.extend(balls)
             
@@ -216,13 +241,15 @@ class FieldManager:
         elif obj_type == 'qrcode_box':
             return self.objects_creator.create_qrcode_box(
                 grid_x, grid_y, 
-                parsed.get('qr_path')
+                parsed.get('qr_path'),
+                batch=batch
             )
         
         elif obj_type == 'pingpong_zone':
             zone_info = self.pingpong_system.create_pingpong_zone(
                 grid_x, grid_y, 
-                parsed['has_balls']
+                parsed['has_balls'],
+                batch=batch
             )
             
             if zone_info:
@@ -280,46 +307,46 @@ class FieldManager:
         """สร้างสนามแบบ preset พื้นฐาน"""
         print("🏗️ Creating default preset field...")
         
-        # สร้างพื้นก่อน
-        if not self.create_tiled_floor():
-            return False
-        
-        try:
-            # Mission Pads ที่มุม
-            objects = []
+        def queue_objects(batch):
+            # พื้นก่อน
+            objects = self._queue_tiled_floor(batch)
             
-            objects.append(self.objects_creator.create_mission_pad(0, 0, 1))  # A1
-            objects.append(self.objects_creator.create_mission_pad(4, 0, 2))  # E1
-            objects.append(self.objects_creator.create_mission_pad(0, 4, 3))  # A5
-            objects.append(self.objects_creator.create_mission_pad(4, 4, 4))  # E5
+            # Mission Pads ที่มุม
+            objects.append(self.objects_creator.create_mission_pad(0, 0, 1, batch))  # A1
+            objects.append(self.objects_creator.create_mission_pad(4, 0, 2, batch))  # E1
+            objects.append(self.objects_creator.create_mission_pad(0, 4, 3, batch))  # A5
+            objects.append(self.objects_creator.create_mission_pad(4, 4, 4, batch))  # E5
             
             # กล่องสิ่งกีดขวางตรงกลาง
-            objects.append(self.objects_creator.create_obstacle_box(2, 2, 160))  # C3
-            objects.append(self.objects_creator.create_obstacle_box(1, 2, 80))   # B3
-            objects.append(self.objects_creator.create_obstacle_box(3, 2, 80))   # D3
+            objects.append(self.objects_creator.create_obstacle_box(2, 2, 160, batch=batch))  # C3
+            objects.append(self.objects_creator.create_obstacle_box(1, 2, 80, batch=batch))   # B3
+            objects.append(self.objects_creator.create_obstacle_box(3, 2, 80, batch=batch))   # D3
             
             # Ping Pong Zones
-            zone1 = self.pingpong_system.create_pingpong_zone(1, 1, has_balls=True)  # B2
-            zone2 = self.pingpong_system.create_pingpong_zone(3, 3, has_balls=True)  # D4
-            
-            # เพิ่มวัตถุที่สร้างสำเร็จ
-            for obj in objects:
-                if obj:
-                    self.field_objects.append(obj)
+            zone1 = self.pingpong_system.create_pingpong_zone(1, 1, has_balls=True, batch=batch)  # B2
+            zone2 = self.pingpong_system.create_pingpong_zone(3, 3, has_balls=True, batch=batch)  # D4
             
             # เพิ่ม ping pong zones
             for zone in [zone1, zone2]:
                 if zone:
                     # เพิ่ม poles
                     for pole_handle in zone['poles']:
-                        self.field_objects.append({
+                        objects.append({
                             'handle': pole_handle,
                             'type': 'pingpong_pole',
                             'grid': zone['grid']
                         })
                     
                     # เพิ่ม balls
-                    self.field_objects.extend(zone['balls'])
+                    objects.extend(zone['balls'])
+            return objects
+        
+        try:
+            # ทั้งสนามส่งใน batch เดียว
+            objects = self._build_batched(queue_objects)
+            if not any(obj['type'] == 'floor' for obj in objects):
+                return False
+            self.field_objects.extend(objects)
             
             print("✅ Default preset field created successfully!")
             return True
@@ -332,39 +359,38 @@ class FieldManager:
         """สร้างสนามที่มีรั้วพิเศษตามแบบเดิม"""
         print("🏗️ Creating complete field with special fence...")
         
-        # สร้างพื้นก่อน
-        if not self.create_tiled_floor():
-            return False
-        
-        try:
+        def queue_objects(batch):
+            # พื้นก่อน
+            all_objects = self._queue_tiled_floor(batch)
+            
             # สร้าง Mission Pads
             mission_pads = [
-                self.objects_creator.create_mission_pad(2, 1, 1),  # C2
-                self.objects_creator.create_mission_pad(3, 2, 2),  # D3
-                self.objects_creator.create_mission_pad(2, 3, 3),  # C4
-                self.objects_creator.create_mission_pad(3, 4, 4),  # D5
+                self.objects_creator.create_mission_pad(2, 1, 1, batch),  # C2
+                self.objects_creator.create_mission_pad(3, 2, 2, batch),  # D3
+                self.objects_creator.create_mission_pad(2, 3, 3, batch),  # C4
+                self.objects_creator.create_mission_pad(3, 4, 4, batch),  # D5
             ]
             
             # สร้างสิ่งกีดขวาง
             obstacles = [
-                self.objects_creator.create_obstacle_box(1, 1, 80),   # B2
-                self.objects_creator.create_obstacle_box(2, 2, 120),  # C3
-                self.objects_creator.create_obstacle_box(3, 3, 80),   # D4
-                self.objects_creator.create_obstacle_box(4, 4, 80),   # E5
+                self.objects_creator.create_obstacle_box(1, 1, 80, batch=batch),   # B2
+                self.objects_creator.create_obstacle_box(2, 2, 120, batch=batch),  # C3
+                self.objects_creator.create_obstacle_box(3, 3, 80, batch=batch),   # D4
+                self.objects_creator.create_obstacle_box(4, 4, 80, batch=batch),   # E5
             ]
             
             # สร้างรั้วพิเศษ
             print("🔍 Creating predefined fence...")
-            fence_objects = self.pingpong_system.create_predefined_fence()
+            fence_objects = self.pingpong_system.create_predefined_fence(batch)
             print(f"🟢 Fence creation returned {len(fence_objects) if fence_objects else 0} objects")
             
             # สร้างลูกปิงปองในพื้นที่รั้ว (A3)
             print("🔍 Creating ping pong balls...")
-            pingpong_balls = self.pingpong_system.create_pingpong_balls(0, 2, 8)  # A3 area
+            pingpong_balls = self.pingpong_system.create_pingpong_balls(0, 2, 8, batch=batch)  # A3 area
             print(f"🟠 Ping pong creation returned {len(pingpong_balls) if pingpong_balls else 0} balls")
             
             # เพิ่มทุกอย่างเข้า field_objects
-            all_objects = mission_pads + obstacles
+            all_objects += mission_pads + obstacles
             
             # เพิ่ม fence objects (ตรวจสอบให้แน่ใจว่าไม่เป็น None)
             if fence_objects:
@@ -379,6 +405,13 @@ class FieldManager:
                 print(f"✅ Added {len(pingpong_balls)} ping pong balls to field")
             else:
                 print("⚠️ No ping pong balls to add")
+            return all_objects
+        
+        try:
+            # ทั้งสนามส่งใน batch เดียว - handle ได้หลังส่งแล้วเท่านั้น
+            all_objects = self._build_batched(queue_objects)
+            if not any(obj['type'] == 'floor' for obj in all_objects):
+                return False
             
             print(f"🔍 Total objects to add: {len(all_objects)}")
             
@@ -470,6 +503,7 @@ class FieldManager:
                     print(f"📁 ขนาดไฟล์: {file_size} bytes")
                     
                     result = self.sim_manager.sim.loadModel(model_path)
+                    self.sim_manager.handles.invalidate()
                     print(f"🔍 ผลการโหลด: {result}")
                     
                     if result is not None and result != -1:
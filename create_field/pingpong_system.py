@@ -10,18 +10,19 @@ class PingPongSystem:
     """คลาสสำหรับจัดการระบบลูกปิงปองและรั้ว"""
     
     def __init__(self, sim_manager, config):
+        self.sim_manager = sim_manager
         self.sim = sim_manager.sim
         self.config = config
     
-    def create_pingpong_zone(self, grid_x, grid_y, has_balls=False):
-        """สร้างเขตปิงปอง - ไม่รวมเสา ใช้เฉพาะลูกปิงปอง"""
+    def create_pingpong_zone(self, grid_x, grid_y, has_balls=False, batch=None):
+        """สร้างเขตปิงปอง - ไม่รวมเสา ใช้เฉพาะลูกปิงปอง (batch: ดู create_pingpong_balls)"""
         try:
             grid_name = self.config.grid_to_string(grid_x, grid_y)
             
             # สร้างลูกปิงปองถ้าต้องการ
             balls = []
             if has_balls:
-                balls = self.create_pingpong_balls(grid_x, grid_y)
+                balls = self.create_pingpong_balls(grid_x, grid_y, batch=batch)
             
             print(f"🏓 Created Ping Pong Zone at {grid_name} (balls only)")
             
@@ -35,49 +36,58 @@ class PingPongSystem:
             print(f"❌ Error creating ping pong zone: {e}")
             return None
     
-    def create_pingpong_balls(self, grid_x, grid_y, count=8):
-        """สร้างลูกปิงปอง"""
+    def create_pingpong_balls(self, grid_x, grid_y, count=8, batch=None):
+        """สร้างลูกปิงปอง - ทุกลูกส่งใน batch เดียว
+        
+        batch: ส่งคำสั่งรวมกับ batch ของผู้เรียก - 'handle' ที่คืนเป็น BatchResult
+               จนกว่าจะ resolve ด้วย sim_manager.resolve_handles() หลังส่ง batch
+        """
         try:
             position = self.config.get_grid_position(grid_x, grid_y)
             balls = []
             
-            # ตำแหน่งลูกปิงปอง (วางแบบสุ่มในพื้นที่)
-            for i in range(count):
-                # สุ่มตำแหน่งในพื้นที่ 0.6×0.6 ตารางเมตร
-                ball_x = position[0] + random.uniform(-0.25, 0.25)
-                ball_y = position[1] + random.uniform(-0.25, 0.25)
-                ball_z = 0.02  # วางบนพื้น
-                
-                ball_handle = self.sim.createPrimitiveShape(
-                    self.sim.primitiveshape_spheroid,
-                    [self.config.physics['pingpong_diameter']] * 3
-                )
-                self.sim.setObjectPosition(ball_handle, [ball_x, ball_y, ball_z])
-                
-                # ตั้งชื่อ
-                ball_name = f"PingPongBall_{i}_{self.config.grid_to_string(grid_x, grid_y)}"
-                self.sim.setObjectAlias(ball_handle, ball_name)
-                
-                # ตั้งค่าคุณสมบัติ (ไม่ static เพื่อให้เคลื่อนที่ได้)
-                self.sim.setObjectInt32Parameter(ball_handle, self.sim.shapeintparam_static, 0)
-                self.sim.setObjectInt32Parameter(ball_handle, self.sim.shapeintparam_respondable, 1)
-                
-                # ตั้งมวล
-                self.sim.setShapeMass(ball_handle, self.config.physics['pingpong_mass'])
-                
-                # ตั้งสี
-                self.sim.setShapeColor(ball_handle, None, self.sim.colorcomponent_ambient_diffuse, 
-                                     self.config.colors['pingpong_ball'])
-                
-                ball_info = {
-                    'handle': ball_handle,
-                    'type': 'pingpong_ball',
-                    'name': ball_name,
-                    'grid': self.config.grid_to_string(grid_x, grid_y),
-                    'position': [ball_x, ball_y, ball_z]
-                }
+            with self.sim_manager.batch(batch) as current:
+                bsim = current.getObject('sim')
                 
-                balls.append(ball_info)
+                # ตำแหน่งลูกปิงปอง (วางแบบสุ่มในพื้นที่)
+                for i in range(count):
+                    # สุ่มตำแหน่งในพื้นที่ 0.6×0.6 ตารางเมตร
+                    ball_x = position[0] + random.uniform(-0.25, 0.25)
+                    ball_y = position[1] + random.uniform(-0.25, 0.25)
+                    ball_z = 0.02  # วางบนพื้น
+                    
+                    ball_handle = bsim.createPrimitiveShape(
+                        self.sim.primitiveshape_spheroid,
+                        [self.config.physics['pingpong_diameter']] * 3
+                    )
+                    bsim.setObjectPosition(ball_handle, [ball_x, ball_y, ball_z])
+                    
+                    # ตั้งชื่อ
+                    ball_name = f"PingPongBall_{i}_{self.config.grid_to_string(grid_x, grid_y)}"
+                    bsim.setObjectAlias(ball_handle, ball_name)
+                    
+                    # ตั้งค่าคุณสมบัติ (ไม่ static เพื่อให้เคลื่อนที่ได้)
+                    bsim.setObjectInt32Parameter(ball_handle, self.sim.shapeintparam_static, 0)
+                    bsim.setObjectInt32Parameter(ball_handle, self.sim.shapeintparam_respondable, 1)
+                    
+                    # ตั้งมวล
+                    bsim.setShapeMass(ball_handle, self.config.physics['pingpong_mass'])
+                    
+                    # ตั้งสี
+                    bsim.setShapeColor(ball_handle, None, self.sim.colorcomponent_ambient_diffuse, 
+                                       self.config.colors['pingpong_ball'])
+                    
+                    ball_info = {
+                        'handle': ball_handle,
+                        'type': 'pingpong_ball',
+                        'name': ball_name,
+                        'grid': self.config.grid_to_string(grid_x, grid_y),
+                        'position': [ball_x, ball_y, ball_z]
+                    }
+                    
+                    balls.append(ball_info)
+            if batch is None:
+                balls = self.sim_manager.resolve_handles(balls)
             
             grid_name = self.config.grid_to_string(grid_x, grid_y)
             print(f"🏓 Created {count} ping pong balls at {grid_name}")
@@ -87,15 +97,18 @@ class PingPongSystem:
             print(f"❌ Error creating ping pong balls: {e}")
             return []
     
-    def create_fence_boundary(self, fence_segments):
-        """สร้างรั้วกั้นตามพิกัดที่กำหนด"""
+    def create_fence_boundary(self, fence_segments, batch=None):
+        """สร้างรั้วกั้นตามพิกัดที่กำหนด - ทุกส่วนส่งใน batch เดียว (batch: ดู create_pingpong_balls)"""
         try:
             fence_objects = []
             
-            for start_pos, end_pos, name in fence_segments:
-                fence_obj = self._create_fence_segment(start_pos, end_pos, name)
-                if fence_obj:
-                    fence_objects.append(fence_obj)
+            with self.sim_manager.batch(batch) as current:
+                for start_pos, end_pos, name in fence_segments:
+                    fence_obj = self._create_fence_segment(start_pos, end_pos, name, current)
+                    if fence_obj:
+                        fence_objects.append(fence_obj)
+            if batch is None:
+                fence_objects = self.sim_manager.resolve_handles(fence_objects)
             
             print(f"🟢 Created {len(fence_objects)} fence segments")
             return fence_objects
@@ -104,13 +117,14 @@ class PingPongSystem:
             print(f"❌ Error creating fence boundary: {e}")
             return []
     
-    def _create_fence_segment(self, start_pos, end_pos, name, height=0.1):
-        """สร้างรั้วแต่ละส่วน - ใช้สีขาวตามรูป"""
+    def _create_fence_segment(self, start_pos, end_pos, name, batch, height=0.1):
+        """สร้างรั้วแต่ละส่วน - ใช้สีขาวตามรูป (เพิ่มคำสั่งเข้า batch, 'handle' เป็น BatchResult)"""
         try:
             length = math.sqrt((end_pos[0] - start_pos[0])**2 + (end_pos[1] - start_pos[1])**2)
             angle = math.atan2(end_pos[1] - start_pos[1], end_pos[0] - start_pos[0])
+            bsim = batch.getObject('sim')
             
-            wall = self.sim.createPrimitiveShape(
+            wall = bsim.createPrimitiveShape(
                 self.sim.primitiveshape_cuboid,
                 [length, 0.06, height]  # ความหนา 6cm สูง 10cm
             )
@@ -121,18 +135,18 @@ class PingPongSystem:
                 height/2 + 0.02
             ]
             
-            self.sim.setObjectPosition(wall, center_pos)
-            self.sim.setObjectOrientation(wall, [0, 0, angle])
+            bsim.setObjectPosition(wall, center_pos)
+            bsim.setObjectOrientation(wall, [0, 0, angle])
             
             # ตั้งชื่อ
-            self.sim.setObjectAlias(wall, name)
+            bsim.setObjectAlias(wall, name)
             
             # ตั้งค่าคุณสมบัติ
-            self.sim.setObjectInt32Parameter(wall, self.sim.shapeintparam_static, 1)
-            self.sim.setObjectInt32Parameter(wall, self.sim.shapeintparam_respondable, 1)
+            bsim.setObjectInt32Parameter(wall, self.sim.shapeintparam_static, 1)
+            bsim.setObjectInt32Parameter(wall, self.sim.shapeintparam_respondable, 1)
             
             # ใช้สีเขียวตามโค้ดเดิม
-            self.sim.setShapeColor(wall, None, self.sim.colorcomponent_ambient_diffuse, 
+            bsim.setShapeColor(wall, None, self.sim.colorcomponent_ambient_diffuse, 
                                  [0.2, 0.8, 0.2])  # สีเขียวตามเดิม
             
             fence_info = {
@@ -150,8 +164,8 @@ class PingPongSystem:
             print(f"❌ Failed to create fence segment {name}: {e}")
             return None
     
-    def create_predefined_fence(self):
-        """สร้างรั้วรูปแบบพิเศษตาม field_creator เดิม - แบบล้อมรอบสมบูรณ์"""
+    def create_predefined_fence(self, batch=None):
+        """สร้างรั้วรูปแบบพิเศษตาม field_creator เดิม - แบบล้อมรอบสมบูรณ์ (batch: ดู create_pingpong_balls)"""
         a3_pos = self.config.get_grid_position(0, 2)  # A3
         a4_pos = self.config.get_grid_position(0, 3)  # A4
         b3_pos = self.config.get_grid_position(1, 2)  # B3
@@ -207,6 +221,6 @@ class PingPongSystem:
             [a3_pos[0] - half_tile, a3_pos[1] - half_tile], "A3_Left"),
         ]
         
-        fence_objects = self.create_fence_boundary(fence_segments)
+        fence_objects = self.create_fence_boundary(fence_segments, batch)
         print(f"🟢 Created livestock fence (shaped boundary) - Height: {fence_height*100:.0f}cm")
         return fence_objects
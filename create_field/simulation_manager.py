@@ -3,21 +3,27 @@ Simulation Management Module
 จัดการการเชื่อมต่อและควบคุม CoppeliaSim
 """
 
+import contextlib
 import time
-try:
-    from coppeliasim_zmqremoteapi_client import RemoteAPIClient
-except ImportError:
-    import sys
-    import os
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from zmqRemoteApi import RemoteAPIClient
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from zmqRemoteApi import BatchResult, RemoteAPIBatch, HandleCache, create_client
 
 class SimulationManager:
     """คลาสสำหรับจัดการการจำลอง CoppeliaSim"""
     
-    def __init__(self):
-        self.client = RemoteAPIClient()
+    def __init__(self, client=None):
+        """
+        Args:
+            client: remote API client ที่ต้องการใช้ร่วม (เช่น RemoteAPIClientPool
+                    เมื่อมีหลาย thread เรียกใช้พร้อมกัน) - ไม่ระบุจะสร้างใหม่
+                    ตาม COPPELIA_CONFIG ใน config.py
+        """
+        self.client = client if client is not None else create_client()
         self.sim = self.client.getObject('sim')
+        # handle cache ที่ใช้ร่วมกับทุก component ที่ใช้ client เดียวกัน
+        self.handles = HandleCache.of(self.client)
         self.simulation_running = False
         self._physics_fixed = False
         
@@ -27,6 +33,7 @@ class SimulationManager:
         """เริ่มการจำลอง"""
         try:
             self.sim.startSimulation()
+            self.handles.invalidate()
             self.simulation_running = True
             print("✅ Simulation started")
             time.sleep(1)
@@ -39,6 +46,7 @@ class SimulationManager:
         """หยุดการจำลอง"""
         try:
             self.sim.stopSimulation()
+            self.handles.invalidate()
             self.simulation_running = False
             print("⏹️ Simulation stopped")
             time.sleep(1)
@@ -57,6 +65,68 @@ class SimulationManager:
             print(f"❌ Failed to pause simulation: {e}")
             return False
     
+    def get_handle(self, path):
+        """handle ของ object ตาม path (ผ่าน cache - ไม่พบจะ raise exception)"""
+        return self.handles.resolve(path)
+    
+    def batch(self, parent=None):
+        """รวมหลายคำสั่ง sim.* ให้ส่งใน round trip เดียว
+        
+        parent: batch ของผู้เรียก - คำสั่งถูกเพิ่มเข้า batch นั้นและส่งเมื่อผู้เรียกปิด batch
+        
+        CoppeliaSim จริงไม่รู้จัก multi-call message ของ RemoteAPIClient (มีเฉพาะใน mock)
+        batch จึงถูกส่งผ่าน Lua helper ใน sandbox script ด้วย sim.callScriptFunction ครั้งเดียว
+        ทั้งกับ client ทางการที่ create_client() คืน และ RemoteAPIClient ของโปรเจกต์
+        ถ้าติดตั้ง helper ไม่ได้จะส่งทีละคำสั่งเหมือนเดิม - timeout ถูกส่งต่อให้ผู้เรียก
+        โดยไม่ส่งซ้ำ (simulator อาจรัน batch ไปแล้ว)
+        """
+        if parent is not None:
+            return contextlib.nullcontext(parent)
+        if hasattr(self.client, 'batch'):
+            return self.client.batch()
+        # client ทางการ - ไม่มี batch API จึงใช้ Lua helper ผ่าน interface เดียวกัน
+        return RemoteAPIBatch(self.client, pipelined=False, scriptType=self._sandbox_script_type())
+    
+    def _sandbox_script_type(self):
+        """ค่า sim.scripttype_sandboxscript จากตารางค่าคงที่ของ client (None ถ้าไม่มี)"""
+        value = getattr(self.sim, 'scripttype_sandboxscript', None)
+        return value if isinstance(value, int) else None
+    
+    def resolve_handles(self, objects):
+        """แทน BatchResult ใน 'handle' ของวัตถุด้วยค่าจริงหลังส่ง batch
+        
+        วัตถุที่สร้างไม่สำเร็จถูกตัดออกทีละชิ้น (คำสั่งที่ล้มเหลวใน batch ไม่กระทบวัตถุอื่น)
+        ส่วนป้าย QR ที่สร้างไม่สำเร็จทำให้ 'qr_board_handle' เป็น None แต่ยังเก็บกล่องไว้
+        """
+        resolved = []
+        for obj in objects:
+            if not obj:
+                continue
+            try:
+                obj['handle'] = self._resolve_handle(obj.get('handle'))
+            except Exception as e:
+                print(f"❌ Failed to create {obj.get('name', obj.get('type'))}: {e}")
+                continue
+            if 'qr_board_handle' in obj:
+                try:
+                    obj['qr_board_handle'] = self._resolve_handle(obj['qr_board_handle'])
+                except Exception as e:
+                    print(f"⚠️ QR board of {obj.get('name')} not created: {e}")
+                    obj['qr_board_handle'] = None
+            resolved.append(obj)
+        return resolved
+    
+    @staticmethod
+    def _resolve_handle(value):
+        if isinstance(value, BatchResult):
+            handle = value.result()
+            if not value.done():
+                raise RuntimeError('batch was discarded before sending')
+            value = handle
+        if value == -1:
+            raise RuntimeError('simulator returned handle -1')
+        return value
+    
     def setup_physics_engine(self, config):
         """ตั้งค่า Physics Engine"""
         if self._physics_fixed:
@@ -86,6 +156,7 @@ class SimulationManager:
         
         try:
             self.sim.removeObjects(handles)
+            self.handles.invalidate()
             print(f"🗑️ Removed {len(handles)} objects")
         except Exception as e:
             print(f"⚠️ Warning during object removal: {e}")
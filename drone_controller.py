@@ -9,10 +9,17 @@ import time
 import numpy as np
 import cv2
 import os
+import ntpath
 import math
 from datetime import datetime
 import threading
-from collections import Counter
+from collections import Counter, deque, namedtuple
+
+from frame_buffer import BufferedFrame, FrameRingBuffer, FrameStream
+from image_writer import ImageWriter
+from camera_viewer import CameraViewer
+from video_recorder import VideoRecorder
+from frame_archive import FrameArchive
 
 # ตรวจสอบ libraries ที่จำเป็น
 try:
@@ -33,59 +40,302 @@ try:
     from coppeliasim_zmqremoteapi_client import RemoteAPIClient
     SIMULATION_MODE = True
 except ImportError:
-    SIMULATION_MODE = False
-    print("⚠️ CoppeliaSim not available - Real drone mode only")
+    try:
+        from zmqRemoteApi import RemoteAPIClient
+        SIMULATION_MODE = True
+    except ImportError:
+        SIMULATION_MODE = False
+        print("⚠️ CoppeliaSim not available - Real drone mode only")
+
+if SIMULATION_MODE:
+    from zmqRemoteApi import HandleCache, create_client
+
+try:
+    from config import COPPELIA_CONFIG, TELLO_CONFIG, GENERAL_CONFIG
+except ImportError:
+    COPPELIA_CONFIG = {}
+    TELLO_CONFIG = {}
+    GENERAL_CONFIG = {}
+
+def _load_image(image):
+    """คืนภาพ BGR จาก path หรือ numpy array ที่อยู่ในหน่วยความจำแล้ว (None ถ้าอ่านไม่ได้)"""
+    if isinstance(image, np.ndarray):
+        return image
+    return cv2.imread(image)
+
+def _has_image(image):
+    """มีภาพให้ใช้หรือไม่ (path ที่ไม่ว่าง หรือ numpy array)"""
+    return isinstance(image, np.ndarray) or bool(image)
+
+def _is_black(images, threshold=10, step=8):
+    """ภาพมืดเกือบทั้งภาพหรือไม่ - เฉลี่ยจาก pixel ทุก step แถว/คอลัมน์ (view ไม่คัดลอกภาพ)
+    
+    รับภาพเดียว (H, W, 3) คืน bool หรือ stack (N, H, W, 3) คืน bool array ขนาด N
+    """
+    return images[..., ::step, ::step, :].mean(axis=(-3, -2, -1)) < threshold
+
+def _collect_burst(read, n, min_interval=0.0, timeout=5.0):
+    """เก็บภาพ n ภาพจาก read(after, timeout) ห่างกันอย่างน้อย min_interval วินาที โดยข้ามภาพดำ
+    
+    Returns:
+        tuple: (frames (k, H, W, 3) uint8, timestamps (k,) จาก time.monotonic) - k < n ถ้าหมดเวลา
+    """
+    frames = None
+    timestamps = np.empty(n)
+    count = 0
+    last_sequence = None
+    next_shot = time.monotonic()
+    deadline = next_shot + timeout + n * min_interval
+    
+    while count < n:
+        now = time.monotonic()
+        if now >= deadline:
+            break
+        if next_shot > now:
+            time.sleep(next_shot - now)
+        frame = read(last_sequence, max(0.0, deadline - time.monotonic()))
+        if frame is None:
+            break
+        last_sequence = frame.sequence
+        
+        image = frame.image
+        if image.size == 0 or _is_black(image):
+            continue
+        if frames is None:
+            # จองหน่วยความจำครั้งเดียวตามขนาดภาพแรก
+            frames = np.empty((n,) + image.shape, np.uint8)
+        frames[count] = image
+        received = getattr(frame, 'received', None)
+        timestamps[count] = received if received is not None else frame.timestamp
+        next_shot = timestamps[count] + min_interval
+        count += 1
+    
+    if frames is None:
+        return np.empty((0, 0, 0, 3), np.uint8), timestamps[:0]
+    return frames[:count], timestamps[:count]
+
+def _image_label(image):
+    """ชื่อภาพสำหรับแสดงใน log"""
+    if isinstance(image, np.ndarray):
+        return f"<frame {image.shape[1]}x{image.shape[0]}>"
+    return image
 
 class DroneCamera:
-    def __init__(self, sim):
+    # path ของ vision sensor แต่ละตัว (ตั้งค่าได้ใน COPPELIA_CONFIG)
+    SENSOR_PATHS = {
+        'front': COPPELIA_CONFIG.get('vision_sensor_name', '/Quadcopter/visionSensor'),
+        'bottom': COPPELIA_CONFIG.get('bottom_vision_sensor_name', '/Quadcopter/bottomVisionSensor'),
+    }
+    
+    # ฟังก์ชันใน Lua script ของโดรนที่เก็บภาพแล้วคืนชื่อไฟล์ทันที (blocking)
+    #
+    #   function captureImage()
+    #       sim.handleVisionSensor(visionSensor)
+    #       local img, res = sim.getVisionSensorImg(visionSensor)
+    #       local name = 'image_' .. os.date('%Y%m%d_%H%M%S') .. '.png'
+    #       sim.saveImage(img, res, 0, imageFolder .. '/' .. name, -1)
+    #       return name
+    #   end
+    #
+    # ถ้า script ไม่มีฟังก์ชันเหล่านี้จะใช้ signal เดิมแทน: (signal สั่ง, signal ตอบชื่อไฟล์)
+    CAPTURE_FUNCTIONS = {'front': 'captureImage', 'bottom': 'captureBottomImage'}
+    # ข้อความ error ที่แปลว่า script ไม่มีฟังก์ชันนั้น (error อื่นเป็นปัญหาชั่วคราว ไม่ปิดวิธีนี้)
+    MISSING_FUNCTION_ERRORS = ('not found', 'does not exist', 'unknown function',
+                               'failed calling script function', 'attempt to call a nil value')
+    CAPTURE_SIGNALS = {
+        'front': ('capture_image', 'image_saved'),
+        'bottom': ('capture_bottom_image', 'bottom_camera_image_saved'),
+    }
+    
+    def __init__(self, sim, client=None, handles=None, script_handle=None, writer=None):
+        """
+        Args:
+            sim: CoppeliaSim object
+            client: remote API client (ใช้ getVisionSensorImage แบบ zero-copy ถ้ามี)
+            handles: HandleCache ที่ใช้ร่วมกัน (ไม่ระบุจะ resolve ด้วย sim.getObject)
+            script_handle: handle ของ script ที่มี captureImage/captureBottomImage
+                           (ไม่ระบุจะรอ signal แบบเดิม)
+            writer: ImageWriter ที่ใช้บันทึกภาพจาก grab_frame (ไม่ระบุจะสร้างเมื่อบันทึกครั้งแรก)
+        """
         self.sim = sim
-        self.image_folder = 'D:/pythonforcoppelia/captured_images'
-        if not os.path.exists(self.image_folder):
-            os.makedirs(self.image_folder)
+        self.client = client
+        self.handles = handles
+        self.script_handle = script_handle
+        self.writer = writer
+        # camera -> script มีฟังก์ชันเก็บภาพแบบ blocking หรือไม่ (ยังไม่รู้จนกว่าจะลองเรียก)
+        self._blocking_capture = {}
+        # ภาพที่ Lua บันทึกอยู่ใน script_image_folder ส่วนภาพที่ Python บันทึกอยู่ใน image_folder
+        self.image_folder = writer.folder if writer is not None else \
+            COPPELIA_CONFIG.get('image_folder', './captured_images/')
+        self.script_image_folder = COPPELIA_CONFIG.get('script_image_folder',
+                                                       'D:/pythonforcoppelia/captured_images')
+        # สร้างโฟลเดอร์ของ Lua เมื่อสั่งเก็บภาพครั้งแรก (ดู _ensure_script_folder)
+        self._script_folder_ready = False
+    
+    def grab_frame(self, camera='front', timeout=None):
+        """อ่านภาพจาก vision sensor ตรงๆ เป็น numpy array (BGR) - ไม่ผ่าน Lua และไม่เขียนไฟล์
+        
+        Args:
+            camera: 'front' หรือ 'bottom'
+            timeout: เวลารอคำตอบ (วินาที) - None = ใช้ timeout ของ client
+                (client ทางการไม่มี timeout ต่อคำสั่ง จึงไม่มีผล)
+            
+        Returns:
+            numpy array ขนาด (H, W, 3) uint8 แบบ BGR (ใช้กับ OpenCV ได้ทันที)
+        """
+        return self._read_sensor(self.client, self.sim, self._sensor_handle(camera), timeout)
+    
+    def start_stream(self, camera='front', fps=10, maxsize=4, pose=None, buffer=None):
+        """อ่านภาพจากกล้องต่อเนื่องใน background (FrameStream)
+        
+        worker thread ใช้ client ของตัวเอง (socket แยก) จึงไม่แย่ง socket ที่ใช้สั่งบิน
+        
+        Args:
+            camera: 'front' หรือ 'bottom'
+            fps: จำนวนภาพต่อวินาที
+            maxsize: ขนาด queue (เต็มแล้วทิ้งภาพเก่าสุด)
+            pose: ฟังก์ชันคืน (position, heading) ของโดรนตอนได้ภาพ
+            buffer: FrameRingBuffer ที่จะเก็บภาพไว้ด้วย
+        """
+        handle = self._sensor_handle(camera)
+        client = self._stream_client()
+        sim = client.getObject('sim')
+        return FrameStream(lambda: self._read_sensor(client, sim, handle), fps=fps, maxsize=maxsize,
+                           pose=pose, buffer=buffer, name=camera)
+    
+    def _stream_client(self):
+        """client ใหม่ไปยัง simulator เดียวกันสำหรับ worker thread"""
+        if self.client is not None and hasattr(self.client, '_endpoint'):
+            # endpoint, context (inproc:// ต้องใช้ context ร่วม) และ timeout เดิม
+            return create_client({'endpoint': self.client._endpoint, 'timeout': self.client.timeout},
+                                 context=self.client.context)
+        return create_client()
+    
+    @staticmethod
+    def _read_sensor(client, sim, handle, timeout=None):
+        """อ่านภาพ vision sensor เป็น BGR"""
+        if client is not None and hasattr(client, 'getVisionSensorImage'):
+            rgb = client.getVisionSensorImage(handle, timeout)
+        else:
+            image, resolution = sim.getVisionSensorImg(handle)
+            rgb = np.frombuffer(image, dtype=np.uint8).reshape(resolution[1], resolution[0], 3)[::-1]
+        return cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+    
+    def save_frame(self, frame, camera='front', filename=None, wait=True):
+        """บันทึกภาพจาก grab_frame ลงไฟล์เมื่อต้องการเก็บจริงๆ
+        
+        Args:
+            frame: ภาพ BGR
+            camera: ชื่อกล้อง (ใช้เป็นคำนำหน้าชื่อไฟล์อัตโนมัติ)
+            filename: ชื่อไฟล์ (None = ตั้งชื่อจากกล้องและเวลา)
+            wait: รอให้เขียนเสร็จแล้วคืน path (False = คืน Future ทันที)
+        """
+        if self.writer is None:
+            self.writer = ImageWriter(self.image_folder)
+        future = self.writer.submit(frame, filename=filename, prefix=camera)
+        return future.result() if wait else future
+    
+    def capture_async(self, camera='front'):
+        """อ่านภาพจากกล้องแล้วบันทึกใน background - คืน Future ของ path"""
+        return self.save_frame(self.grab_frame(camera), camera, wait=False)
+    
+    def _sensor_handle(self, camera):
+        if camera not in self.SENSOR_PATHS:
+            raise ValueError(f"Unknown camera: {camera} (expected 'front' or 'bottom')")
+        path = self.SENSOR_PATHS[camera]
+        if self.handles is not None:
+            return self.handles.resolve(path)
+        return self.sim.getObject(path)
 
     def simcapture(self, timeout=5.0):
         """สั่งให้ Lua เก็บภาพ แล้วคืนชื่อไฟล์"""
-        self.sim.clearStringSignal('image_saved')
-        self.sim.setStringSignal('capture_image', '1')
-        
-        start = time.time()
-        while time.time() - start < timeout:
-            signal_data = self.sim.getStringSignal('image_saved')
-            if signal_data and isinstance(signal_data, str) and signal_data != '':
-                self.sim.clearStringSignal('image_saved')
-                return os.path.join(self.image_folder, signal_data)
-            time.sleep(0.05)
-        raise TimeoutError('No image_saved signal received')
+        return self.capture('front', timeout)
     
     def simcapturebottom(self, timeout=5.0):
         """สั่งให้ Lua เก็บภาพจากกล้องล่าง - แก้ไขเพื่อทำงานร่วมกับ proximity sensor"""
-        # Use the updated signal name
-        self.sim.clearStringSignal('bottom_camera_image_saved')
-        # Set the signal to '1' as expected by the new script
-        self.sim.setStringSignal('capture_bottom_image', '1')
+        return self.capture('bottom', timeout)
+    
+    def capture(self, camera='front', timeout=5.0):
+        """สั่งให้ Lua เก็บภาพลงไฟล์ แล้วคืน path
+        
+        เรียก captureImage/captureBottomImage ใน script แบบ blocking ถ้ามี
+        (คืนทันทีที่บันทึกเสร็จ) ไม่เช่นนั้นสั่งด้วย signal แล้วรอ signal ตอบกลับ
+        
+        Args:
+            camera: 'front' หรือ 'bottom'
+            timeout: เวลารอสูงสุด (วินาที) เมื่อใช้ signal
+        """
+        self._ensure_script_folder()
+        filename = self._capture_blocking(camera)
+        if filename is None:
+            filename = self._capture_signal(camera, timeout)
+        return os.path.join(self.script_image_folder, filename)
+    
+    def _ensure_script_folder(self):
+        """สร้าง script_image_folder ให้ Lua บันทึกภาพได้ (ครั้งเดียว)
+        
+        path แบบมีชื่อไดรฟ์ของ Windows (เช่นค่าเริ่มต้น D:/...) บนระบบอื่นไม่ถูกสร้าง -
+        ไม่เช่นนั้นจะได้โฟลเดอร์ชื่อ 'D:' ใน working directory
+        """
+        if self._script_folder_ready:
+            return
+        folder = self.script_image_folder
+        if os.name == 'nt' or not ntpath.splitdrive(folder)[0]:
+            os.makedirs(folder, exist_ok=True)
+        self._script_folder_ready = True
+    
+    def _capture_blocking(self, camera):
+        """คืนชื่อไฟล์จากฟังก์ชันใน script หรือ None ถ้าใช้วิธีนี้ไม่ได้"""
+        if self.script_handle is None or self._blocking_capture.get(camera) is False:
+            return None
+        
+        function = self.CAPTURE_FUNCTIONS[camera]
+        try:
+            filename = self.sim.callScriptFunction(function, self.script_handle)
+        except TimeoutError:
+            # RemoteAPITimeout - simulator ช้า ไม่ได้แปลว่าไม่มีฟังก์ชัน
+            raise
+        except Exception as e:
+            if not any(marker in str(e).lower() for marker in self.MISSING_FUNCTION_ERRORS):
+                # ล้มเหลวชั่วคราว - ใช้ signal เฉพาะครั้งนี้ ครั้งหน้ายังลองเรียกฟังก์ชันก่อน
+                print(f"⚠️ {function} failed ({e}) - using capture signals for this capture")
+                return None
+            print(f"⚠️ {function} not available in drone script ({e}) - using capture signals")
+            self._blocking_capture[camera] = False
+            return None
+        
+        self._blocking_capture[camera] = True
+        if not filename or not isinstance(filename, str):
+            raise RuntimeError(f'{function} returned no image file')
+        return filename
+    
+    def _capture_signal(self, camera, timeout):
+        """สั่งเก็บภาพด้วย signal แล้ววนอ่าน signal ตอบกลับ"""
+        request, reply = self.CAPTURE_SIGNALS[camera]
+        self.sim.clearStringSignal(reply)
+        self.sim.setStringSignal(request, '1')
         
         start = time.time()
         while time.time() - start < timeout:
-            # Check for the updated signal name
-            signal_data = self.sim.getStringSignal('bottom_camera_image_saved')
+            signal_data = self.sim.getStringSignal(reply)
             if signal_data and isinstance(signal_data, str) and signal_data != '':
-                self.sim.clearStringSignal('bottom_camera_image_saved')
-                return os.path.join(self.image_folder, signal_data)
+                self.sim.clearStringSignal(reply)
+                return signal_data
             time.sleep(0.05)
-        raise TimeoutError('No bottom_camera_image_saved signal received')
+        raise TimeoutError(f'No {reply} signal received')
     
 class QRCodeScanner:
     def __init__(self):
         self.last_detected_codes = []
     
     def scan_qr_code(self, image_path):
-        """แสกน QR Code จากไฟล์ภาพ"""
+        """แสกน QR Code จากไฟล์ภาพ หรือภาพ (numpy array BGR) ที่อยู่ในหน่วยความจำแล้ว"""
         if not QR_SCANNER_AVAILABLE:
             print("❌ QR Scanner not available")
             return None
             
         try:
-            image = cv2.imread(image_path)
+            image = _load_image(image_path)
             if image is None:
                 print(f"❌ ไม่สามารถอ่านไฟล์ภาพ: {image_path}")
                 return None
@@ -124,12 +374,13 @@ class QRCodeScanner:
     def draw_qr_detection(self, image_path, output_path=None):
         """วาดกรอบรอบ QR Code ที่ตรวจพบ"""
         try:
-            image = cv2.imread(image_path)
+            image = _load_image(image_path)
             if image is None:
                 return None
             
             # แสกน QR Code
-            qr_codes = self.scan_qr_code(image_path)
+            qr_codes = self.scan_qr_code(image)
+            image = image.copy()
             if not qr_codes:
                 return image
             
@@ -163,6 +414,144 @@ class QRCodeScanner:
             return None
 
 
+VideoFrame = namedtuple('VideoFrame', ['image', 'sequence', 'received', 'decoded'])
+
+class TelloVideoReader:
+    def __init__(self, address, open_timeout=5.0, history=512):
+        """
+        Decode video stream ของ Tello ใน thread แยก แล้วเก็บเฉพาะภาพล่าสุด (single slot)
+        
+        ภาพแต่ละภาพแปลงเป็น BGR ครั้งเดียวตอน decode และมี sequence เพิ่มขึ้นทีละ 1
+        ผู้ใช้รอภาพที่ใหม่กว่า sequence ที่เคยได้ด้วย read(after=...) แทนการ sleep
+        
+        Args:
+            address: UDP address ของ video stream (Tello.get_udp_video_address())
+            open_timeout: เวลารอเปิด stream (วินาที)
+            history: จำนวน latency ล่าสุดที่เก็บไว้คำนวณสถิติ
+        """
+        self.address = address
+        self.open_timeout = open_timeout
+        self.error = None
+        
+        self._condition = threading.Condition()
+        self._frame = None
+        self._taken = True
+        self._next_sequence = 0
+        
+        # สถิติ: ภาพที่ decode ได้ / ถูกส่งให้ผู้ใช้ / ถูกภาพใหม่ทับก่อนมีใครอ่าน
+        self.decoded = 0
+        self.delivered = 0
+        self.skipped = 0
+        self._latencies = deque(maxlen=history)
+        self._decode_times = deque(maxlen=history)
+        self._started_at = time.monotonic()
+        
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    @property
+    def running(self):
+        return self._running
+    
+    @property
+    def sequence(self):
+        """sequence ของภาพล่าสุด (-1 = ยังไม่มีภาพ)"""
+        frame = self._frame
+        return -1 if frame is None else frame.sequence
+    
+    def read(self, after=None, timeout=None):
+        """
+        ภาพล่าสุด (VideoFrame) ที่ sequence มากกว่า after
+        
+        Args:
+            after: sequence ของภาพที่เคยได้แล้ว (None = ภาพใดก็ได้)
+            timeout: เวลารอภาพใหม่สูงสุด (วินาที, 0 = ไม่รอ, None = รอจนกว่าจะได้)
+            
+        Returns:
+            VideoFrame หรือ None ถ้าหมดเวลา / stream หยุดแล้ว
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._frame is None or (after is not None and self._frame.sequence <= after):
+                if not self._running:
+                    return None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+            
+            frame = self._frame
+            if not self._taken:
+                self._taken = True
+                self.delivered += 1
+                self._latencies.append(time.monotonic() - frame.received)
+            return frame
+    
+    def stop(self, timeout=2.0):
+        """หยุด decode (thread จะจบเมื่อได้ packet ถัดไปหรือ stream ปิด)"""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+    
+    def stats(self):
+        """
+        สถิติ: ภาพที่ decode / ส่งให้ผู้ใช้ / ถูกข้าม, fps ที่ decode ได้
+        และ latency ตั้งแต่ได้รับ packet จนผู้ใช้ได้ภาพ (ms)
+        """
+        elapsed = time.monotonic() - self._started_at
+        latencies = np.array(self._latencies) * 1000
+        decode_times = np.array(self._decode_times) * 1000
+        return {
+            'decoded': self.decoded,
+            'delivered': self.delivered,
+            'skipped': self.skipped,
+            'decode_fps': self.decoded / elapsed if elapsed > 0 else 0.0,
+            'latency_ms': {
+                'p50': float(np.percentile(latencies, 50)) if len(latencies) else None,
+                'p99': float(np.percentile(latencies, 99)) if len(latencies) else None,
+            },
+            'decode_ms': float(np.median(decode_times)) if len(decode_times) else None,
+        }
+    
+    def _run(self):
+        container = None
+        try:
+            import av
+            container = av.open(self.address, timeout=(self.open_timeout, None))
+            for packet in container.demux(video=0):
+                if not self._running:
+                    break
+                received = time.monotonic()
+                for frame in packet.decode():
+                    image = frame.to_ndarray(format='bgr24')
+                    self._publish(image, received)
+        except Exception as e:
+            self.error = e
+            print(f"❌ Video decoder stopped: {e}")
+        finally:
+            if container is not None:
+                container.close()
+            with self._condition:
+                self._running = False
+                self._condition.notify_all()
+    
+    def _publish(self, image, received):
+        decoded = time.monotonic()
+        with self._condition:
+            if not self._taken:
+                # ภาพก่อนหน้ายังไม่มีใครอ่าน - ถูกทับ
+                self.skipped += 1
+            self._frame = VideoFrame(image, self._next_sequence, received, decoded)
+            self._taken = False
+            self._next_sequence += 1
+            self.decoded += 1
+            self._decode_times.append(decoded - received)
+            self._condition.notify_all()
+
+
 #class โค้ดกล้องของตูนชาย
 class DroneTello(Tello):
     """
@@ -175,13 +564,14 @@ class DroneTello(Tello):
         data = drone.scan_qr("photo.jpg")
         drone.land()
     """
-    def __init__(self, show_cam=False, enable_mission_pad=False):
+    def __init__(self, show_cam=False, enable_mission_pad=False, writer=None):
         """
         Initialize DroneTello with optional camera display and mission pads.
         
         Args:
             show_cam (bool): If True, shows live camera feed in a window
             enable_mission_pad (bool): If True, enables mission pad detection
+            writer (ImageWriter): Writer pool for captured photos (created on first capture if None)
             
         Usage:
             drone = DroneTello()  # Basic connection
@@ -196,10 +586,17 @@ class DroneTello(Tello):
         print(f"Battery: {self.get_battery()}%")
         print(f"Temperature: {self.get_temperature()}°C")
         
+        # photos are saved by a background writer pool
+        self.image_folder = TELLO_CONFIG.get('image_folder', 'pictures/')
+        self.writer = writer
+        
         # camera display attribute
         self.show_camera = False
         self._camera_thread = None
         self._stream_active = False
+        self.video_reader = None
+        self.viewer = None
+        self.recorder = None
         
         # landing status tracking
         self.is_land = True  # Drone starts on ground
@@ -240,22 +637,32 @@ class DroneTello(Tello):
             print("Starting video stream...")
             self.streamon()
             
-            # รอให้ stream เริ่มต้น
-            time.sleep(3)  # ลดเวลารอจาก 5 เป็น 3 วินาที
+            # decode ใน thread แยก แล้วรอภาพแรกแทนการ sleep
+            self.video_reader = TelloVideoReader(self.get_udp_video_address())
+            first = self.video_reader.read(timeout=5.0)
             
-            # ตั้งค่า stream ให้พร้อมใช้งานโดยไม่ทดสอบเฟรม
+            # ตั้งค่า stream ให้พร้อมใช้งาน (ภาพแรกอาจมาช้ากว่านี้ได้)
             self._stream_active = True
-            print("✅ Video stream initialized (without frame testing)")
+            if first is not None:
+                print(f"✅ Video stream initialized ({first.image.shape[1]}x{first.image.shape[0]})")
+            else:
+                print("⚠️ Video stream started but no frame decoded yet")
             
         except Exception as e:
             print(f"ไม่สามารถเริ่ม video stream: {e}")
             self._stream_active = False
 
 
-    def start_camera_display(self):
+    def start_camera_display(self, max_fps=None):
         """
         Start displaying camera feed in a GUI window.
         
+        The window redraws only when a new frame has been decoded, at most
+        max_fps times per second, with an FPS/latency overlay.
+        
+        Args:
+            max_fps (float): Display rate cap (None = GENERAL_CONFIG['display_fps'])
+        
         Usage:
             drone.start_camera_display()  # Opens camera window
             # Press 'q' in the window to close it
@@ -265,6 +672,9 @@ class DroneTello(Tello):
             
         if self._stream_active:
             self.show_camera = True
+            reader = self.video_reader
+            self.viewer = CameraViewer(reader.read, title="Tello Camera Feed", max_fps=max_fps,
+                                       alive=lambda: reader.running)
             self._camera_thread = threading.Thread(target=self._camera_loop)
             self._camera_thread.daemon = True
             self._camera_thread.start()
@@ -277,7 +687,9 @@ class DroneTello(Tello):
             drone.stop_camera_display()  # Closes camera window
         """
         self.show_camera = False
-        if self._camera_thread:
+        if self.viewer is not None:
+            self.viewer.stop()
+        if self._camera_thread and self._camera_thread is not threading.current_thread():
             self._camera_thread.join()
         cv2.destroyAllWindows()
         
@@ -287,38 +699,32 @@ class DroneTello(Tello):
         
         Usage: Called automatically by start_camera_display()
         """
-        while self.show_camera and self._stream_active:
-            try:
-                frame = self.get_frame_read().frame
-                
-                # Convert BGR to RGB
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                
-                if frame_rgb is not None:
-                    cv2.imshow("Tello Camera Feed", frame_rgb)
-                    if cv2.waitKey(1) & 0xFF == ord('q'):
-                        self.stop_camera_display()
-                        break
-                else:
-                    time.sleep(0.1)
-            except Exception as e:
-                print(f"Camera error: {e}")
-                self._stream_active = False
-                break
+        try:
+            self.viewer.run()
+            if not self.video_reader.running:
+                raise RuntimeError('video decoder stopped')
+        except Exception as e:
+            print(f"Camera error: {e}")
+            self._stream_active = False
+        finally:
+            self.show_camera = False
 
 
-    def capture(self, count=3, folder="pictures/", base_filename="tello_picture", delay=1.5):
+    def capture(self, count=3, folder=None, base_filename="tello_picture", delay=1.5, wait=True):
         """
         ถ่ายรูปหลายรูปติดต่อกัน โดยข้ามเฟรมที่เป็นสีดำ
         
+        การบันทึกไฟล์ทำใน ImageWriter - ระหว่างรอถ่ายรูปถัดไปไฟล์ก่อนหน้าถูกเขียนไปพร้อมกัน
+        
         Args:
             count (int): จำนวนรูปที่ต้องการถ่าย
-            folder (str): โฟลเดอร์ที่จะบันทึกรูป
+            folder (str): โฟลเดอร์ที่จะบันทึกรูป (None = TELLO_CONFIG['image_folder'])
             base_filename (str): ชื่อไฟล์พื้นฐาน
             delay (float): ระยะเวลารอระหว่างการถ่ายแต่ละรูป (วินาที)
+            wait (bool): รอให้ทุกไฟล์เขียนเสร็จ (False = คืน Future ของแต่ละไฟล์ทันที)
             
         Returns:
-            list: รายการไฟล์ที่บันทึกสำเร็จ
+            list: รายการไฟล์ที่บันทึกสำเร็จ (หรือ Future เมื่อ wait=False)
         """
         if not self._stream_active:
             print("เริ่มต้น video stream...")
@@ -328,13 +734,15 @@ class DroneTello(Tello):
             print("❌ ไม่สามารถเริ่ม video stream ได้")
             return []
             
-        # สร้างโฟลเดอร์ถ้าไม่มี
-        if not os.path.exists(folder):
-            os.makedirs(folder)
+        if folder is None:
+            folder = self.image_folder
+        if self.writer is None:
+            self.writer = ImageWriter(self.image_folder)
             
         saved_files = []
         attempt_count = 0
         max_attempts = count * 3  # ให้โอกาสมากกว่าจำนวนรูปที่ต้องการ
+        last_sequence = None
         
         print(f"📸 เริ่มถ่ายรูป {count} รูป...")
         
@@ -344,47 +752,162 @@ class DroneTello(Tello):
             try:
                 print(f"🔄 ความพยายามที่ {attempt_count}: กำลังถ่ายรูป...")
                 
-                frame_read = self.get_frame_read()
-                if frame_read is None:
-                    print("⚠️ ไม่สามารถอ่าน frame ได้")
-                    time.sleep(delay)
+                # รอภาพที่ใหม่กว่าภาพที่ใช้ไปแล้ว (ไม่ได้ภาพเดิมซ้ำ)
+                frame = self.video_reader.read(after=last_sequence, timeout=delay)
+                if frame is None:
+                    print("⚠️ ไม่มีภาพใหม่จาก video stream")
                     continue
+                last_sequence = frame.sequence
                     
-                frame = frame_read.frame
-                if frame is None or frame.size == 0:
-                    print("⚠️ Frame ว่างเปล่า")
-                    time.sleep(delay)
-                    continue
-                    
-                # ตรวจสอบว่าเป็นเฟรมสีดำหรือไม่
-                if self._is_black_frame(frame):
+                # ตรวจสอบว่าเป็นเฟรมสีดำหรือไม่ - รอบถัดไปรอภาพใหม่เอง ไม่ต้อง sleep
+                if frame.image.size == 0 or self._is_black_frame(frame.image):
                     print("⚠️ ตรวจพบเฟรมสีดำ - ข้ามไป")
-                    time.sleep(delay)
                     continue
                     
-                # แปลงสีและบันทึกรูป
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                # ภาพเป็น BGR อยู่แล้ว - ส่งให้ writer บันทึก (ไม่รอการเขียนไฟล์)
                 filename = f"{base_filename}_{len(saved_files) + 1}.jpg"
-                full_path = folder + filename
+                full_path = os.path.join(folder, filename)
+                # writer ต่อชื่อแบบ relative เข้ากับโฟลเดอร์ของมันเอง - โฟลเดอร์อื่นต้องส่ง path เต็ม
+                if os.path.abspath(folder) == os.path.abspath(self.writer.folder):
+                    target = filename
+                else:
+                    target = os.path.abspath(full_path)
                 
-                success = cv2.imwrite(full_path, frame_rgb)
+                saved_files.append(self.writer.submit(frame.image, filename=target, copy=False))
+                print(f"✅ ถ่ายรูปที่ {len(saved_files)}: {full_path}")
                 
-                if success:
-                    saved_files.append(full_path)
-                    print(f"✅ บันทึกรูปที่ {len(saved_files)}: {full_path}")
-                    
-                    # รอก่อนถ่ายรูปถัดไป
-                    if len(saved_files) < count:
-                        time.sleep(delay)
-                else:
-                    print("❌ ไม่สามารถบันทึกไฟล์ได้")
+                # รอก่อนถ่ายรูปถัดไป
+                if len(saved_files) < count:
+                    time.sleep(delay)
                     
             except Exception as e:
                 print(f"❌ เกิดข้อผิดพลาด: {e}")
                 time.sleep(delay)
+        
+        if not wait:
+            return saved_files
+        
+        paths = []
+        for future in saved_files:
+            try:
+                paths.append(future.result())
+            except Exception as e:
+                print(f"❌ ไม่สามารถบันทึกไฟล์ได้: {e}")
                 
-        print(f"📸 ถ่ายรูปเสร็จสิ้น: {len(saved_files)}/{count} รูป")
-        return saved_files
+        print(f"📸 ถ่ายรูปเสร็จสิ้น: {len(paths)}/{count} รูป")
+        return paths
+
+    def capture_burst(self, n, min_interval=0.0, timeout=5.0):
+        """
+        ถ่ายภาพต่อเนื่อง n ภาพเป็น numpy array โดยไม่บันทึกไฟล์ ข้ามเฟรมที่เป็นสีดำ
+        
+        Args:
+            n (int): จำนวนภาพ
+            min_interval (float): ระยะห่างขั้นต่ำระหว่างภาพ (วินาที, 0 = ทุกภาพใหม่จาก stream)
+            timeout (float): เวลารอสูงสุดนอกเหนือจากระยะห่างระหว่างภาพ (วินาที)
+            
+        Returns:
+            tuple: (frames (k, H, W, 3) uint8 BGR, timestamps (k,)) - k < n ถ้าหมดเวลา
+        """
+        if not self._stream_active:
+            self._start_video_stream()
+        if not self._stream_active:
+            print("❌ ไม่สามารถเริ่ม video stream ได้")
+            return np.empty((0, 0, 0, 3), np.uint8), np.empty(0)
+        
+        return _collect_burst(self.video_reader.read, n, min_interval, timeout)
+
+    def start_stream(self, fps=30, maxsize=4, pose=None, buffer=None):
+        """
+        อ่านภาพจาก video stream ต่อเนื่องใน background (FrameStream)
+        
+        Args:
+            fps: จำนวนภาพต่อวินาทีที่อ่าน (ภาพที่ซ้ำกับครั้งก่อนไม่ถูกนับ)
+            maxsize: ขนาด queue (เต็มแล้วทิ้งภาพเก่าสุด)
+            pose: ฟังก์ชันคืน (position, heading) ของโดรนตอนได้ภาพ
+            buffer: FrameRingBuffer ที่จะเก็บภาพไว้ด้วย
+            
+        Returns:
+            FrameStream (ภาพเป็น BGR)
+        """
+        if not self._stream_active:
+            self._start_video_stream()
+        if not self._stream_active:
+            raise RuntimeError('Video stream is not available')
+        
+        reader = self.video_reader
+        last = [None]
+        
+        def read():
+            # เฉพาะภาพที่ใหม่กว่าครั้งก่อน (ไม่รอ)
+            frame = reader.read(after=last[0], timeout=0)
+            if frame is None:
+                return None
+            last[0] = frame.sequence
+            return frame.image
+        
+        return FrameStream(read, fps=fps, maxsize=maxsize, pose=pose, buffer=buffer, name='tello')
+
+    def start_recording(self, path=None, segment_seconds=60, fps=30, codec='mp4v', pose=None):
+        """
+        Record the video stream to rolling video segments plus a CSV frame index.
+        
+        Args:
+            path (str): Base file name without extension (None = image folder + timestamp)
+            segment_seconds (float): Length of each segment file
+            fps (float): Frame rate written to the video files
+            codec (str): 'mp4v'/'avc1' for MP4 or 'MJPG' for AVI
+            pose (callable): Returns (position, heading) to store with each frame
+            
+        Returns:
+            VideoRecorder
+            
+        Usage:
+            drone.start_recording('flights/run1', segment_seconds=30)
+            ...
+            drone.stop_recording()
+        """
+        if not self._stream_active:
+            self._start_video_stream()
+        if not self._stream_active:
+            raise RuntimeError('Video stream is not available')
+        
+        self.stop_recording()
+        if path is None:
+            path = os.path.join(self.image_folder, f"tello_{time.strftime('%Y%m%d_%H%M%S')}")
+        self.recorder = VideoRecorder(path, source=self.video_reader.read, fps=fps,
+                                      segment_seconds=segment_seconds, codec=codec, pose=pose)
+        print(f"🎬 Recording video to {path}_*{self.recorder.extension}")
+        return self.recorder
+    
+    def stop_recording(self):
+        """
+        Stop recording and finish writing queued frames.
+        
+        Returns:
+            dict: Recorder statistics (None if not recording)
+        """
+        if self.recorder is None:
+            return None
+        stats = self.recorder.stop()
+        self.recorder = None
+        print(f"🎬 Recording stopped: {stats['written']} frames, {len(stats['segments'])} segments")
+        return stats
+
+    def video_stats(self):
+        """
+        Video pipeline statistics: decoded, delivered, skipped and displayed frames
+        plus packet-to-consumer latency.
+        
+        Usage:
+            print(drone.video_stats())
+        """
+        if self.video_reader is None:
+            return None
+        stats = self.video_reader.stats()
+        stats['displayed'] = self.viewer.displayed if self.viewer is not None else 0
+        stats['display_fps'] = self.viewer.fps if self.viewer is not None else 0.0
+        return stats
 
     def _is_black_frame(self, frame, threshold=10):
         """
@@ -398,11 +921,8 @@ class DroneTello(Tello):
             bool: True ถ้าเป็นเฟรมสีดำ
         """
         try:
-            # คำนวณค่าเฉลี่ยของ pixel ทั้งหมด
-            mean_value = frame.mean()
-            
-            # ถ้าค่าเฉลี่ยต่ำกว่า threshold แสดงว่าเป็นเฟรมสีดำ
-            return mean_value < threshold
+            # ค่าเฉลี่ยจากภาพที่ย่อด้วยการข้าม pixel - ต่ำกว่า threshold แสดงว่าเป็นเฟรมสีดำ
+            return bool(_is_black(frame, threshold))
             
         except Exception as e:
             print(f"ข้อผิดพลาดในการตรวจสอบเฟรม: {e}")
@@ -413,7 +933,7 @@ class DroneTello(Tello):
         Scan QR code from saved image file and return decoded data.
         
         Args:
-            filename (str): Name of the image file in pictures/ folder
+            filename (str): Name of the image file in the image folder (TELLO_CONFIG['image_folder'])
             
         Returns:
             str: Decoded QR code data, or None if no QR code found
@@ -423,8 +943,7 @@ class DroneTello(Tello):
             if data:
                 print(f"QR code says: {data}")
         """
-        path = "pictures/"
-        full_path = path + filename
+        full_path = os.path.join(self.image_folder, filename)
         
         if not os.path.exists(full_path):
             print(f"File {full_path} not found")
@@ -491,6 +1010,12 @@ class DroneTello(Tello):
         """
         try:
             self.stop_camera_display()
+            if getattr(self, 'recorder', None) is not None:
+                self.stop_recording()
+            
+            # Finish pending photo writes
+            if getattr(self, 'writer', None) is not None:
+                self.writer.flush()
             
             # Land if drone is still flying
             if not self.is_land:
@@ -507,6 +1032,9 @@ class DroneTello(Tello):
                     print("Video stream stopped")
                 except Exception as e:
                     print(f"Warning: Could not stop video stream: {e}")
+            
+            if getattr(self, 'video_reader', None) is not None:
+                self.video_reader.stop()
                     
         except Exception as e:
             print(f"Cleanup error: {e}")
@@ -514,16 +1042,22 @@ class DroneTello(Tello):
 class ProximitySensorManager:
     """จัดการ Proximity Sensor แบบง่าย ๆ"""
     
-    def __init__(self, sim, drone_handle):
+    def __init__(self, sim, drone_handle, subscription=None, handles=None):
         """เริ่มต้น ProximitySensorManager
         
         Args:
             sim: CoppeliaSim object
             drone_handle: handle ของโดรน
+            subscription: RemoteAPISubscription ที่มี topic 'proximity:<sensor>'
+                          (ถ้ามี จะอ่านค่าล่าสุดในเครื่องแทนการส่งคำสั่ง)
+            handles: HandleCache ที่ใช้ร่วมกัน (ถ้ามี path ที่ลองแล้วไม่พบจะไม่ถามซ้ำ)
         """
         self.sim = sim
         self.drone_handle = drone_handle
+        self.handles = handles
         self.sensor_handle = None
+        self.sensor_topic = None
+        self.subscription = subscription
         self.is_initialized = False
         
     def setup(self):
@@ -536,9 +1070,20 @@ class ProximitySensorManager:
                 '/proximitySensor'
             ]
             
+            if self.handles is not None:
+                name, handle = self.handles.resolve_first(sensor_names)
+                if name is not None:
+                    self.sensor_handle = handle
+                    self.sensor_topic = f'proximity:{name}'
+                    print(f"✅ เจอ proximity sensor: {name}")
+                    self.is_initialized = True
+                    return True
+                sensor_names = []
+            
             for name in sensor_names:
                 try:
                     self.sensor_handle = self.sim.getObject(name)
+                    self.sensor_topic = f'proximity:{name}'
                     print(f"✅ เจอ proximity sensor: {name}")
                     self.is_initialized = True
                     return True
@@ -564,7 +1109,7 @@ class ProximitySensorManager:
         
         try:
             # อ่านข้อมูลจาก proximity sensor
-            result, distance, point, object_handle, normal = self.sim.readProximitySensor(self.sensor_handle)
+            result, distance, point, object_handle, normal = self._read_sensor()
             
             if result:  # ถ้าเจออะไร
                 return distance
@@ -649,6 +1194,14 @@ class ProximitySensorManager:
         
         print("✅ เสร็จสิ้นการตรวจสอบความสูง")
 
+    def _read_sensor(self):
+        """ค่าล่าสุดจาก subscription ถ้ามี ไม่เช่นนั้นอ่านจาก simulator"""
+        if self.subscription is not None:
+            reading = self.subscription.latest(self.sensor_topic)
+            if reading is not None:
+                return reading
+        return self.sim.readProximitySensor(self.sensor_handle)
+
     # ฟังก์ชันช่วยเหลือ
     def get_sensor_info(self):
         """ดูข้อมูลเซ็นเซอร์"""
@@ -656,7 +1209,7 @@ class ProximitySensorManager:
             return "❌ Sensor ยังไม่ได้ตั้งค่า"
         
         try:
-            result, distance, point, object_handle, normal = self.sim.readProximitySensor(self.sensor_handle)
+            result, distance, point, object_handle, normal = self._read_sensor()
             
             info = {
                 'detected': result,
@@ -890,8 +1443,16 @@ class ProximitySensorManager:
 
 #class รวมคำสั่งหลัก
 class NaturalDroneController:
-    def __init__(self, use_simulation=True):
-        """เริ่มต้น Drone Controller"""
+    def __init__(self, use_simulation=True, client=None, stepping=False):
+        """เริ่มต้น Drone Controller
+        
+        Args:
+            use_simulation: True = CoppeliaSim, False = โดรนจริง
+            client: remote API client ที่ต้องการใช้ร่วม (เช่น RemoteAPIClientPool
+                    ที่ใช้ร่วมกับ FieldManager) - ไม่ระบุจะสร้างใหม่
+            stepping: True = สั่ง sim.step() เองทุกขั้นของการเคลื่อนที่แทนการ sleep
+                      (simulation วิ่งเร็วเท่าที่ physics engine ทำได้)
+        """
         # ตัวแปรพื้นฐาน
         self.use_simulation = use_simulation and SIMULATION_MODE
         self.use_real_drone = not use_simulation and REAL_DRONE_AVAILABLE
@@ -909,15 +1470,39 @@ class NaturalDroneController:
         self.acceleration = 0.2
         self.position_tolerance = 0.05
         
+        # นาฬิกาของ simulation (วินาที) - ใช้แทนเวลาจริงใน stepping mode
+        self.stepping = stepping
+        self.sim_time = 0.0
+        self.sim_time_step = 0.05
+        self._pending_sim_time = 0.0
+        
+        # ค่าสถานะล่าสุดที่อ่านใน background (ดู start_state_stream)
+        self.state_stream = None
+        self._state_written_at = 0.0
+        
         # ตัวแปรสำหรับระบบต่างๆ
-        self.client = None
+        self.client = client
         self.sim = None
+        self.handles = None
         self.drone_handle = None
         self.camera = None
         self.qr_scanner = None
         self.mission_pad_detector = None
         self.bottom_camera_handle = None
-        self.image_folder = './captured_images'
+        self.image_folder = (COPPELIA_CONFIG if self.use_simulation else TELLO_CONFIG).get(
+            'image_folder', './captured_images')
+        self.image_writer = None
+        # ภาพล่าสุดของแต่ละกล้อง พร้อมเวลาและตำแหน่งโดรนตอนได้ภาพ
+        self.frame_buffers = {}
+        self.frame_buffer_size = GENERAL_CONFIG.get('frame_buffer_size', 8)
+        # กล้องที่อ่านภาพต่อเนื่องใน background: camera -> FrameStream
+        self.streams = {}
+        # หน้าต่างแสดงภาพกล้อง: camera -> CameraViewer
+        self.viewers = {}
+        # การบันทึกวิดีโอ: camera -> VideoRecorder
+        self.recorders = {}
+        # archive ไฟล์เดียวสำหรับเก็บภาพจำนวนมาก (เปิดเมื่อใช้ archive_frame ครั้งแรก)
+        self.frame_archive = None
         self.simulation_running = False
         self.detected_mission_pads = []
         # Wind system variables
@@ -929,9 +1514,8 @@ class NaturalDroneController:
             'zones': []
         }
         
-        # สร้างโฟลเดอร์ถ้ายังไม่มี
-        if not os.path.exists(self.image_folder):
-            os.makedirs(self.image_folder)
+        # บันทึกภาพใน background (สร้างโฟลเดอร์ถ้ายังไม่มี) - ใช้ร่วมกันทั้งกล้องซิมและโดรนจริง
+        self.image_writer = ImageWriter(self.image_folder)
         
         # เริ่มต้นการเชื่อมต่อ
         print("🔧 Initializing connection...")
@@ -957,14 +1541,19 @@ class NaturalDroneController:
     def _init_simulation(self):
         try:
             print("🔄 Connecting to CoppeliaSim...")
-            self.client = RemoteAPIClient()
+            if self.client is None:
+                self.client = create_client()
             self.sim = self.client.getObject('sim')      
+            self.handles = HandleCache.of(self.client)
             # ค้นหาโดรน
-            self.drone_handle = self.sim.getObject('/Quadcopter')
+            self.drone_handle = self.handles.resolve('/Quadcopter')
             
             # เริ่ม simulation
+            if self.stepping:
+                self.sim.setStepping(True)
             self.sim.startSimulation()
             self.simulation_running = True
+            self._sync_sim_clock()
             
             # อัปเดตตำแหน่งปัจจุบัน
             self._update_current_position()
@@ -973,7 +1562,7 @@ class NaturalDroneController:
             
             # ✅ เพิ่มส่วนนี้
             # รอให้ simulation เสถียร
-            time.sleep(2)
+            self._advance_time(2)
             # เริ่มต้นระบบลม
             print("🌪️ Setting up wind system...")
             wind_success = self.setup_wind_system()
@@ -988,12 +1577,101 @@ class NaturalDroneController:
             self.use_simulation = False
             return False
     
+    def set_stepping(self, enabled=True):
+        """เปิด/ปิด stepping mode ระหว่างที่ simulation ทำงานอยู่"""
+        if not self.use_simulation or self.sim is None:
+            print("⚠️ Stepping mode requires simulation")
+            return False
+        try:
+            self.sim.setStepping(enabled)
+            self.stepping = enabled
+            self._sync_sim_clock()
+            print(f"⏱️ Stepping mode {'enabled' if enabled else 'disabled'} (dt={self.sim_time_step:.3f}s)")
+            return True
+        except Exception as e:
+            print(f"❌ Failed to set stepping mode: {e}")
+            return False
+    
+    def start_state_stream(self, rate_hz=100):
+        """อ่านตำแหน่ง, orientation และความสูงของโดรนต่อเนื่องใน background
+        
+        get_position/get_orientation จะใช้ค่าล่าสุดในเครื่องแทนการส่งคำสั่งทุกครั้ง
+        (ค่าที่อ่านก่อนการสั่งเคลื่อนที่ครั้งล่าสุดจะไม่ถูกใช้ - อ่านจาก simulator ตรงๆ แทน)
+        """
+        if not self.use_simulation or self.client is None:
+            print("⚠️ State stream requires simulation")
+            return False
+        if not hasattr(self.client, 'subscribe'):
+            print("⚠️ Remote API client does not support subscriptions")
+            return False
+        
+        self.stop_state_stream()
+        topics = ['pose:/Quadcopter']
+        try:
+            self.handles.resolve('/Quadcopter/proximitySensor')
+            topics.append('proximity:/Quadcopter/proximitySensor')
+        except Exception:
+            pass
+        
+        try:
+            self.state_stream = self.client.subscribe(topics, rate_hz=rate_hz)
+            print(f"📡 State stream started: {', '.join(topics)} @ {rate_hz} Hz")
+            return True
+        except Exception as e:
+            print(f"❌ Failed to start state stream: {e}")
+            return False
+    
+    def stop_state_stream(self):
+        """หยุดอ่านสถานะใน background"""
+        if self.state_stream is not None:
+            self.state_stream.stop()
+            self.state_stream = None
+    
+    def _latest_pose(self, field):
+        """position/orientation ล่าสุดจาก state stream ที่ใหม่กว่าการสั่งเคลื่อนที่ครั้งล่าสุด"""
+        if self.state_stream is None:
+            return None
+        pose = self.state_stream.latest('pose:/Quadcopter', since=self._state_written_at)
+        return None if pose is None else pose[field]
+    
+    def get_sim_time(self):
+        """เวลาของ simulation ตามนาฬิกาภายในของ controller (วินาที)"""
+        return self.sim_time
+    
+    def _sync_sim_clock(self):
+        """อ่านเวลาและ time step จาก simulation มาตั้งนาฬิกาภายใน"""
+        try:
+            self.sim_time_step = self.sim.getSimulationTimeStep()
+            self.sim_time = self.sim.getSimulationTime()
+            self._pending_sim_time = 0.0
+        except Exception as e:
+            print(f"⚠️ Failed to read simulation clock: {e}")
+    
+    def _advance_time(self, dt):
+        """เดินเวลาไปข้างหน้า dt วินาที
+        
+        stepping mode: สั่ง sim.step() จนครบ dt (ไม่รอเวลาจริง)
+        โหมดปกติ: sleep ตามเวลาจริงเหมือนเดิม
+        """
+        if self.stepping and self.simulation_running:
+            # สะสมเศษเวลาที่ยังไม่ครบหนึ่ง step ไว้ใช้ในรอบถัดไป
+            self._pending_sim_time += dt
+            while self._pending_sim_time >= self.sim_time_step - 1e-9:
+                self.sim.step()
+                self.sim_time += self.sim_time_step
+                self._pending_sim_time -= self.sim_time_step
+        else:
+            time.sleep(dt)
+            self.sim_time += dt
+    
     def stop_simulation(self):
         """Stop the CoppeliaSim simulation if it's running"""
         if hasattr(self, 'sim') and self.simulation_running:
             try:
                 self.sim.stopSimulation()
                 self.simulation_running = False
+                if self.handles is not None:
+                    self.handles.invalidate()
                 print("🛑 Simulation stopped")
             except Exception as e:
                 print(f"❌ Error stopping simulation: {e}")
@@ -1254,7 +1932,8 @@ class NaturalDroneController:
                     pass
                     
             print("🔧 Initializing DroneTello...")
-            self.drone = DroneTello(show_cam=False, enable_mission_pad=False)  # ปิดทั้ง show_cam และ mission_pad
+            self.drone = DroneTello(show_cam=False, enable_mission_pad=False,  # ปิดทั้ง show_cam และ mission_pad
+                                    writer=self.image_writer)
             time.sleep(3)  # รอให้เชื่อมต่อเสถียร
             
             battery = self.drone.get_battery()
@@ -1270,7 +1949,8 @@ class NaturalDroneController:
         """เริ่มต้นระบบกล้องและ QR Scanner"""
         if self.use_simulation and self.sim is not None:
             try:
-                self.camera = DroneCamera(self.sim)
+                self.camera = DroneCamera(self.sim, client=self.client, handles=self.handles,
+                                          script_handle=self.drone_handle, writer=self.image_writer)
                 self.qr_scanner = QRCodeScanner()
                 
                 # ใช้ ImprovedMissionPadDetector ถ้ามี
@@ -1312,7 +1992,9 @@ class NaturalDroneController:
         """อัปเดตตำแหน่งปัจจุบันของโดรน"""
         if self.use_simulation and self.drone_handle is not None:
             try:
-                pos = self.sim.getObjectPosition(self.drone_handle, -1)
+                pos = self._latest_pose('position')
+                if pos is None:
+                    pos = self.sim.getObjectPosition(self.drone_handle, -1)
                 self.current_position = list(pos)
             except Exception as e:
                 print(f"⚠️ Failed to update position: {e}")
@@ -1321,7 +2003,9 @@ class NaturalDroneController:
         """ดึงข้อมูล orientation ปัจจุบันของโดรน"""
         try:
             if self.use_simulation and self.drone_handle is not None:
-                orientation = self.sim.getObjectOrientation(self.drone_handle, -1)
+                orientation = self._latest_pose('orientation')
+                if orientation is None:
+                    orientation = self.sim.getObjectOrientation(self.drone_handle, -1)
                 self.orientation_matrix = orientation
                 self.current_heading = math.degrees(orientation[2]) % 360
                 
@@ -1404,8 +2088,9 @@ class NaturalDroneController:
                 
                 self.sim.setObjectPosition(self.drone_handle, -1, [current_x, current_y, current_z])
                 self.current_position = [current_x, current_y, current_z]
+                self._state_written_at = time.perf_counter()
                 
-                time.sleep(dt)
+                self._advance_time(dt)
             
             self._update_current_position()
             final_distance = math.sqrt(
@@ -1500,7 +2185,10 @@ class NaturalDroneController:
             return False
         
         print(f"🚁 Hovering for {duration} seconds...")
-        time.sleep(duration)
+        if self.use_simulation:
+            self._advance_time(duration)
+        else:
+            time.sleep(duration)
         print("✅ Hover complete")
         return True
 
@@ -1539,7 +2227,9 @@ class NaturalDroneController:
         # ดึงการหมุนปัจจุบันของโดรน
         if self.use_simulation and self.drone_handle is not None:
             try:
-                current_orientation = self.sim.getObjectOrientation(self.drone_handle, -1)
+                current_orientation = self._latest_pose('orientation')
+                if current_orientation is None:
+                    current_orientation = self.sim.getObjectOrientation(self.drone_handle, -1)
                 yaw = current_orientation[2]  # การหมุนรอบแกน Z
                 
                 # แปลงการเคลื่อนที่จาก local coordinates เป็น global coordinates
@@ -1614,7 +2304,9 @@ class NaturalDroneController:
         if self.use_simulation:
             try:
                 # ในซิม: หมุนแบบ smooth
-                current_orient = self.sim.getObjectOrientation(self.drone_handle, -1)
+                current_orient = self._latest_pose('orientation')
+                if current_orient is None:
+                    current_orient = self.sim.getObjectOrientation(self.drone_handle, -1)
                 target_orient = list(current_orient)
                 target_orient[2] += math.radians(degrees)
                 
@@ -1628,7 +2320,8 @@ class NaturalDroneController:
                     orient = [current_orient[0], current_orient[1], current_yaw]
                     
                     self.sim.setObjectOrientation(self.drone_handle, -1, orient)
-                    time.sleep(0.05)
+                    self._state_written_at = time.perf_counter()
+                    self._advance_time(0.05)
                 
                 print("✅ Rotation complete")
                 return True
@@ -1702,6 +2395,37 @@ class NaturalDroneController:
             print("❌ ไม่มีอินเตอร์เฟซกล้อง")
             return []
 
+    def capture_burst(self, n, min_interval=0.0, camera='front', timeout=5.0):
+        """ถ่ายภาพต่อเนื่อง n ภาพเข้าหน่วยความจำ (ไม่มีไฟล์) - ข้ามภาพดำ
+        
+        ในซิมใช้ stream ของกล้องถ้ามี (ได้เฉพาะภาพใหม่) ไม่เช่นนั้นอ่าน vision sensor ตรงๆ
+        โดยแต่ละครั้งรอคำตอบไม่เกินเวลาที่เหลือของ timeout
+        
+        Args:
+            n: จำนวนภาพ
+            min_interval: ระยะห่างขั้นต่ำระหว่างภาพ (วินาที)
+            camera: 'front' หรือ 'bottom' (โดรนจริงมีกล้องเดียว)
+            timeout: เวลารอสูงสุดนอกเหนือจากระยะห่างระหว่างภาพ (วินาที)
+            
+        Returns:
+            tuple: (frames (k, H, W, 3) uint8 BGR, timestamps (k,) จาก time.monotonic) - k < n ถ้าหมดเวลา
+        
+        Usage:
+            frames, timestamps = controller.capture_burst(5, min_interval=0.2, camera='bottom')
+        """
+        if self.use_real_drone:
+            return self.drone.capture_burst(n, min_interval, timeout)
+        
+        if camera in self.streams:
+            read = self._frame_buffer(camera).wait
+        else:
+            def read(after, timeout):
+                image = self.grab_frame(camera, timeout=timeout)
+                if image is None:
+                    return None
+                return BufferedFrame(image, 0 if after is None else after + 1, time.monotonic(), None, None)
+        return _collect_burst(read, n, min_interval, timeout)
+
     def take_bottom_picture(self):
         """ถ่ายรูปด้วยกล้องล่าง - เริ่มกล้องเฉพาะเมื่อจำเป็น"""
         if self.use_simulation:
@@ -1732,6 +2456,253 @@ class NaturalDroneController:
             print("❌ No camera interface available")
             return None
 
+    def grab_frame(self, camera='front', timeout=None):
+        """อ่านภาพจากกล้องในซิมเป็น numpy array (BGR) โดยไม่ผ่านไฟล์
+        
+        ถ้ามี stream ของกล้องนี้ (start_stream) จะคืนภาพใหม่สุดจาก stream แทน
+        
+        Args:
+            camera: 'front' หรือ 'bottom'
+            timeout: เวลารอสูงสุด (วินาที) - None = ค่าเริ่มต้นของ stream หรือของ client
+            
+        Returns:
+            numpy array หรือ None ถ้าอ่านไม่สำเร็จ
+        """
+        stream = self.streams.get(camera)
+        if stream is not None:
+            # มี stream อยู่แล้ว - ใช้ภาพใหม่สุดแทนการอ่านเอง
+            frame = stream.get_latest(timeout=max(1.0, 2.0 / stream.fps) if timeout is None else timeout)
+            return None if frame is None else frame.image
+        
+        if not self.use_simulation:
+            print("⚠️ grab_frame requires simulation")
+            return None
+        
+        if not self.camera:
+            self._init_camera_system()
+        if not self.camera:
+            print("❌ Camera not initialized")
+            return None
+        
+        try:
+            frame = self.camera.grab_frame(camera, timeout=timeout)
+        except Exception as e:
+            print(f"❌ อ่านภาพจากกล้อง {camera} ไม่สำเร็จ: {e}")
+            return None
+        
+        position, heading = self._capture_pose()
+        self._frame_buffer(camera).push(frame, position=position, heading=heading)
+        return frame
+    
+    def start_stream(self, camera='front', fps=10, maxsize=4):
+        """อ่านภาพจากกล้องต่อเนื่องใน background แล้วดึงไปใช้ตามจังหวะของผู้ใช้
+        
+        ภาพทุกภาพถูกเก็บใน frame buffer ของกล้องด้วย (ดู recent_frames)
+        ระหว่างที่ stream ทำงาน grab_frame() จะคืนภาพใหม่สุดจาก stream
+        
+        Args:
+            camera: 'front' หรือ 'bottom' (โดรนจริงมีกล้องเดียว - ใช้ชื่อใดก็ได้)
+            fps: จำนวนภาพต่อวินาที
+            maxsize: ขนาด queue (เต็มแล้วทิ้งภาพเก่าสุด)
+            
+        Returns:
+            FrameStream หรือ None ถ้าเริ่มไม่สำเร็จ
+        """
+        self.stop_stream(camera)
+        try:
+            if self.use_simulation:
+                if not self.camera:
+                    self._init_camera_system()
+                if not self.camera:
+                    print("❌ Camera not initialized")
+                    return None
+                stream = self.camera.start_stream(camera, fps=fps, maxsize=maxsize, pose=self._capture_pose,
+                                                  buffer=self._frame_buffer(camera))
+            elif self.use_real_drone:
+                stream = self.drone.start_stream(fps=fps, maxsize=maxsize, pose=self._capture_pose,
+                                                 buffer=self._frame_buffer(camera))
+            else:
+                print("❌ No camera interface available")
+                return None
+        except Exception as e:
+            print(f"❌ Failed to start {camera} stream: {e}")
+            return None
+        
+        self.streams[camera] = stream
+        print(f"🎥 {camera} stream started @ {fps} fps")
+        return stream
+    
+    def stop_stream(self, camera=None):
+        """หยุด stream ของกล้อง (None = ทุกกล้อง) - คืนสถิติของ stream ที่หยุด"""
+        cameras = list(self.streams) if camera is None else [camera]
+        stats = {}
+        for name in cameras:
+            stream = self.streams.pop(name, None)
+            if stream is not None:
+                stream.stop()
+                stats[name] = stream.stats()
+        return stats
+    
+    def start_camera_view(self, camera='front', max_fps=None):
+        """เปิดหน้าต่างแสดงภาพกล้อง - วาดใหม่เฉพาะเมื่อมีภาพใหม่ พร้อม overlay FPS/latency
+        
+        ในซิมจะเริ่ม stream ของกล้อง (ถ้ายังไม่มี) ที่อัตราเดียวกับการแสดงผล
+        
+        Args:
+            camera: 'front' หรือ 'bottom'
+            max_fps: อัตราวาดสูงสุด (None = GENERAL_CONFIG['display_fps'])
+        """
+        max_fps = max_fps or GENERAL_CONFIG.get('display_fps', 30)
+        if self.use_real_drone:
+            self.drone.start_camera_display(max_fps=max_fps)
+            return self.drone.viewer
+        
+        self.stop_camera_view(camera)
+        stream = self.streams.get(camera) or self.start_stream(camera, fps=max_fps)
+        if stream is None:
+            return None
+        
+        viewer = CameraViewer(self._frame_buffer(camera).wait, title=f"{camera} camera",
+                              max_fps=max_fps, alive=lambda: stream.running)
+        viewer.start()
+        self.viewers[camera] = viewer
+        return viewer
+    
+    def stop_camera_view(self, camera=None):
+        """ปิดหน้าต่างแสดงภาพ (None = ทุกกล้อง) - stream ยังทำงานต่อจนกว่าจะเรียก stop_stream"""
+        if self.use_real_drone and getattr(self, 'drone', None) is not None:
+            self.drone.stop_camera_display()
+            return
+        for name in list(self.viewers) if camera is None else [camera]:
+            viewer = self.viewers.pop(name, None)
+            if viewer is not None:
+                viewer.stop()
+    
+    def start_recording(self, camera='front', path=None, segment_seconds=60, fps=15, codec='mp4v'):
+        """บันทึกภาพกล้องเป็นวิดีโอแบ่งไฟล์ทุก segment_seconds พร้อม index (frame -> เวลา, pose)
+        
+        ในซิมใช้ stream ของกล้อง (เริ่มให้ที่ fps ถ้ายังไม่มี) ส่วนโดรนจริงใช้ video stream
+        
+        Args:
+            camera: 'front' หรือ 'bottom'
+            path: ชื่อไฟล์ฐานไม่มีนามสกุล (None = image_folder/camera_เวลา)
+            segment_seconds: ความยาวของแต่ละไฟล์ (วินาที)
+            fps: frame rate ของวิดีโอ (และของ stream ที่เริ่มให้ในซิม)
+            codec: 'mp4v' / 'avc1' (MP4) หรือ 'MJPG' (AVI)
+            
+        Returns:
+            VideoRecorder หรือ None ถ้าเริ่มไม่สำเร็จ
+        """
+        if path is None:
+            path = os.path.join(self.image_folder, f"{camera}_{time.strftime('%Y%m%d_%H%M%S')}")
+        self.stop_recording(camera)
+        
+        try:
+            if self.use_real_drone:
+                recorder = self.drone.start_recording(path, segment_seconds=segment_seconds, fps=fps,
+                                                      codec=codec, pose=self._capture_pose)
+            else:
+                stream = self.streams.get(camera) or self.start_stream(camera, fps=fps)
+                if stream is None:
+                    return None
+                recorder = VideoRecorder(path, source=self._frame_buffer(camera).wait, fps=stream.fps,
+                                         segment_seconds=segment_seconds, codec=codec)
+        except Exception as e:
+            print(f"❌ Failed to start recording {camera}: {e}")
+            return None
+        
+        self.recorders[camera] = recorder
+        print(f"🎬 Recording {camera} camera to {path}_*{recorder.extension}")
+        return recorder
+    
+    def stop_recording(self, camera=None):
+        """หยุดบันทึกวิดีโอ (None = ทุกกล้อง) - คืนสถิติของแต่ละกล้อง"""
+        stats = {}
+        for name in list(self.recorders) if camera is None else [camera]:
+            recorder = self.recorders.pop(name, None)
+            if recorder is None:
+                continue
+            if self.use_real_drone:
+                stats[name] = self.drone.stop_recording()
+            else:
+                stats[name] = recorder.stop()
+                print(f"🎬 {name} recording stopped: {stats[name]['written']} frames, "
+                      f"{len(stats[name]['segments'])} segments")
+        return stats
+    
+    def save_frame(self, frame, camera='front', filename=None):
+        """บันทึกภาพใน background - คืน Future ของ path (เรียก .result() เพื่อรอ)
+        
+        Args:
+            frame: ภาพ BGR เช่นจาก grab_frame()
+            camera: ชื่อกล้อง (ใช้เป็นคำนำหน้าชื่อไฟล์อัตโนมัติ)
+            filename: ชื่อไฟล์ใน image_folder (None = ตั้งชื่อจากกล้องและเวลา)
+        """
+        return self.image_writer.submit(frame, filename=filename, prefix=camera)
+    
+    def open_archive(self, path=None):
+        """เปิด frame archive สำหรับ archive_frame (None = image_folder/frames_เวลา)
+        
+        ภาพทั้ง session อยู่ในไฟล์ .frames ไฟล์เดียวพร้อม index แทนไฟล์ JPEG แยก
+        เปิดอ่านด้วย FrameArchiveReader หรือแปลงกลับเป็นไฟล์ด้วย frame_archive.py export
+        """
+        self.close_archive()
+        if path is None:
+            path = os.path.join(self.image_folder, f"frames_{time.strftime('%Y%m%d_%H%M%S')}")
+        self.frame_archive = FrameArchive(path)
+        print(f"🗄️ Archiving frames to {self.frame_archive.data_path}")
+        return self.frame_archive
+    
+    def archive_frame(self, frame, camera='front'):
+        """เก็บภาพลง frame archive พร้อมเวลาและตำแหน่งโดรน - คืนลำดับของภาพใน archive
+        
+        Args:
+            frame: ภาพ BGR เช่นจาก grab_frame() หรือ capture_burst()
+            camera: ชื่อกล้อง
+        """
+        if self.frame_archive is None:
+            self.open_archive()
+        position, heading = self._capture_pose()
+        return self.frame_archive.append(frame, camera=camera, position=position, heading=heading)
+    
+    def close_archive(self):
+        """ปิด frame archive"""
+        if self.frame_archive is not None:
+            self.frame_archive.close()
+            print(f"🗄️ Archived {len(self.frame_archive)} frames in {self.frame_archive.data_path}")
+            self.frame_archive = None
+    
+    def recent_frames(self, camera='bottom', max_age=None, near=None, radius=None):
+        """ภาพล่าสุดของกล้อง (BufferedFrame) เรียงจากใหม่ไปเก่า
+        
+        Args:
+            camera: 'front' หรือ 'bottom'
+            max_age: อายุสูงสุดของภาพ (วินาที)
+            near: [x, y, z] - เลือกเฉพาะภาพที่ถ่ายใกล้ตำแหน่งนี้
+            radius: ระยะห่างสูงสุดจาก near (เมตร)
+        """
+        buffer = self.frame_buffers.get(camera)
+        if buffer is None:
+            return []
+        return buffer.recent(max_age=max_age, near=near, radius=radius)
+    
+    def _frame_buffer(self, camera):
+        buffer = self.frame_buffers.get(camera)
+        if buffer is None:
+            buffer = self.frame_buffers[camera] = FrameRingBuffer(self.frame_buffer_size)
+        return buffer
+    
+    def _capture_pose(self):
+        """ตำแหน่งและทิศของโดรนตอนได้ภาพ - ค่าที่ controller ติดตามอยู่ (ไม่อ่านจาก simulator ใหม่)"""
+        heading = self.current_heading
+        if self.use_real_drone and getattr(self, 'drone', None) is not None:
+            try:
+                # yaw จาก state packet ของ Tello (ไม่ต้องส่งคำสั่ง)
+                heading = self.drone.get_yaw() % 360
+            except Exception:
+                pass
+        return list(self.current_position), heading
+
     def scan_qr_code(self, image_path=None):
         """แสกน QR Code จากไฟล์ภาพ - ต้องส่ง image_path หรือถ่ายรูปก่อน"""
         # เริ่มกล้องเฉพาะเมื่อจำเป็น
@@ -1744,8 +2715,12 @@ class NaturalDroneController:
             return None
         
         try:
+            # ในซิม: อ่านภาพจาก vision sensor ตรงๆ (ไม่ผ่านไฟล์)
+            if image_path is None and self.use_simulation:
+                image_path = self.grab_frame('front')
+            
             # ถ้าไม่มี image_path ให้ถ่ายรูปใหม่
-            if not image_path:
+            if not _has_image(image_path):
                 print("📸 No image provided, taking new picture...")
                 img_paths = self.take_picture(count=1)
                 if not img_paths:
@@ -1753,7 +2728,7 @@ class NaturalDroneController:
                     return None
                 image_path = img_paths[0]
             
-            print(f"🔍 กำลังแสกน QR Code จาก: {image_path}")
+            print(f"🔍 กำลังแสกน QR Code จาก: {_image_label(image_path)}")
             qr_results = self.qr_scanner.scan_qr_code(image_path)
             
             if qr_results:
@@ -1803,10 +2778,12 @@ class NaturalDroneController:
                 return None
             
             if self.use_simulation:
-                # ถ่ายภาพและวิเคราะห์ - แค่เมื่อเรียกใช้ฟังก์ชันนี้เท่านั้น
-                print("📸 Taking picture for mission pad detection...")
-                image_path = self.take_bottom_picture()
-                return self.mission_pad_detector.get_mission_pad_id(image_path)
+                # อ่านภาพกล้องล่างและวิเคราะห์ - แค่เมื่อเรียกใช้ฟังก์ชันนี้เท่านั้น
+                print("📸 Grabbing bottom camera frame for mission pad detection...")
+                image = self.grab_frame('bottom')
+                if image is None:
+                    image = self.take_bottom_picture()
+                return self.mission_pad_detector.get_mission_pad_id(image)
             else:
                 # ใช้ djitellopy กับโดรนจริง
                 return self.mission_pad_detector.get_mission_pad_id()
@@ -1886,7 +2863,8 @@ class NaturalDroneController:
         ตรวจจับ Mission Pad ด้วยวิธีการที่ปรับปรุงแล้ว
         
         Args:
-            image_path (str): path ของรูปภาพ (ถ้าไม่ระบุจะถ่ายรูปใหม่)
+            image_path (str | numpy.ndarray): path ของรูปภาพ หรือภาพในหน่วยความจำ
+                                              (ถ้าไม่ระบุจะอ่านภาพกล้องล่างใหม่)
             use_multiple_methods (bool): ใช้วิธีการหลากหลายหรือไม่
             
         Returns:
@@ -1906,8 +2884,12 @@ class NaturalDroneController:
             if not self.mission_pad_detector.detection_enabled:
                 self.mission_pad_detector.enable_mission_pad_detection()
             
+            # ในซิม: อ่านภาพกล้องล่างตรงๆ (ไม่ผ่านไฟล์)
+            if image_path is None and self.use_simulation:
+                image_path = self.grab_frame('bottom')
+            
             # ถ่ายรูปถ้าไม่มี image_path
-            if not image_path:
+            if not _has_image(image_path):
                 print("📸 Taking new picture for mission pad detection...")
                 image_path = self.take_bottom_picture()
                 if not image_path:
@@ -1915,11 +2897,11 @@ class NaturalDroneController:
                     return None
             
             # ตรวจสอบว่าไฟล์มีอยู่จริง
-            if not os.path.exists(image_path):
+            if isinstance(image_path, str) and not os.path.exists(image_path):
                 print(f"❌ Image file not found: {image_path}")
                 return None
             
-            print(f"🔍 Analyzing image: {image_path}")
+            print(f"🔍 Analyzing image: {_image_label(image_path)}")
             
             # ใช้วิธีการตรวจจับ
             if hasattr(self.mission_pad_detector, 'debug_image_analysis'):
@@ -1983,13 +2965,17 @@ class NaturalDroneController:
             print(f"❌ Test error: {e}")
             return None
 
-    def scan_mission_pad_enhanced(self, attempts=3, delay=1.0):
+    def scan_mission_pad_enhanced(self, attempts=3, delay=1.0, max_age=None, radius=0.1):
         """
         ตรวจจับ Mission Pad แบบ Enhanced - ลองหลายครั้ง
         
+        ใช้ภาพล่าสุดของกล้องล่างที่ถ่ายใกล้ตำแหน่งปัจจุบันก่อน แล้วจึงถ่ายใหม่เท่าที่ยังขาด
+        
         Args:
             attempts (int): จำนวนครั้งที่จะลอง
-            delay (float): ระยะเวลารอระหว่างการลอง
+            delay (float): ระยะเวลารอระหว่างการถ่ายใหม่
+            max_age (float): อายุสูงสุดของภาพเดิมที่ใช้ได้ (None = attempts * delay)
+            radius (float): ระยะห่างสูงสุดจากตำแหน่งปัจจุบันของภาพเดิม (เมตร)
             
         Returns:
             int: Mission Pad ID ที่ตรวจพบ
@@ -1999,22 +2985,37 @@ class NaturalDroneController:
             
             results = []
             
+            if max_age is None:
+                max_age = attempts * delay
+            buffered = self.recent_frames('bottom', max_age=max_age,
+                                          near=self.current_position, radius=radius)[:attempts]
+            
+            # ภาพที่ยังขาดถ่ายต่อเนื่องครั้งเดียวเข้าหน่วยความจำ ห่างกัน delay วินาที
+            images = [frame.image for frame in buffered]
+            if len(images) < attempts:
+                burst, _ = self.capture_burst(attempts - len(images), min_interval=delay, camera='bottom')
+                images.extend(burst)
+            
             for attempt in range(attempts):
                 print(f"  Attempt {attempt + 1}/{attempts}")
                 
-                # ถ่ายรูปใหม่ในแต่ละครั้ง
-                image_path = self.take_bottom_picture()
+                if attempt < len(buffered):
+                    # ภาพที่มีอยู่แล้ว - ไม่ต้องถ่ายใหม่หรือรอ
+                    print(f"    🗂️ Using buffered frame #{buffered[attempt].sequence}")
+                
+                if attempt < len(images):
+                    image = images[attempt]
+                else:
+                    # burst ได้ภาพไม่ครบ - ถ่ายแบบเดิม
+                    image = self.take_bottom_picture()
                 
-                if image_path:
-                    result = self.smart_mission_pad_scan(image_path)
+                if _has_image(image):
+                    result = self.smart_mission_pad_scan(image)
                     if result:
                         results.append(result)
                         print(f"    ✅ Found: {result}")
                     else:
                         print(f"    ❌ No result")
-                
-                if attempt < attempts - 1:
-                    time.sleep(delay)
             
             if results:
                 # หา result ที่พบบ่อยที่สุด
@@ -2100,7 +3101,17 @@ class NaturalDroneController:
             except:
                 pass
         
+        self.stop_recording()
+        self.stop_camera_view()
+        self.stop_stream()
+        
+        # รอภาพที่ค้างอยู่ให้บันทึกเสร็จ
+        if self.image_writer is not None:
+            self.image_writer.close()
+        self.close_archive()
+        
         if self.use_simulation:
+            self.stop_state_stream()
             self.stop_simulation()
         
         # เพิ่มการ cleanup สำหรับโดรนจริง
@@ -773,6 +773,7 @@ M2-0-0-0-0"""
                         # ลบ ImageBoard objects ที่เหลือ
                         if imageboard_handles:
                             sim.removeObjects(imageboard_handles)
+                            self.field_manager.sim_manager.handles.invalidate()
                             self.log_message(f"🖼️ Cleared {len(imageboard_handles)} additional ImageBoard objects")
                         else:
                             self.log_message("🖼️ No additional ImageBoard objects found")
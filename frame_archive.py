@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Frame Archive
+เก็บภาพจำนวนมากในไฟล์เดียวแบบเขียนต่อท้าย แทนไฟล์ JPEG แยกนับพันไฟล์
+
+archive หนึ่งชุดมีสองไฟล์:
+    session.frames   header 8 bytes แล้วตามด้วยภาพที่ encode แล้ว (JPEG/PNG) ต่อกัน
+    session.fidx     header 8 bytes แล้วตามด้วย record ขนาดคงที่ต่อภาพ (INDEX_DTYPE):
+                     offset, size, timestamp, camera และ pose (x, y, z, heading)
+
+ข้อมูลภาพเขียนก่อน index เสมอ - ถ้าโปรแกรมถูกปิดกลางคัน ภาพที่ index ยังไม่ครบจะถูกละไว้
+ตัวอ่าน map ไฟล์ภาพเข้าหน่วยความจำ (mmap) จึงเปิดภาพใดก็ได้ทันทีโดยไม่ต้องอ่านทั้งไฟล์
+
+Usage:
+    with FrameArchive('flights/session1') as archive:
+        archive.append(frame, camera='bottom', position=[1.0, 2.0, 1.0], heading=90)
+
+    with FrameArchiveReader('flights/session1') as reader:
+        for i in reader.select(camera='bottom'):
+            image = reader.image(i)
+
+    python frame_archive.py info flights/session1
+    python frame_archive.py export flights/session1 exported/ --camera bottom
+    python frame_archive.py pack captured_images/ flights/old_images --camera front
+"""
+
+import argparse
+import mmap
+import os
+import threading
+import time
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+try:
+    from config import GENERAL_CONFIG
+except ImportError:
+    GENERAL_CONFIG = {}
+
+DATA_MAGIC = b'FRMDATA1'
+INDEX_MAGIC = b'FRMINDX1'
+DATA_EXTENSION = '.frames'
+INDEX_EXTENSION = '.fidx'
+
+# record ของ index ต่อภาพ - timestamp เป็น time.time() เพื่อเทียบข้าม session ได้
+# pose ที่ไม่รู้เก็บเป็น NaN
+INDEX_DTYPE = np.dtype([
+    ('offset', '<u8'),
+    ('size', '<u4'),
+    ('timestamp', '<f8'),
+    ('camera', 'S8'),
+    ('x', '<f4'),
+    ('y', '<f4'),
+    ('z', '<f4'),
+    ('heading', '<f4'),
+])
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+ArchivedFrame = namedtuple('ArchivedFrame', ['image', 'timestamp', 'camera', 'position', 'heading'])
+
+def archive_paths(path):
+    """path ของไฟล์ภาพและไฟล์ index จากชื่อ archive (มีหรือไม่มี .frames ก็ได้)"""
+    base, extension = os.path.splitext(path)
+    if extension not in (DATA_EXTENSION, INDEX_EXTENSION):
+        base = path
+    return base + DATA_EXTENSION, base + INDEX_EXTENSION
+
+def is_archive(path):
+    """path นี้เป็น frame archive หรือไม่"""
+    return os.path.isfile(archive_paths(path)[0])
+
+def _image_extension(data):
+    """นามสกุลไฟล์จาก bytes แรกของภาพที่ encode แล้ว"""
+    if bytes(data[:8]) == b'\x89PNG\r\n\x1a\n':
+        return '.png'
+    if bytes(data[:4]) == b'RIFF':
+        return '.webp'
+    return '.jpg'
+
+class FrameArchive:
+    def __init__(self, path, quality=None, extension='.jpg'):
+        """
+        เปิด archive เพื่อเขียนต่อท้าย (สร้างใหม่ถ้ายังไม่มี)
+
+        Args:
+            path: ชื่อ archive เช่น 'flights/session1' (ได้ session1.frames และ session1.fidx)
+            quality: คุณภาพ JPEG 0-100 (None = GENERAL_CONFIG['photo_quality'])
+            extension: รูปแบบที่ encode ภาพ ('.jpg' หรือ '.png')
+        """
+        self.data_path, self.index_path = archive_paths(path)
+        self.quality = quality if quality is not None else GENERAL_CONFIG.get('photo_quality', 90)
+        self.extension = extension
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.data_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._data = self._open(self.data_path, DATA_MAGIC)
+        self._index = self._open(self.index_path, INDEX_MAGIC)
+
+        # ตัด record ที่เขียนไม่ครบ (โปรแกรมถูกปิดระหว่างเขียน index) และ record ที่ชี้เลยท้าย
+        # ไฟล์ภาพ (index ถึงดิสก์แต่ข้อมูลภาพไม่ถึง) - ไม่เช่นนั้นภาพใหม่จะเขียนทับ offset เดียวกัน
+        records = (self._index.tell() - len(INDEX_MAGIC)) // INDEX_DTYPE.itemsize
+        if records:
+            self._index.seek(len(INDEX_MAGIC))
+            index = np.frombuffer(self._index.read(records * INDEX_DTYPE.itemsize), INDEX_DTYPE)
+            beyond = np.flatnonzero(index['offset'] + index['size'] > self._data.tell())
+            if len(beyond):
+                records = int(beyond[0])
+        self._index.truncate(len(INDEX_MAGIC) + records * INDEX_DTYPE.itemsize)
+        self._index.seek(0, os.SEEK_END)
+        self.count = records
+        self._offset = self._data.tell()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def __len__(self):
+        return self.count
+
+    @staticmethod
+    def _open(path, magic):
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            f = open(path, 'r+b')
+            if f.read(len(magic)) != magic:
+                f.close()
+                raise ValueError(f'{path} is not a frame archive')
+            f.seek(0, os.SEEK_END)
+            return f
+        f = open(path, 'w+b')
+        f.write(magic)
+        return f
+
+    def append(self, image, camera='front', timestamp=None, position=None, heading=None):
+        """
+        encode ภาพแล้วเขียนต่อท้าย archive
+
+        Args:
+            image: ภาพ BGR
+            camera: ชื่อกล้อง (ไม่เกิน 8 bytes - ยาวกว่านี้ raise ValueError)
+            timestamp: เวลาที่ได้ภาพ (time.time(), None = ตอนนี้)
+            position: [x, y, z] ของโดรน
+            heading: ทิศของโดรน (องศา)
+
+        Returns:
+            int: ลำดับของภาพใน archive
+        """
+        params = [cv2.IMWRITE_JPEG_QUALITY, int(self.quality)] if self.extension in ('.jpg', '.jpeg') else []
+        ok, encoded = cv2.imencode(self.extension, image, params)
+        if not ok:
+            raise IOError(f'Failed to encode frame for {self.data_path}')
+        return self.append_encoded(encoded, camera, timestamp, position, heading)
+
+    def append_encoded(self, data, camera='front', timestamp=None, position=None, heading=None):
+        """เขียนภาพที่ encode แล้ว (เช่นไฟล์ JPEG เดิม) ต่อท้ายโดยไม่ encode ใหม่ - คืนลำดับของภาพ"""
+        name = camera.encode()
+        if len(name) > INDEX_DTYPE['camera'].itemsize:
+            raise ValueError(f'Camera name too long for the archive index (max 8 bytes): {camera!r}')
+        data = memoryview(data).cast('B')
+        record = np.zeros(1, INDEX_DTYPE)
+        record['size'] = data.nbytes
+        record['timestamp'] = time.time() if timestamp is None else timestamp
+        record['camera'] = name
+        record['x'], record['y'], record['z'] = position if position is not None else (np.nan,) * 3
+        record['heading'] = np.nan if heading is None else heading
+
+        with self._lock:
+            if self._data is None:
+                raise RuntimeError('FrameArchive is closed')
+            record['offset'] = self._offset
+            self._data.write(data)
+            self._offset += data.nbytes
+            self._index.write(record.tobytes())
+            index = self.count
+            self.count += 1
+        return index
+
+    def flush(self):
+        """เขียนข้อมูลที่ค้างใน buffer ลงไฟล์ (ข้อมูลภาพก่อน index)"""
+        with self._lock:
+            if self._data is not None:
+                self._data.flush()
+                self._index.flush()
+
+    def close(self):
+        """ปิด archive"""
+        with self._lock:
+            if self._data is not None:
+                self._data.close()
+                self._index.close()
+                self._data = self._index = None
+
+class FrameArchiveReader:
+    def __init__(self, path):
+        """
+        เปิด archive เพื่ออ่าน - ไฟล์ภาพถูก map เข้าหน่วยความจำ ส่วน index อ่านเป็น numpy array
+
+        Args:
+            path: ชื่อ archive (มีหรือไม่มี .frames ก็ได้)
+        """
+        self.data_path, self.index_path = archive_paths(path)
+
+        with open(self.index_path, 'rb') as f:
+            if f.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+                raise ValueError(f'{self.index_path} is not a frame archive index')
+        records = (os.path.getsize(self.index_path) - len(INDEX_MAGIC)) // INDEX_DTYPE.itemsize
+        index = np.fromfile(self.index_path, INDEX_DTYPE, count=records, offset=len(INDEX_MAGIC))
+
+        self._file = open(self.data_path, 'rb')
+        if self._file.read(len(DATA_MAGIC)) != DATA_MAGIC:
+            self._file.close()
+            raise ValueError(f'{self.data_path} is not a frame archive')
+        size = os.path.getsize(self.data_path)
+        # ภาพที่ index แล้วแต่ข้อมูลยังไม่ถึงไฟล์ (ผู้เขียนยังไม่ flush) - ละไว้
+        self.index = index[index['offset'] + index['size'] <= size]
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, i):
+        record = self.index[i]
+        position = [float(record['x']), float(record['y']), float(record['z'])]
+        heading = float(record['heading'])
+        return ArchivedFrame(
+            self.image(i), float(record['timestamp']), record['camera'].decode(),
+            None if np.isnan(position).all() else position,
+            None if np.isnan(heading) else heading
+        )
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def raw(self, i):
+        """bytes ของภาพที่ encode แล้ว (memoryview บน mmap - ไม่คัดลอก, release() ก่อน close())"""
+        record = self.index[i]
+        offset = int(record['offset'])
+        return memoryview(self._data)[offset:offset + int(record['size'])]
+
+    def image(self, i, flags=cv2.IMREAD_COLOR):
+        """decode ภาพลำดับที่ i เป็น numpy array (BGR)"""
+        record = self.index[i]
+        data = np.frombuffer(self._data, np.uint8, count=int(record['size']), offset=int(record['offset']))
+        return cv2.imdecode(data, flags)
+
+    def select(self, camera=None, start=None, end=None, near=None, radius=None):
+        """
+        ลำดับของภาพที่ตรงเงื่อนไข (กรองจาก index ทั้งชุดครั้งเดียว)
+
+        Args:
+            camera: ชื่อกล้อง
+            start, end: ช่วงเวลา (time.time())
+            near: [x, y, z] - เลือกเฉพาะภาพที่ถ่ายใกล้ตำแหน่งนี้
+            radius: ระยะห่างสูงสุดจาก near (เมตร)
+
+        Returns:
+            numpy array ของลำดับภาพ เรียงตามเวลาที่บันทึก
+        """
+        mask = np.ones(len(self.index), bool)
+        if camera is not None:
+            mask &= self.index['camera'] == camera.encode()
+        if start is not None:
+            mask &= self.index['timestamp'] >= start
+        if end is not None:
+            mask &= self.index['timestamp'] <= end
+        if near is not None and radius is not None:
+            offsets = np.stack([self.index['x'], self.index['y'], self.index['z']], axis=1) - near
+            mask &= (offsets ** 2).sum(axis=1) <= radius ** 2
+        return np.flatnonzero(mask)
+
+    def close(self):
+        """ปิดไฟล์"""
+        if self._data is not None:
+            self._data.close()
+            self._file.close()
+            self._data = None
+
+def export_frames(path, folder, camera=None, start=None, end=None):
+    """
+    เขียนภาพใน archive กลับเป็นไฟล์แยก (คัดลอก bytes เดิม ไม่ encode ใหม่)
+
+    Returns:
+        list: path ของไฟล์ที่เขียน
+    """
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    with FrameArchiveReader(path) as reader:
+        for i in reader.select(camera=camera, start=start, end=end):
+            record = reader.index[i]
+            stamp = time.strftime('%Y%m%d_%H%M%S', time.localtime(record['timestamp']))
+            with reader.raw(i) as data:
+                filename = f"{record['camera'].decode()}_{stamp}_{i:06d}{_image_extension(data)}"
+                file_path = os.path.join(folder, filename)
+                with open(file_path, 'wb') as f:
+                    f.write(data)
+            paths.append(file_path)
+    return paths
+
+def pack_folder(folder, path, camera='front'):
+    """
+    คัดลอกภาพไฟล์แยกในโฟลเดอร์เข้า archive (ไม่ encode ใหม่, เวลาจาก mtime ของไฟล์)
+    ไฟล์เดิมยังอยู่ - ลบเองเมื่อตรวจ archive แล้ว
+
+    Returns:
+        int: จำนวนภาพที่เพิ่ม
+    """
+    files = [entry for entry in os.scandir(folder)
+             if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS)]
+    files.sort(key=lambda entry: entry.stat().st_mtime)
+    with FrameArchive(path) as archive:
+        for entry in files:
+            with open(entry.path, 'rb') as f:
+                archive.append_encoded(f.read(), camera=camera, timestamp=entry.stat().st_mtime)
+    return len(files)
+
+def summarize(path):
+    """
+    สรุป archive: จำนวนภาพ, ช่วงเวลา และขนาดแยกตามกล้อง
+
+    Returns:
+        dict
+    """
+    with FrameArchiveReader(path) as reader:
+        index = reader.index
+        cameras = {}
+        for name in np.unique(index['camera']):
+            selected = index[index['camera'] == name]
+            cameras[name.decode()] = {'frames': len(selected), 'bytes': int(selected['size'].sum())}
+        return {
+            'frames': len(index),
+            'bytes': int(index['size'].sum()),
+            'start': float(index['timestamp'].min()) if len(index) else None,
+            'end': float(index['timestamp'].max()) if len(index) else None,
+            'cameras': cameras,
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description='Tools for single-file frame archives')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    info = commands.add_parser('info', help='summarize an archive')
+    info.add_argument('archive')
+
+    export = commands.add_parser('export', help='write archived frames back to image files')
+    export.add_argument('archive')
+    export.add_argument('folder')
+    export.add_argument('--camera', default=None)
+
+    pack = commands.add_parser('pack', help='copy a folder of image files into an archive')
+    pack.add_argument('folder')
+    pack.add_argument('archive')
+    pack.add_argument('--camera', default='front')
+    args = parser.parse_args()
+
+    if args.command == 'info':
+        summary = summarize(args.archive)
+        print(f"🗄️ {args.archive}: {summary['frames']} frames, {summary['bytes'] / 1e6:.1f} MB")
+        if summary['frames']:
+            print(f"  {time.ctime(summary['start'])} - {time.ctime(summary['end'])}")
+        for name, entry in summary['cameras'].items():
+            print(f"  {name:10s} {entry['frames']:8d} frames {entry['bytes'] / 1e6:10.1f} MB")
+    elif args.command == 'export':
+        paths = export_frames(args.archive, args.folder, camera=args.camera)
+        print(f"📤 Exported {len(paths)} frames to {args.folder}")
+    else:
+        count = pack_folder(args.folder, args.archive, camera=args.camera)
+        print(f"📦 Packed {count} images into {archive_paths(args.archive)[0]}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Frame Ring Buffer
+เก็บภาพล่าสุด N ภาพของกล้องหนึ่งตัวใน numpy array ที่จองไว้ล่วงหน้า
+แต่ละภาพมีเวลา (time.monotonic), ลำดับ (sequence) และตำแหน่ง/ทิศของโดรนตอนได้ภาพ
+
+ใช้เลือกภาพที่ดีที่สุดจากภาพล่าสุดแทนการถ่ายใหม่แล้วรอ
+FrameStream อ่านภาพต่อเนื่องใน background เข้า queue ขนาดจำกัด (ทิ้งภาพเก่าสุดเมื่อเต็ม)
+
+Usage:
+    buffer = FrameRingBuffer(capacity=8)
+    buffer.push(frame, position=[x, y, z], heading=90.0)
+
+    latest = buffer.latest()
+    newer = buffer.wait(after=latest.sequence, timeout=1.0)
+    frames = buffer.recent(max_age=2.0, near=[x, y, z], radius=0.1)
+    sharpest = buffer.best(lambda f: cv2.Laplacian(f.image, cv2.CV_64F).var())
+
+    stream = FrameStream(camera_read_function, fps=10, buffer=buffer)
+    frame = stream.get_latest(timeout=1.0)
+    stream.stop()
+"""
+
+import queue
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+BufferedFrame = namedtuple('BufferedFrame', ['image', 'sequence', 'timestamp', 'position', 'heading'])
+
+class FrameRingBuffer:
+    def __init__(self, capacity=8, shape=None, dtype=np.uint8):
+        """
+        Ring buffer ขนาดคงที่สำหรับภาพจากกล้องหนึ่งตัว
+
+        Args:
+            capacity: จำนวนภาพที่เก็บ (ภาพเก่าสุดถูกเขียนทับ)
+            shape: ขนาดภาพ เช่น (240, 320, 3) - ไม่ระบุจะจองตามภาพแรกที่ push
+            dtype: ชนิดข้อมูลของภาพ
+        """
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        self.capacity = capacity
+        self.dtype = np.dtype(dtype)
+        self.frames = None
+        self.timestamps = np.zeros(capacity)
+        self.sequences = np.full(capacity, -1, dtype=np.int64)
+        self.positions = np.full((capacity, 3), np.nan)
+        self.headings = np.full(capacity, np.nan)
+        self.next_sequence = 0
+        self._first_sequence = 0
+        # Condition ใช้เป็น lock และปลุกผู้ที่รอภาพใหม่ (wait)
+        self._lock = threading.Condition()
+        if shape is not None:
+            self._allocate(tuple(shape))
+
+    def __len__(self):
+        return min(self.next_sequence - self._first_sequence, self.capacity)
+
+    @property
+    def shape(self):
+        """ขนาดของภาพแต่ละภาพ (None ถ้ายังไม่เคย push)"""
+        return None if self.frames is None else self.frames.shape[1:]
+
+    def push(self, frame, position=None, heading=None, timestamp=None):
+        """
+        คัดลอกภาพเข้า buffer
+
+        Args:
+            frame: numpy array ขนาดเท่ากับภาพก่อนหน้า
+            position: [x, y, z] ของโดรนตอนได้ภาพ (None = ไม่ทราบ)
+            heading: ทิศของโดรน (องศา) ตอนได้ภาพ (None = ไม่ทราบ)
+            timestamp: เวลาจาก time.monotonic() (None = ตอนนี้)
+
+        Returns:
+            int: sequence ของภาพ
+        """
+        frame = np.asarray(frame)
+        with self._lock:
+            if self.frames is None:
+                self._allocate(frame.shape)
+            elif frame.shape != self.frames.shape[1:]:
+                raise ValueError(f'Frame shape {frame.shape} does not match buffer shape '
+                                 f'{self.frames.shape[1:]}')
+
+            sequence = self.next_sequence
+            slot = sequence % self.capacity
+            np.copyto(self.frames[slot], frame)
+            self.timestamps[slot] = time.monotonic() if timestamp is None else timestamp
+            self.positions[slot] = np.nan if position is None else position
+            self.headings[slot] = np.nan if heading is None else heading
+            self.sequences[slot] = sequence
+            self.next_sequence += 1
+            self._lock.notify_all()
+        return sequence
+
+    def latest(self, copy=True):
+        """ภาพล่าสุด (BufferedFrame) หรือ None ถ้า buffer ว่าง"""
+        with self._lock:
+            if len(self) == 0:
+                return None
+            return self._record((self.next_sequence - 1) % self.capacity, copy)
+
+    def wait(self, after=None, timeout=None, copy=True):
+        """
+        รอภาพล่าสุดที่ sequence มากกว่า after
+
+        Args:
+            after: sequence ของภาพที่เคยได้แล้ว (None = ภาพใดก็ได้)
+            timeout: เวลารอสูงสุด (วินาที, None = รอจนกว่าจะได้)
+
+        Returns:
+            BufferedFrame หรือ None เมื่อหมดเวลา
+        """
+        def ready():
+            return len(self) > 0 and (after is None or self.next_sequence - 1 > after)
+
+        with self._lock:
+            if not self._lock.wait_for(ready, timeout):
+                return None
+            return self._record((self.next_sequence - 1) % self.capacity, copy)
+
+    def get(self, sequence, copy=True):
+        """ภาพตาม sequence หรือ None ถ้าถูกเขียนทับไปแล้ว"""
+        with self._lock:
+            slot = sequence % self.capacity
+            if sequence < self._first_sequence or self.sequences[slot] != sequence:
+                return None
+            return self._record(slot, copy)
+
+    def recent(self, max_age=None, near=None, radius=None, copy=True):
+        """
+        ภาพใน buffer เรียงจากใหม่ไปเก่า
+
+        Args:
+            max_age: อายุสูงสุดของภาพ (วินาที)
+            near: [x, y, z] - เลือกเฉพาะภาพที่ถ่ายใกล้ตำแหน่งนี้
+            radius: ระยะห่างสูงสุดจาก near (เมตร)
+            copy: คัดลอกภาพ (False = view ที่อาจถูกเขียนทับเมื่อ push ครั้งถัดไป)
+
+        Returns:
+            list ของ BufferedFrame
+        """
+        now = time.monotonic()
+        records = []
+        with self._lock:
+            for sequence in range(self.next_sequence - 1, self.next_sequence - 1 - len(self), -1):
+                slot = sequence % self.capacity
+                if max_age is not None and now - self.timestamps[slot] > max_age:
+                    break
+                if near is not None and radius is not None:
+                    # ภาพที่ไม่ทราบตำแหน่ง (nan) ไม่ผ่านเงื่อนไขนี้
+                    if not np.linalg.norm(self.positions[slot] - np.asarray(near)) <= radius:
+                        continue
+                records.append(self._record(slot, copy))
+        return records
+
+    def best(self, score, **filters):
+        """
+        ภาพที่ score สูงสุดจาก recent(**filters)
+
+        Args:
+            score: ฟังก์ชันรับ BufferedFrame คืนตัวเลข (มากกว่า = ดีกว่า)
+
+        Returns:
+            BufferedFrame หรือ None ถ้าไม่มีภาพที่ผ่านเงื่อนไข
+        """
+        candidates = self.recent(**filters)
+        if not candidates:
+            return None
+        return max(candidates, key=score)
+
+    def clear(self):
+        """ลบภาพทั้งหมด (sequence นับต่อจากเดิม)"""
+        with self._lock:
+            self.sequences[:] = -1
+            self._first_sequence = self.next_sequence
+
+    def _allocate(self, shape):
+        self.frames = np.empty((self.capacity,) + tuple(shape), dtype=self.dtype)
+
+    def _record(self, slot, copy):
+        image = self.frames[slot]
+        return BufferedFrame(
+            image.copy() if copy else image,
+            int(self.sequences[slot]),
+            float(self.timestamps[slot]),
+            tuple(float(v) for v in self.positions[slot]),
+            float(self.headings[slot])
+        )
+
+class FrameStream:
+    def __init__(self, source, fps=10, maxsize=4, pose=None, buffer=None, name='camera', verbose=False):
+        """
+        อ่านภาพต่อเนื่องใน worker thread เข้า queue ขนาดจำกัด (เต็มแล้วทิ้งภาพเก่าสุด)
+
+        ผู้ใช้ดึงภาพด้วย get()/get_latest() ตามจังหวะของตัวเอง
+        thread ที่สั่งบินไม่ต้องรอการถ่ายภาพเลย
+
+        Args:
+            source: ฟังก์ชันคืนภาพ (numpy array) หรือ None ถ้ายังไม่มีภาพใหม่ - เรียกจาก worker thread
+            fps: จำนวนภาพต่อวินาทีที่พยายามอ่าน
+            maxsize: ขนาด queue
+            pose: ฟังก์ชันคืน (position, heading) ของโดรนตอนได้ภาพ (None = ไม่ติดแท็ก)
+            buffer: FrameRingBuffer ที่จะเก็บทุกภาพไว้ด้วย (None = ไม่เก็บ)
+            name: ชื่อ stream สำหรับ log
+            verbose: แสดงข้อความ debug หรือไม่
+        """
+        if fps <= 0:
+            raise ValueError('fps must be positive')
+
+        self.source = source
+        self.fps = fps
+        self.pose = pose
+        self.buffer = buffer
+        self.name = name
+        self.verbose = verbose
+        self.frames = queue.Queue(maxsize)
+
+        # สถิติ
+        self.produced = 0
+        self.consumed = 0
+        self.dropped = 0
+        self.skipped = 0
+        self.overruns = 0
+        self.errors = 0
+        self._next_sequence = 0
+        self._started_at = time.monotonic()
+
+        self._running = threading.Event()
+        self._running.set()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        return False
+
+    def get(self, timeout=None):
+        """ภาพถัดไปใน queue (BufferedFrame) หรือ None เมื่อหมดเวลา"""
+        try:
+            frame = self.frames.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        self.consumed += 1
+        return frame
+
+    def get_latest(self, timeout=None):
+        """
+        ภาพใหม่สุดใน queue - ภาพที่เก่ากว่าถูกข้าม (นับใน skipped)
+
+        ถ้า queue ว่างจะรอภาพถัดไปไม่เกิน timeout
+        """
+        frame = self.get(timeout=timeout)
+        if frame is None:
+            return None
+        while True:
+            try:
+                newer = self.frames.get_nowait()
+            except queue.Empty:
+                return frame
+            self.skipped += 1
+            frame = newer
+
+    def stop(self):
+        """หยุด worker thread"""
+        self._running.clear()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._running.is_set()
+
+    def stats(self):
+        """สถิติของ stream: ภาพที่ผลิต / ถูกดึงไปใช้ / ถูกทิ้งเพราะ queue เต็ม / ถูกข้าม"""
+        elapsed = time.monotonic() - self._started_at
+        return {
+            'name': self.name,
+            'fps': self.fps,
+            'achieved_fps': self.produced / elapsed if elapsed > 0 else 0.0,
+            'produced': self.produced,
+            'consumed': self.consumed,
+            'dropped': self.dropped,
+            'skipped': self.skipped,
+            'queued': self.frames.qsize(),
+            'overruns': self.overruns,
+            'errors': self.errors,
+        }
+
+    def _run(self):
+        period = 1.0 / self.fps
+        deadline = time.monotonic()
+        while self._running.is_set():
+            try:
+                image = self.source()
+            except Exception as e:
+                image = None
+                self.errors += 1
+                if self.verbose:
+                    print(f"⚠️ {self.name} stream capture failed: {e}")
+            if image is not None:
+                self._publish(image)
+
+            deadline += period
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # ช้ากว่ากำหนด - ข้ามรอบที่พลาดไปแทนการรัวถ่ายเพื่อไล่ตาม
+                self.overruns += 1
+                deadline = time.monotonic()
+
+    def _publish(self, image):
+        timestamp = time.monotonic()
+        position, heading = self.pose() if self.pose is not None else (None, None)
+        if self.buffer is not None:
+            sequence = self.buffer.push(image, position=position, heading=heading, timestamp=timestamp)
+        else:
+            sequence = self._next_sequence
+            self._next_sequence += 1
+        frame = BufferedFrame(
+            image, sequence, timestamp,
+            None if position is None else tuple(position),
+            float('nan') if heading is None else heading
+        )
+
+        while True:
+            try:
+                self.frames.put_nowait(frame)
+                break
+            except queue.Full:
+                # ทิ้งภาพเก่าสุด - ผู้ใช้สนใจภาพล่าสุดมากกว่า
+                try:
+                    self.frames.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+        self.produced += 1
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Image Writer
+บันทึกภาพลงไฟล์ใน thread pool แยก - ผู้เรียกไม่ต้องรอการ encode และเขียนดิสก์
+
+submit() คืน concurrent.futures.Future ที่ให้ path ของไฟล์เมื่อเขียนเสร็จ
+queue มีขนาดจำกัด ถ้าเต็ม submit() จะรอ (หรือ raise queue.Full เมื่อ block=False)
+
+Usage:
+    writer = ImageWriter('captured_images')
+    future = writer.submit(frame, prefix='front')
+    ...
+    path = future.result()
+    writer.close()
+"""
+
+import itertools
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, wait
+
+import cv2
+import numpy as np
+
+try:
+    from config import GENERAL_CONFIG
+except ImportError:
+    GENERAL_CONFIG = {}
+
+class ImageWriter:
+    def __init__(self, folder='captured_images', workers=None, maxsize=None, quality=None, verbose=False):
+        """
+        Args:
+            folder: โฟลเดอร์ปลายทางของชื่อไฟล์แบบ relative (สร้างให้ถ้ายังไม่มี)
+            workers: จำนวน thread ที่ encode/เขียนไฟล์ (None = GENERAL_CONFIG['writer_threads'])
+            maxsize: ขนาด queue (None = GENERAL_CONFIG['writer_queue_size'])
+            quality: คุณภาพ JPEG/WebP 0-100 (None = GENERAL_CONFIG['photo_quality'])
+            verbose: แสดงข้อความ debug หรือไม่
+        """
+        self.folder = folder
+        self.quality = quality if quality is not None else GENERAL_CONFIG.get('photo_quality', 90)
+        self.verbose = verbose
+        os.makedirs(folder, exist_ok=True)
+
+        workers = workers or GENERAL_CONFIG.get('writer_threads', 2)
+        maxsize = maxsize or GENERAL_CONFIG.get('writer_queue_size', 16)
+        self._queue = queue.Queue(maxsize)
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._names = itertools.count(1)
+        self._closed = False
+
+        # สถิติ
+        self.submitted = 0
+        self.written = 0
+        self.failed = 0
+        self.bytes_written = 0
+
+        self._threads = [threading.Thread(target=self._run, daemon=True) for _ in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def submit(self, frame, filename=None, prefix='image', copy=True, block=True, timeout=None):
+        """
+        ส่งภาพเข้าคิวเพื่อบันทึก
+
+        Args:
+            frame: numpy array (BGR แบบ OpenCV)
+            filename: ชื่อไฟล์หรือ path (None = ตั้งชื่อจาก prefix และเวลา) - นามสกุลกำหนดชนิดไฟล์
+            prefix: คำนำหน้าชื่อไฟล์อัตโนมัติ
+            copy: คัดลอกภาพก่อนเข้าคิว (False ถ้าผู้เรียกจะไม่แก้ไข array นี้อีก)
+            block: รอเมื่อคิวเต็ม (False = raise queue.Full ทันที)
+            timeout: เวลารอสูงสุดเมื่อคิวเต็ม (วินาที)
+
+        Returns:
+            Future ที่ให้ path ของไฟล์ (หรือ raise IOError ถ้าเขียนไม่สำเร็จ)
+        """
+        if self._closed:
+            raise RuntimeError('ImageWriter is closed')
+        if filename is None:
+            filename = f"{prefix}_{time.strftime('%Y%m%d_%H%M%S')}_{next(self._names):04d}.jpg"
+        path = filename if os.path.isabs(filename) else os.path.join(self.folder, filename)
+        image = np.array(frame, copy=True) if copy else frame
+
+        future = Future()
+        self._queue.put((image, path, future), block=block, timeout=timeout)
+        with self._lock:
+            self.submitted += 1
+            self._pending.add(future)
+        future.add_done_callback(self._done)
+        return future
+
+    def write(self, frame, filename=None, prefix='image'):
+        """บันทึกภาพแล้วรอจนเสร็จ - คืน path"""
+        return self.submit(frame, filename=filename, prefix=prefix, copy=False).result()
+
+    def flush(self, timeout=None):
+        """รอให้ภาพที่ส่งเข้าคิวแล้วทั้งหมดเขียนเสร็จ - คืน True ถ้าเสร็จทันเวลา"""
+        with self._lock:
+            pending = list(self._pending)
+        return not wait(pending, timeout=timeout).not_done
+
+    def close(self, wait=True):
+        """หยุดรับภาพใหม่ แล้ว (ถ้า wait) รอภาพที่ค้างอยู่ให้เขียนเสร็จ"""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._threads:
+            self._queue.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def stats(self):
+        """สถิติ: ภาพที่ส่งเข้าคิว / เขียนสำเร็จ / ล้มเหลว / ค้างในคิว และจำนวน bytes ที่เขียน"""
+        with self._lock:
+            return {
+                'submitted': self.submitted,
+                'written': self.written,
+                'failed': self.failed,
+                'pending': len(self._pending),
+                'queued': self._queue.qsize(),
+                'bytes_written': self.bytes_written,
+            }
+
+    def _done(self, future):
+        with self._lock:
+            self._pending.discard(future)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            image, path, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                size = self._save(image, path)
+            except Exception as e:
+                with self._lock:
+                    self.failed += 1
+                if self.verbose:
+                    print(f"❌ บันทึกภาพไม่สำเร็จ: {path} ({e})")
+                future.set_exception(e)
+            else:
+                with self._lock:
+                    self.written += 1
+                    self.bytes_written += size
+                future.set_result(path)
+
+    def _save(self, image, path):
+        """encode แล้วเขียนผ่านไฟล์ชั่วคราว - ไม่มีใครเห็นไฟล์ที่เขียนไม่ครบ"""
+        extension = os.path.splitext(path)[1].lower() or '.jpg'
+        ok, encoded = cv2.imencode(extension, image, self._params(extension))
+        if not ok:
+            raise IOError(f'Failed to encode {path}')
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f'{path}.{threading.get_ident()}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(encoded)
+        os.replace(temp_path, path)
+        return len(encoded)
+
+    def _params(self, extension):
+        if extension in ('.jpg', '.jpeg'):
+            return [cv2.IMWRITE_JPEG_QUALITY, int(self.quality)]
+        if extension == '.webp':
+            return [cv2.IMWRITE_WEBP_QUALITY, int(self.quality)]
+        return []
@@ -10,6 +10,8 @@ import os
 import json
 from datetime import datetime
 
+from frame_archive import FrameArchiveReader, is_archive
+
 class ImprovedMissionPadDetector:
     def __init__(self, template_folder='mission_pad_templates'):
         """
@@ -96,7 +98,7 @@ class ImprovedMissionPadDetector:
         ตรวจจับ Mission Pad ID จากรูปภาพ - ใช้วิธีการหลากหลาย
         
         Args:
-            image_path (str): path ของรูปภาพที่ต้องการตรวจจับ
+            image_path (str | numpy.ndarray): path ของรูปภาพ หรือภาพ BGR ที่อยู่ในหน่วยความจำแล้ว
             
         Returns:
             int: Mission Pad ID ที่ตรวจพบ หรือ None ถ้าไม่พบ
@@ -109,20 +111,21 @@ class ImprovedMissionPadDetector:
             print("❌ No templates loaded")
             return None
         
-        if not image_path or not os.path.exists(image_path):
+        in_memory = isinstance(image_path, np.ndarray)
+        if not in_memory and (not image_path or not os.path.exists(image_path)):
             print("❌ No valid image path provided")
             return None
         
         try:
-            # อ่านรูปภาพที่ต้องการตรวจสอบ
-            query_img = cv2.imread(image_path)
+            # อ่านรูปภาพที่ต้องการตรวจสอบ (ภาพในหน่วยความจำใช้ได้ทันที)
+            query_img = image_path if in_memory else cv2.imread(image_path)
             if query_img is None:
                 print(f"❌ Cannot load image: {image_path}")
                 return None
             
             query_gray = cv2.cvtColor(query_img, cv2.COLOR_BGR2GRAY)
             
-            print(f"🔍 Analyzing image: {image_path}")
+            print(f"🔍 Analyzing image: {'<frame>' if in_memory else image_path}")
             print(f"📏 Image size: {query_img.shape}")
             
             # ใช้วิธีการหลากหลายในการตรวจจับ
@@ -360,9 +363,11 @@ class ImprovedMissionPadDetector:
     
     def test_detection(self, test_image_path):
         """ทดสอบการตรวจจับด้วยรูปภาพทดสอบ"""
-        print(f"🧪 Testing improved mission pad detection with: {test_image_path}")
+        in_memory = isinstance(test_image_path, np.ndarray)
+        label = f"<frame {test_image_path.shape[1]}x{test_image_path.shape[0]}>" if in_memory else test_image_path
+        print(f"🧪 Testing improved mission pad detection with: {label}")
         
-        if not os.path.exists(test_image_path):
+        if not in_memory and not os.path.exists(test_image_path):
             print("❌ Test image not found")
             return None
         
@@ -380,15 +385,16 @@ class ImprovedMissionPadDetector:
     
     def debug_image_analysis(self, image_path):
         """วิเคราะห์รูปภาพแบบละเอียดเพื่อ debug"""
-        if not os.path.exists(image_path):
+        in_memory = isinstance(image_path, np.ndarray)
+        if not in_memory and not os.path.exists(image_path):
             print("❌ Image not found")
             return
         
         try:
-            img = cv2.imread(image_path)
+            img = image_path if in_memory else cv2.imread(image_path)
             gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
             
-            print(f"📊 Image Analysis for: {image_path}")
+            print(f"📊 Image Analysis for: {'<frame>' if in_memory else image_path}")
             print(f"📏 Size: {img.shape}")
             print(f"🔢 Pixel range: {gray.min()} - {gray.max()}")
             print(f"📈 Mean brightness: {gray.mean():.2f}")
@@ -412,7 +418,10 @@ class ImprovedMissionPadDetector:
             print(f"❌ Debug analysis error: {e}")
     
     def create_test_report(self, test_images_folder):
-        """สร้างรายงานการทดสอบ"""
+        """สร้างรายงานการทดสอบ จากโฟลเดอร์ภาพหรือ frame archive (.frames)"""
+        if is_archive(test_images_folder):
+            return self._create_archive_report(test_images_folder)
+        
         if not os.path.exists(test_images_folder):
             print("❌ Test images folder not found")
             return
@@ -438,6 +447,33 @@ class ImprovedMissionPadDetector:
                     'success': result is not None
                 })
         
+        return self._save_test_report(report)
+    
+    def _create_archive_report(self, archive_path):
+        """สร้างรายงานจากภาพทุกภาพใน frame archive (อ่านจาก index ไม่ต้องไล่ไฟล์ในโฟลเดอร์)"""
+        report = {
+            'timestamp': datetime.now().isoformat(),
+            'templates_loaded': len(self.templates),
+            'confidence_threshold': self.confidence_threshold,
+            'test_results': []
+        }
+        
+        with FrameArchiveReader(archive_path) as reader:
+            for i in range(len(reader)):
+                record = reader.index[i]
+                print(f"🧪 Testing: frame {i} ({record['camera'].decode()})")
+                result = self.test_detection(reader.image(i))
+                
+                report['test_results'].append({
+                    'image': f"{os.path.basename(archive_path)}#{i}",
+                    'camera': record['camera'].decode(),
+                    'detected_id': result,
+                    'success': result is not None
+                })
+        
+        return self._save_test_report(report)
+    
+    def _save_test_report(self, report):
         # บันทึกรายงาน
         report_path = 'mission_pad_test_report.json'
         with open(report_path, 'w') as f:
@@ -116,7 +116,7 @@ class MissionPadDetector:
         ตรวจจับ Mission Pad จากรูปภาพ
         
         Args:
-            image_path (str): path ของรูปภาพที่ต้องการตรวจจับ
+            image_path (str | numpy.ndarray): path ของรูปภาพ หรือภาพ BGR ที่อยู่ในหน่วยความจำแล้ว
             
         Returns:
             dict: ข้อมูลการตรวจจับ หรือ None ถ้าไม่พบ
@@ -125,13 +125,14 @@ class MissionPadDetector:
             print("❌ No templates loaded")
             return None
         
-        if not os.path.exists(image_path):
+        in_memory = isinstance(image_path, np.ndarray)
+        if not in_memory and not os.path.exists(image_path):
             print(f"❌ Image not found: {image_path}")
             return None
         
         try:
-            # อ่านรูปภาพ
-            image = cv2.imread(image_path)
+            # อ่านรูปภาพ (ภาพในหน่วยความจำใช้ได้ทันที)
+            image = image_path if in_memory else cv2.imread(image_path)
             if image is None:
                 print(f"❌ Cannot read image: {image_path}")
                 return None
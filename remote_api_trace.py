@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Remote API Trace
+บันทึกและเล่นซ้ำการสื่อสาร ZMQ Remote API กับ CoppeliaSim
+
+ไฟล์ trace เป็น binary: header 8 bytes แล้วตามด้วย record ต่อกัน แต่ละ record คือ
+(start, duration, len(request), len(reply)) ตามด้วย request และ reply แบบ CBOR ดิบ
+ตามที่ส่ง/รับจริง จึงเล่นซ้ำได้โดยไม่ต้อง encode ใหม่
+
+Usage:
+    # บันทึก
+    client = RemoteAPIClient()
+    client.start_recording('field.rat')
+    ...  # สร้างสนาม / บินภารกิจตามปกติ
+    client.stop_recording()
+
+    # เล่นซ้ำโดยไม่ต้องมี simulator
+    python remote_api_trace.py replay field.rat --port 23000
+    python remote_api_trace.py info field.rat
+"""
+
+import argparse
+import struct
+import threading
+import time
+from collections import namedtuple
+
+import zmq
+import cbor2 as cbor
+
+TRACE_MAGIC = b'RAPITRC1'
+
+# start (วินาทีนับจากเริ่มบันทึก), duration (วินาที), ความยาว request, ความยาว reply
+_RECORD_HEADER = struct.Struct('<ddII')
+
+TraceRecord = namedtuple('TraceRecord', ['start', 'duration', 'request', 'reply'])
+
+class TraceWriter:
+    def __init__(self, path):
+        """
+        เขียน request/reply ของทุกคำสั่งลงไฟล์ trace
+
+        Args:
+            path: ไฟล์ปลายทาง (เขียนทับถ้ามีอยู่แล้ว)
+        """
+        self.path = path
+        self.records = 0
+        self._file = open(path, 'wb')
+        self._file.write(TRACE_MAGIC)
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def write(self, request, reply, start, duration):
+        """
+        บันทึกหนึ่ง round trip
+
+        Args:
+            request: bytes ที่ส่งไป
+            reply: bytes ที่ได้รับกลับ
+            start: เวลาเริ่มส่ง (time.perf_counter())
+            duration: เวลารอคำตอบ (วินาที)
+        """
+        header = _RECORD_HEADER.pack(start - self._origin, duration, len(request), len(reply))
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(header)
+            self._file.write(request)
+            self._file.write(reply)
+            self.records += 1
+
+    def close(self):
+        """ปิดไฟล์ trace"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+def read_trace(path):
+    """
+    อ่านไฟล์ trace ทีละ record
+
+    Yields:
+        TraceRecord(start, duration, request, reply)
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(TRACE_MAGIC)) != TRACE_MAGIC:
+            raise ValueError(f'{path} is not a remote API trace')
+        while True:
+            header = f.read(_RECORD_HEADER.size)
+            if len(header) < _RECORD_HEADER.size:
+                return
+            start, duration, request_len, reply_len = _RECORD_HEADER.unpack(header)
+            request = f.read(request_len)
+            reply = f.read(reply_len)
+            if len(reply) < reply_len:
+                # ไฟล์ถูกตัดกลาง record (เช่นโปรแกรมถูกปิดระหว่างบันทึก)
+                return
+            yield TraceRecord(start, duration, request, reply)
+
+def request_key(request):
+    """
+    ส่วนของ request ที่ใช้เทียบตอนเล่นซ้ำ - ไม่รวม id ที่เปลี่ยนทุกครั้ง
+
+    Args:
+        request: request ที่ decode แล้ว หรือ bytes ดิบ
+    """
+    if isinstance(request, (bytes, bytearray)):
+        request = cbor.loads(request)
+    if 'batch' in request:
+        return cbor.dumps(request['batch'])
+    return cbor.dumps([request.get('func'), request.get('args', [])])
+
+def summarize(path):
+    """
+    สรุป trace: จำนวนคำสั่ง, เวลารวมที่รอ simulator และ bytes แยกตามฟังก์ชัน
+
+    Returns:
+        dict
+    """
+    functions = {}
+    records = 0
+    wait_total = 0.0
+    bytes_sent = 0
+    bytes_received = 0
+    end = 0.0
+    for record in read_trace(path):
+        request = cbor.loads(record.request)
+        name = '<batch>' if 'batch' in request else request.get('func')
+        entry = functions.setdefault(name, {'calls': 0, 'total_time': 0.0})
+        entry['calls'] += 1
+        entry['total_time'] += record.duration
+        records += 1
+        wait_total += record.duration
+        bytes_sent += len(record.request)
+        bytes_received += len(record.reply)
+        end = record.start + record.duration
+    return {
+        'records': records,
+        'elapsed': end,
+        'wait_total': wait_total,
+        'bytes_sent': bytes_sent,
+        'bytes_received': bytes_received,
+        'functions': dict(sorted(functions.items(), key=lambda item: -item[1]['total_time'])),
+    }
+
+class TraceReplayServer:
+    def __init__(self, path, endpoint='tcp://*:23000', realtime=False, strict=True,
+                 loop=False, context=None, verbose=False):
+        """
+        เซิร์ฟเวอร์ REP ที่ตอบด้วย reply จาก trace ตามลำดับที่บันทึกไว้
+
+        Args:
+            path: ไฟล์ trace
+            endpoint: ZMQ endpoint ที่จะ bind
+            realtime: หน่วงตาม duration ที่บันทึกไว้ (False = ตอบทันที เพื่อวัดเฉพาะฝั่ง client)
+            strict: ตอบ error เมื่อ request ไม่ตรงกับที่บันทึกไว้ (False = ตอบ reply ถัดไปเสมอ)
+            loop: เริ่ม trace ใหม่เมื่อเล่นครบ (สำหรับ benchmark หลายรอบ)
+            context: zmq.Context ที่ใช้ร่วม (จำเป็นสำหรับ inproc://)
+            verbose: แสดงข้อความ debug หรือไม่
+        """
+        self.path = path
+        self.endpoint = endpoint
+        self.realtime = realtime
+        self.strict = strict
+        self.loop = loop
+        self.verbose = verbose
+        self.records = list(read_trace(path))
+        self._keys = [request_key(record.request) for record in self.records]
+
+        self._own_context = context is None
+        self.context = context or zmq.Context()
+        self._thread = None
+        self._running = threading.Event()
+        self._ready = threading.Event()
+        self._bind_error = None
+
+        # ตำแหน่งถัดไปใน trace และสถิติ
+        self.position = 0
+        self.served = 0
+        self.mismatches = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        return False
+
+    def start(self):
+        """เริ่มเซิร์ฟเวอร์ใน background thread"""
+        self._running.set()
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._bind_error is not None:
+            raise self._bind_error
+        if self.verbose:
+            print(f"🎞️ Replaying {len(self.records)} calls on {self.endpoint}")
+
+    def stop(self):
+        """หยุดเซิร์ฟเวอร์"""
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._own_context:
+            self.context.term()
+
+    def rewind(self):
+        """กลับไปเริ่มต้น trace"""
+        self.position = 0
+
+    @property
+    def finished(self):
+        """เล่นครบทุก record แล้วหรือยัง"""
+        return self.position >= len(self.records)
+
+    def serve_forever(self):
+        """รับ request และตอบจาก trace จนกว่าจะถูกสั่งหยุด"""
+        self._running.set()
+        socket = self.context.socket(zmq.REP)
+        try:
+            socket.bind(self.endpoint)
+        except zmq.ZMQError as e:
+            self._bind_error = e
+            self._ready.set()
+            socket.close(linger=0)
+            return
+        self._ready.set()
+
+        poller = zmq.Poller()
+        poller.register(socket, zmq.POLLIN)
+        try:
+            while self._running.is_set():
+                if not poller.poll(100):
+                    continue
+                socket.send(self.handle(socket.recv()))
+        finally:
+            socket.close(linger=0)
+
+    def handle(self, raw_request):
+        """คืน reply (bytes) สำหรับ request หนึ่งข้อความ"""
+        if self.finished and self.loop:
+            self.rewind()
+        if self.finished:
+            return self._error(raw_request, f'trace exhausted after {len(self.records)} calls')
+
+        record = self.records[self.position]
+        if self.strict and request_key(raw_request) != self._keys[self.position]:
+            self.mismatches += 1
+            request = cbor.loads(raw_request)
+            expected = cbor.loads(record.request)
+            return self._error(raw_request, f'trace mismatch at call {self.position}: '
+                               f'expected {expected.get("func", "<batch>")}, '
+                               f'got {request.get("func", "<batch>")}')
+
+        self.position += 1
+        self.served += 1
+        if self.realtime:
+            time.sleep(record.duration)
+        return record.reply
+
+    def _error(self, raw_request, message):
+        if self.verbose:
+            print(f"⚠️ {message}")
+        request_id = cbor.loads(raw_request).get('id')
+        return cbor.dumps({'id': request_id, 'success': False, 'error': message})
+
+def main():
+    parser = argparse.ArgumentParser(description='Record/replay tools for remote API traces')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    replay = commands.add_parser('replay', help='serve a trace as a CoppeliaSim stand-in')
+    replay.add_argument('trace')
+    replay.add_argument('--endpoint', default=None, help='ZMQ endpoint (default tcp://*:PORT)')
+    replay.add_argument('--port', type=int, default=23000)
+    replay.add_argument('--realtime', action='store_true', help='reproduce recorded simulator time')
+    replay.add_argument('--lenient', action='store_true', help='serve replies even if requests differ')
+    replay.add_argument('--loop', action='store_true', help='restart the trace when it ends')
+    replay.add_argument('--verbose', action='store_true')
+
+    info = commands.add_parser('info', help='summarize a trace')
+    info.add_argument('trace')
+    args = parser.parse_args()
+
+    if args.command == 'info':
+        summary = summarize(args.trace)
+        print(f"📼 {args.trace}: {summary['records']} calls in {summary['elapsed']:.3f}s "
+              f"({summary['wait_total']:.3f}s waiting, "
+              f"{summary['bytes_sent']} B sent, {summary['bytes_received']} B received)")
+        for name, entry in summary['functions'].items():
+            print(f"  {name:40s} {entry['calls']:6d} calls {entry['total_time'] * 1000:10.2f} ms")
+        return
+
+    server = TraceReplayServer(
+        args.trace,
+        endpoint=args.endpoint or f'tcp://*:{args.port}',
+        realtime=args.realtime,
+        strict=not args.lenient,
+        loop=args.loop,
+        verbose=args.verbose
+    )
+    print(f"🎞️ Replaying {len(server.records)} calls on {server.endpoint} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n📊 {server.served} replies served, {server.mismatches} mismatches")
+
+if __name__ == '__main__':
+    main()
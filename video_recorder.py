@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Video Recorder
+บันทึกภาพจากกล้องเป็นวิดีโอแบ่งไฟล์ตามเวลา (segment) พร้อม index แยกไฟล์
+
+ภาพถูกดึงจาก source แล้วส่งเข้า queue ขนาดจำกัด ให้ writer thread เข้ารหัสลงไฟล์
+(queue เต็มแล้วภาพใหม่ถูกทิ้งและนับไว้ - ไม่ทำให้ผู้ส่งภาพต้องรอ)
+
+ไฟล์ที่ได้จาก path='flights/run1':
+    flights/run1_000.mp4, flights/run1_001.mp4, ...   วิดีโอแต่ละ segment
+    flights/run1_index.csv                            frame -> segment, เวลา และ pose
+
+Usage:
+    recorder = VideoRecorder('flights/run1', source=drone.video_reader.read, fps=30)
+    ...
+    recorder.stop()
+"""
+
+import csv
+import os
+import queue
+import threading
+import time
+
+import cv2
+
+# codec -> นามสกุลไฟล์
+CODEC_EXTENSIONS = {'mp4v': '.mp4', 'avc1': '.mp4', 'MJPG': '.avi', 'XVID': '.avi'}
+
+INDEX_FIELDS = ['frame', 'segment', 'segment_frame', 'sequence', 'timestamp', 'wall_time',
+                'x', 'y', 'z', 'heading']
+
+class VideoRecorder:
+    def __init__(self, path, source=None, fps=30, segment_seconds=60, codec='mp4v', maxsize=64,
+                 pose=None, verbose=False):
+        """
+        Args:
+            path: ชื่อไฟล์ฐาน (ไม่ต้องมีนามสกุล) - segment จะเป็น path_000.mp4, path_001.mp4, ...
+            source: ฟังก์ชัน source(after, timeout) แบบเดียวกับ CameraViewer
+                    (None = ส่งภาพเองด้วย write())
+            fps: frame rate ที่บันทึกในไฟล์วิดีโอ
+            segment_seconds: ความยาวของแต่ละไฟล์ (วินาที, ตามเวลาของภาพ)
+            codec: 'mp4v' / 'avc1' (MP4) หรือ 'MJPG' (AVI)
+            maxsize: ขนาด queue ของภาพที่รอเข้ารหัส
+            pose: ฟังก์ชันคืน (position, heading) สำหรับภาพที่ไม่มี pose ติดมา
+            verbose: แสดงข้อความ debug หรือไม่
+        """
+        if codec not in CODEC_EXTENSIONS:
+            raise ValueError(f'Unknown codec: {codec} (expected one of {list(CODEC_EXTENSIONS)})')
+        if segment_seconds <= 0:
+            raise ValueError('segment_seconds must be positive')
+
+        self.base = os.path.splitext(path)[0]
+        self.extension = CODEC_EXTENSIONS[codec]
+        self.fps = fps
+        self.segment_seconds = segment_seconds
+        self.codec = codec
+        self.pose = pose
+        self.verbose = verbose
+        self.index_path = f'{self.base}_index.csv'
+        self.segments = []
+
+        directory = os.path.dirname(self.base)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._queue = queue.Queue(maxsize)
+        self._writer = None
+        self._segment_start = None
+        self._segment_frames = 0
+
+        # สถิติ - ถูกแก้จาก thread ผู้เรียก write, feed thread และ writer thread (ใช้ _lock)
+        self._lock = threading.Lock()
+        self.received = 0
+        self.written = 0
+        self.dropped = 0
+        self.error = None
+
+        self._index_file = open(self.index_path, 'w', newline='')
+        self._index = csv.writer(self._index_file)
+        self._index.writerow(INDEX_FIELDS)
+
+        self._running = threading.Event()
+        self._running.set()
+        self._writer_thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer_thread.start()
+        self._feed_thread = None
+        if source is not None:
+            self._feed_thread = threading.Thread(target=self._feed_loop, args=(source,), daemon=True)
+            self._feed_thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        return False
+
+    @property
+    def running(self):
+        return self._running.is_set()
+
+    def write(self, image, sequence=None, timestamp=None, position=None, heading=None):
+        """
+        ส่งภาพหนึ่งภาพเข้าคิว (ไม่รอ) - คืน False ถ้าคิวเต็มและภาพถูกทิ้ง
+
+        Args:
+            image: ภาพ BGR (ทุกภาพต้องขนาดเท่ากัน)
+            sequence: ลำดับภาพจากต้นทาง
+            timestamp: เวลาที่ได้ภาพ (time.monotonic, None = ตอนนี้)
+            position: [x, y, z] ของโดรน
+            heading: ทิศของโดรน (องศา)
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        if position is None and heading is None and self.pose is not None:
+            position, heading = self.pose()
+        with self._lock:
+            self.received += 1
+        try:
+            self._queue.put_nowait((image, sequence, timestamp, time.time(), position, heading))
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+
+    def stop(self):
+        """หยุดรับภาพ เขียนภาพที่ค้างในคิวให้เสร็จ แล้วปิดไฟล์ - คืนสถิติ"""
+        if self._running.is_set():
+            self._running.clear()
+            if self._feed_thread is not None and self._feed_thread is not threading.current_thread():
+                self._feed_thread.join()
+            self._queue.put(None)
+            self._writer_thread.join()
+            if self.verbose:
+                print(f"🎬 Recorded {self.written} frames in {len(self.segments)} segments")
+        return self.stats()
+
+    def stats(self):
+        """สถิติ: ภาพที่ได้รับ / เขียนแล้ว / ถูกทิ้ง, ไฟล์ segment และ index"""
+        with self._lock:
+            return {
+                'received': self.received,
+                'written': self.written,
+                'dropped': self.dropped,
+                'queued': self._queue.qsize(),
+                'segments': list(self.segments),
+                'index': self.index_path,
+                'error': None if self.error is None else str(self.error),
+            }
+
+    def _feed_loop(self, source):
+        """ดึงภาพใหม่จาก source ส่งเข้าคิว"""
+        last_sequence = None
+        while self._running.is_set():
+            frame = source(last_sequence, 0.5)
+            if frame is None:
+                continue
+            if last_sequence is not None:
+                # ภาพที่ source เขียนทับก่อนถูกดึง
+                with self._lock:
+                    self.dropped += max(0, frame.sequence - last_sequence - 1)
+            last_sequence = frame.sequence
+
+            timestamp = getattr(frame, 'received', None)
+            if timestamp is None:
+                timestamp = getattr(frame, 'timestamp', None)
+            position = getattr(frame, 'position', None)
+            heading = getattr(frame, 'heading', None)
+            self.write(frame.image, frame.sequence, timestamp, position, heading)
+
+    def _write_loop(self):
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                try:
+                    self._write_frame(*item)
+                except Exception as e:
+                    # เขียนต่อไม่ได้ (เช่นดิสก์เต็ม) - หยุดบันทึกแต่ยังรับ/นับภาพต่อ
+                    with self._lock:
+                        self.error = e
+                    print(f"❌ Video recording failed: {e}")
+                    self._drain()
+                    break
+        finally:
+            self._close_segment()
+            self._index_file.close()
+
+    def _write_frame(self, image, sequence, timestamp, wall_time, position, heading):
+        if self._writer is None or timestamp - self._segment_start >= self.segment_seconds:
+            self._open_segment(image, timestamp)
+
+        self._writer.write(image)
+        x, y, z = position if position is not None else ('', '', '')
+        self._index.writerow([
+            self.written, len(self.segments) - 1, self._segment_frames,
+            '' if sequence is None else sequence, f'{timestamp:.6f}', f'{wall_time:.6f}',
+            x, y, z, '' if heading is None else heading
+        ])
+        self._segment_frames += 1
+        with self._lock:
+            self.written += 1
+
+    def _open_segment(self, image, timestamp):
+        self._close_segment()
+        path = f'{self.base}_{len(self.segments):03d}{self.extension}'
+        height, width = image.shape[:2]
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*self.codec), self.fps, (width, height))
+        if not writer.isOpened():
+            raise IOError(f'Cannot open video writer for {path} (codec {self.codec})')
+        self._writer = writer
+        self._segment_start = timestamp
+        self._segment_frames = 0
+        with self._lock:
+            self.segments.append(path)
+        if self.verbose:
+            print(f"🎬 Recording segment {path}")
+
+    def _close_segment(self):
+        if self._writer is not None:
+            self._writer.release()
+            self._writer = None
+        self._index_file.flush()
+
+    def _drain(self):
+        """ทิ้งภาพที่เหลือในคิวจนเจอสัญญาณหยุด"""
+        while self._queue.get() is not None:
+            with self._lock:
+                self.dropped += 1
@@ -1,9 +1,336 @@
 import zmq
+import zmq.asyncio
 import cbor2 as cbor
-import uuid
+import asyncio
+import threading
+import queue
+import time
+import json
+import math
+import io
+import itertools
+import struct
+from contextlib import contextmanager
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class LatencyHistogram:
+    # จำนวน bucket ย่อยต่อช่วงกำลังสอง - ความละเอียดประมาณ 1/32 (~3%) ของค่า
+    SUB_BUCKETS = 32
+    
+    def __init__(self):
+        """
+        Histogram ของเวลาแบบ HDR (log-linear buckets) หน่วยวินาที
+        
+        เก็บค่าเป็นไมโครวินาทีใน bucket ที่กว้างขึ้นตามขนาดค่า จึงใช้หน่วยความจำคงที่
+        แต่ยังให้ percentile ที่คลาดเคลื่อนไม่เกินความละเอียดของ bucket
+        """
+        self.counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+    
+    def record(self, seconds):
+        """บันทึกค่าหนึ่งค่า (วินาที)"""
+        bucket = self._bucketOf(int(seconds * 1e6))
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+    
+    def percentile(self, p):
+        """ค่าที่ percentile p (0-100) หน่วยวินาที"""
+        if not self.count:
+            return 0.0
+        target = max(1, math.ceil(self.count * p / 100.0))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= target:
+                return min(self._upperBound(bucket) / 1e6, self.max)
+        return self.max
+    
+    def snapshot(self):
+        """สรุปค่าสถิติเป็น dict"""
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'min': self.min or 0.0,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'max': self.max or 0.0
+        }
+    
+    def _bucketOf(self, micros):
+        if micros < self.SUB_BUCKETS:
+            return micros
+        shift = micros.bit_length() - self.SUB_BUCKETS.bit_length()
+        return (shift + 1) * self.SUB_BUCKETS + (micros >> shift) - self.SUB_BUCKETS
+    
+    def _upperBound(self, bucket):
+        if bucket < self.SUB_BUCKETS:
+            return bucket + 1
+        shift = bucket // self.SUB_BUCKETS - 1
+        return ((bucket % self.SUB_BUCKETS + self.SUB_BUCKETS + 1) << shift)
+
+class CallStats:
+    def __init__(self):
+        """สถิติการเรียกใช้ remote API แยกตามชื่อฟังก์ชัน (latency และจำนวน bytes)"""
+        self._lock = threading.Lock()
+        self._dumpThread = None
+        self._dumpStop = threading.Event()
+        self.reset()
+    
+    def reset(self):
+        """ล้างสถิติทั้งหมด"""
+        with self._lock:
+            self._histograms = {}
+            self._bytes = {}
+            self._events = {'timeouts': 0, 'reconnects': 0, 'retries': 0}
+            self.startTime = time.time()
+    
+    def increment(self, event):
+        """นับเหตุการณ์ เช่น 'timeouts', 'reconnects', 'retries'"""
+        with self._lock:
+            self._events[event] = self._events.get(event, 0) + 1
+    
+    def record(self, funcName, seconds, sent, received):
+        """บันทึกการเรียกหนึ่งครั้ง"""
+        with self._lock:
+            histogram = self._histograms.get(funcName)
+            if histogram is None:
+                histogram = self._histograms[funcName] = LatencyHistogram()
+                self._bytes[funcName] = [0, 0]
+            histogram.record(seconds)
+            self._bytes[funcName][0] += sent
+            self._bytes[funcName][1] += received
+    
+    def snapshot(self):
+        """
+        Returns:
+            dict: สรุปรวม และ 'functions' แยกตามชื่อฟังก์ชัน (เรียงตามเวลารวมมากไปน้อย)
+        """
+        with self._lock:
+            functions = {}
+            for funcName, histogram in self._histograms.items():
+                entry = histogram.snapshot()
+                entry['total_time'] = histogram.total
+                entry['bytes_sent'], entry['bytes_received'] = self._bytes[funcName]
+                functions[funcName] = entry
+            events = dict(self._events)
+            elapsed = time.time() - self.startTime
+        
+        ordered = dict(sorted(functions.items(), key=lambda item: -item[1]['total_time']))
+        return {
+            'elapsed': elapsed,
+            'calls': sum(f['count'] for f in ordered.values()),
+            'total_time': sum(f['total_time'] for f in ordered.values()),
+            'bytes_sent': sum(f['bytes_sent'] for f in ordered.values()),
+            'bytes_received': sum(f['bytes_received'] for f in ordered.values()),
+            'events': events,
+            'functions': ordered
+        }
+    
+    def format(self, snapshot=None):
+        """แปลง snapshot เป็นตารางข้อความ"""
+        snapshot = snapshot or self.snapshot()
+        lines = [
+            f"Remote API: {snapshot['calls']} calls, {snapshot['total_time']:.3f}s in calls, "
+            f"{snapshot['bytes_sent']} B sent, {snapshot['bytes_received']} B received "
+            f"over {snapshot['elapsed']:.1f}s, "
+            + ', '.join(f"{count} {event}" for event, count in snapshot['events'].items()),
+            f"{'function':<36}{'count':>8}{'total s':>10}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+        ]
+        for funcName, f in snapshot['functions'].items():
+            lines.append(
+                f"{funcName:<36}{f['count']:>8}{f['total_time']:>10.3f}"
+                f"{f['p50'] * 1e3:>9.2f}{f['p99'] * 1e3:>9.2f}{f['max'] * 1e3:>9.2f}")
+        return '\n'.join(lines)
+    
+    def start_dump(self, interval=10.0, path=None):
+        """
+        พิมพ์ (หรือเขียนต่อท้ายไฟล์เป็น JSON ทีละบรรทัด) สถิติทุก interval วินาที
+        
+        Args:
+            interval: ระยะเวลาระหว่างการ dump (วินาที)
+            path: ไฟล์ .jsonl ที่ต้องการเขียน (None = พิมพ์ออกหน้าจอ)
+        """
+        self.stop_dump()
+        self._dumpStop.clear()
+        
+        def dumpLoop():
+            while not self._dumpStop.wait(interval):
+                self.dump(path)
+        
+        self._dumpThread = threading.Thread(target=dumpLoop, daemon=True)
+        self._dumpThread.start()
+    
+    def stop_dump(self):
+        """หยุดการ dump อัตโนมัติ"""
+        if self._dumpThread is not None:
+            self._dumpStop.set()
+            self._dumpThread.join()
+            self._dumpThread = None
+    
+    def dump(self, path=None):
+        """dump สถิติหนึ่งครั้ง"""
+        snapshot = self.snapshot()
+        if path:
+            snapshot['timestamp'] = time.time()
+            with open(path, 'a') as f:
+                f.write(json.dumps(snapshot) + '\n')
+        else:
+            print(self.format(snapshot))
+
+class RemoteAPITimeout(TimeoutError):
+    """ไม่ได้รับคำตอบจาก CoppeliaSim ภายในเวลาที่กำหนด"""
+    pass
+
+# คำสั่งที่อ่านอย่างเดียว - ส่งซ้ำได้อย่างปลอดภัยเมื่อ timeout
+_IDEMPOTENT_PREFIXES = ('get', 'read', 'is', 'check')
+
+def _isIdempotent(funcName):
+    return funcName.rpartition('.')[2].startswith(_IDEMPOTENT_PREFIXES)
+
+def _receive(socket, poller, timeout, multipart=False):
+    """
+    รอคำตอบไม่เกิน timeout วินาที (None = รอไม่จำกัด) - คืน None ถ้าหมดเวลา
+    
+    multipart=True: คืน list ของ zmq.Frame ที่รับแบบ copy=False
+    """
+    if timeout is not None and not poller.poll(int(timeout * 1000)):
+        return None
+    if multipart:
+        return socket.recv_multipart(copy=False)
+    return socket.recv()
+
+# placeholder ใน 'ret' ของคำตอบแบบ multipart: {'@frame': i} = ข้อมูลดิบใน frame ที่ i+1
+FRAME_KEY = '@frame'
+
+def _attachFrames(value, frames, copy=False):
+    """แทน {'@frame': i} ด้วย memoryview ของ frame (copy=True = แทนด้วย bytes)"""
+    if isinstance(value, dict) and len(value) == 1 and FRAME_KEY in value:
+        buffer = frames[value[FRAME_KEY]].buffer
+        return bytes(buffer) if copy else buffer
+    if isinstance(value, list):
+        return [_attachFrames(item, frames, copy) for item in value]
+    return value
+
+# RFC 8746 typed arrays: tag -> numpy dtype (ฝั่ง decode รองรับทั้ง little/big endian)
+TYPED_ARRAY_TAGS = {
+    64: 'u1', 72: 'i1',
+    69: '<u2', 70: '<u4', 71: '<u8', 77: '<i2', 78: '<i4', 79: '<i8',
+    65: '>u2', 66: '>u4', 67: '>u8', 73: '>i2', 74: '>i4', 75: '>i8',
+    84: '<f2', 85: '<f4', 86: '<f8', 80: '>f2', 81: '>f4', 82: '>f8',
+}
+_TAG_FLOAT32_LE = 85
+_TAG_FLOAT64_LE = 86
+# RFC 8746 multi-dimensional array: [shape, typed array] (row-major)
+_TAG_MULTI_DIM = 40
+
+# list ของ float ที่ยาวตั้งแต่ค่านี้ถูกส่งเป็น typed array (ตำแหน่ง/มุม 3 ค่ายังเป็น list ปกติ)
+TYPED_ARRAY_MIN_LENGTH = 8
+
+def _encodeDefault(encoder, value):
+    """encode ค่าที่ cbor2 ไม่รู้จัก: numpy array เป็น typed array (float) หรือ list, numpy scalar เป็นตัวเลข"""
+    if np is not None:
+        if isinstance(value, np.ndarray):
+            if value.dtype == np.float32 or value.dtype == np.float64:
+                tag = _TAG_FLOAT32_LE if value.dtype == np.float32 else _TAG_FLOAT64_LE
+                data = np.ascontiguousarray(value, dtype=value.dtype.newbyteorder('<')).tobytes()
+                typed = cbor.CBORTag(tag, data)
+                if value.ndim > 1:
+                    typed = cbor.CBORTag(_TAG_MULTI_DIM, [list(value.shape), typed])
+                encoder.encode(typed)
+            else:
+                encoder.encode(value.tolist())
+            return
+        if isinstance(value, np.generic):
+            encoder.encode(value.item())
+            return
+    raise TypeError(f'cannot serialize type {type(value).__name__}')
+
+def _decodeTag(*hookArgs):
+    """decode typed array (RFC 8746) เป็น numpy array - tag อื่นคืนตามเดิม"""
+    # cbor2 5.x เรียก tag_hook(decoder, tag) ส่วน 6.x เรียก tag_hook(tag, immutable)
+    tag = hookArgs[0] if isinstance(hookArgs[0], cbor.CBORTag) else hookArgs[1]
+    if np is None:
+        return tag
+    dtype = TYPED_ARRAY_TAGS.get(tag.tag)
+    if dtype is not None and isinstance(tag.value, bytes):
+        return np.frombuffer(tag.value, dtype=dtype)
+    if tag.tag == _TAG_MULTI_DIM and isinstance(tag.value, (list, tuple)) and len(tag.value) == 2:
+        shape, data = tag.value
+        if isinstance(data, np.ndarray):
+            return data.reshape(shape)
+    return tag
+
+def _packArrays(value):
+    """แปลง list ของ float ที่ยาวพอเป็น typed array float64 (ค่าอื่นคืนตามเดิม)"""
+    if isinstance(value, (list, tuple)):
+        if len(value) >= TYPED_ARRAY_MIN_LENGTH and all(type(v) is float for v in value):
+            return cbor.CBORTag(_TAG_FLOAT64_LE, struct.pack(f'<{len(value)}d', *value))
+        return [_packArrays(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _packArrays(v) for k, v in value.items()}
+    return value
+
+def _dumps(msg, typedArrays=False):
+    """encode message ทั้งก้อน (ใช้กับ multi-call และ message ที่ไม่ผ่าน _CallEncoder)"""
+    if typedArrays:
+        msg = _packArrays(msg)
+    return cbor.dumps(msg, default=_encodeDefault)
+
+def _loads(raw):
+    """decode คำตอบ - typed array กลายเป็น numpy array"""
+    return cbor.loads(raw, tag_hook=_decodeTag)
+
+class _CallEncoder:
+    # ส่วนของ message ที่ encode ไว้ล่วงหน้า: map 3 รายการ {'func', 'args', 'id'}
+    _HEADER = b'\xa3' + cbor.dumps('func')
+    _ARGS_KEY = cbor.dumps('args')
+    _ID_KEY = cbor.dumps('id')
+    
+    def __init__(self, names=None, typedArrays=False):
+        """
+        Encode คำสั่งเป็น CBOR โดยใช้ชื่อฟังก์ชันที่ encode ไว้แล้วและ buffer เดิมซ้ำ
+        (ผลลัพธ์เหมือน cbor.dumps({'func': ..., 'args': ..., 'id': ...}) ทุก byte)
+        
+        Args:
+            names: dict ชื่อฟังก์ชัน -> bytes ที่ใช้ร่วมกันได้ระหว่างหลาย encoder
+            typedArrays: ส่ง numpy float array และ list ของ float ที่ยาวเป็น typed array
+        """
+        self._names = names if names is not None else {}
+        self._typedArrays = typedArrays
+        self._buffer = io.BytesIO()
+        self._encoder = cbor.CBOREncoder(self._buffer, default=_encodeDefault)
+    
+    def encode(self, funcName, args, reqId):
+        name = self._names.get(funcName)
+        if name is None:
+            name = self._names[funcName] = cbor.dumps(funcName)
+        
+        buffer = self._buffer
+        buffer.seek(0)
+        buffer.truncate()
+        buffer.write(self._HEADER)
+        buffer.write(name)
+        buffer.write(self._ARGS_KEY)
+        self._encoder.encode(_packArrays(args) if self._typedArrays else args)
+        buffer.write(self._ID_KEY)
+        self._encoder.encode(reqId)
+        return buffer.getvalue()
 
 class RemoteAPIClient:
-    def __init__(self, host='localhost', port=23000, cntPort=-1, verbose=None):
+    def __init__(self, host='localhost', port=23000, cntPort=-1, verbose=None,
+                 timeout=None, retries=2, typedArrays=False, endpoint=None, context=None):
         """
         เชื่อมต่อกับ CoppeliaSim ผ่าน ZMQ Remote API
         
@@ -12,67 +339,106 @@ class RemoteAPIClient:
             port: พอร์ตหลัก (ปกติ 23000)
             cntPort: พอร์ตสำหรับ continuous data (ปกติ 23001)
             verbose: แสดงข้อความ debug หรือไม่
+            timeout: เวลารอคำตอบสูงสุดต่อคำสั่ง (วินาที) - ค่าเริ่มต้น None รอไม่จำกัดเหมือนเดิม
+                     เพราะคำสั่งยาวๆ (loadModel, โหลด scene, callScriptFunction ที่เก็บภาพ)
+                     ใช้เวลาเกินหลายวินาทีได้ ตั้งค่าเมื่อต้องการ หรือส่ง timeout ต่อคำสั่งใน call()
+                     (คำสั่งที่ไม่ใช่ get*/read* ที่ timeout จะไม่ได้รับคำตอบที่มาช้า)
+            retries: จำนวนครั้งที่ส่งซ้ำหลัง timeout สำหรับคำสั่งอ่านค่า (get*/read*)
+            typedArrays: ส่ง numpy float array และ list ของ float ยาวๆ เป็น CBOR typed array
+                         (RFC 8746) - ใช้เมื่อ server รองรับเท่านั้น
+            endpoint: ZMQ endpoint แทน host/port เช่น 'ipc:///tmp/coppeliasim-23000'
+                      (simulator อยู่เครื่องเดียวกัน) หรือ 'inproc://mock' (ต้องใช้ context ร่วม)
+            context: zmq.Context ที่ใช้ร่วม (จำเป็นสำหรับ inproc://) - ไม่ระบุจะสร้างใหม่
         """
-        self.context = zmq.Context()
+        self._ownContext = context is None
+        self.context = context if context is not None else zmq.Context()
         self.verbose = verbose
+        self.timeout = timeout
+        self.retries = retries
+        self.typedArrays = typedArrays
+        
+        # ถือว่า server รองรับ multi-call จนกว่าจะถูกปฏิเสธครั้งแรก
+        self._batchSupported = True
+        
+        # REQ socket ใช้พร้อมกันหลาย thread ไม่ได้ - ต้องส่ง/รับทีละคู่
+        self._lock = threading.Lock()
+        
+        # latency และ bytes ของทุกคำสั่ง
+        self._callStats = CallStats()
+        
+        # request id แบบเลขเพิ่มขึ้นเรื่อยๆ (ถูกกว่า uuid4) และ encoder ที่ใช้ buffer ซ้ำ
+        self._ids = itertools.count(1)
+        self._encoder = _CallEncoder(typedArrays=typedArrays)
+        
+        # ตารางค่าคงที่ของแต่ละ object (ดึงครั้งเดียวตอน getObject)
+        self._constants = {}
+        
+        # TraceWriter ขณะบันทึก request/reply (ดู start_recording)
+        self._recorder = None
         
         # REQ socket สำหรับส่งคำสั่ง
-        self.socket = self.context.socket(zmq.REQ)
-        self.socket.connect(f'tcp://{host}:{port}')
+        self._endpoint = endpoint or f'tcp://{host}:{port}'
+        self._connect()
         
-        # REQ socket สำหรับ subscriptions
-        if cntPort == -1:
-            cntPort = port + 1
-        self.cntSocket = self.context.socket(zmq.REQ)
-        self.cntSocket.connect(f'tcp://{host}:{cntPort}')
+        # REQ socket สำหรับ subscriptions (มีเฉพาะเมื่อเชื่อมต่อผ่าน tcp)
+        if self._endpoint.startswith('tcp://'):
+            if cntPort == -1:
+                cntPort = port + 1
+            self.cntSocket = self.context.socket(zmq.REQ)
+            self.cntSocket.connect(f'tcp://{host}:{cntPort}')
         
         if self.verbose:
-            print(f"Connected to CoppeliaSim at {host}:{port}")
+            print(f"Connected to CoppeliaSim at {self._endpoint}")
+        
+    @classmethod
+    def from_config(cls, config, **kwargs):
+        """
+        สร้าง client จาก dict แบบ COPPELIA_CONFIG (host, port, endpoint และ timeout ถ้ามี)
         
+        Args:
+            config: dict การตั้งค่า
+            **kwargs: argument อื่นของ constructor (เช่น context, timeout)
+        """
+        kwargs.setdefault('timeout', config.get('timeout'))
+        return cls(host=config.get('host', 'localhost'), port=config.get('port', 23000),
+                   endpoint=config.get('endpoint'), **kwargs)
+    
     def __del__(self):
         """ปิดการเชื่อมต่อเมื่อ object ถูกลบ"""
         try:
+            if getattr(self, '_recorder', None) is not None:
+                self._recorder.close()
             if hasattr(self, 'socket'):
                 self.socket.close()
             if hasattr(self, 'cntSocket'):
                 self.cntSocket.close()
-            if hasattr(self, 'context'):
+            if getattr(self, '_ownContext', False):
                 self.context.term()
         except:
             pass
     
-    def call(self, funcName, args):
+    def call(self, funcName, args, timeout=None):
         """
         เรียกใช้ฟังก์ชันใน CoppeliaSim
         
         Args:
             funcName: ชื่อฟังก์ชัน เช่น 'sim.startSimulation'
             args: arguments ของฟังก์ชัน
+            timeout: เวลารอคำตอบ (วินาที) - ไม่ระบุจะใช้ self.timeout
             
         Returns:
             ผลลัพธ์จากฟังก์ชัน
+            
+        Raises:
+            RemoteAPITimeout: ไม่ได้รับคำตอบภายในเวลาที่กำหนด
         """
-        # สร้างข้อความส่ง
-        msg = {
-            'func': funcName,
-            'args': args,
-            'id': str(uuid.uuid4())
-        }
-        
-        # แปลงเป็น CBOR และส่ง
-        rawMsg = cbor.dumps(msg)
-        
         if self.verbose:
             print(f'Sending: {funcName}({args})')
         
-        self.socket.send(rawMsg)
-        
-        # รับและแปลงผลลัพธ์
-        responseRaw = self.socket.recv()
-        response = cbor.loads(responseRaw)
-        
-        if self.verbose:
-            print(f'Received: {response}')
+        # สร้างข้อความส่ง (encode เป็น CBOR โดยตรง)
+        with self._lock:
+            rawMsg = self._encoder.encode(funcName, args, next(self._ids))
+            response = self._exchange(rawMsg, funcName, timeout)
             
         # ตรวจสอบผลลัพธ์
         if response.get('success', False):
@@ -81,6 +447,175 @@ class RemoteAPIClient:
             error_msg = response.get('error', 'Unknown error')
             raise Exception(f"Remote function call failed: {error_msg}")
     
+    def _request(self, msg):
+        """ส่งข้อความหนึ่งรอบ (REQ/REP) แล้วคืน response ที่ decode แล้ว"""
+        with self._lock:
+            return self._exchange(_dumps(msg, self.typedArrays), _statsKey(msg))
+    
+    def _exchange(self, rawMsg, statsKey, timeout=None, multipart=False):
+        """
+        ส่ง message ที่ encode แล้วและรอคำตอบ (ต้องถือ self._lock อยู่)
+        
+        multipart=True: รับคำตอบที่อาจมี frame ข้อมูลดิบต่อท้าย - placeholder
+        {'@frame': i} ใน response ถูกแทนด้วย memoryview ของ frame โดยไม่ copy
+        """
+        timeout = self.timeout if timeout is None else timeout
+        attempts = 1 + (self.retries if _isIdempotent(statsKey) else 0)
+        
+        for attempt in range(attempts):
+            start = time.perf_counter()
+            self.socket.send(rawMsg)
+            
+            # รับและแปลงผลลัพธ์
+            responseRaw = _receive(self.socket, self._poller, timeout, multipart)
+            if responseRaw is not None:
+                break
+            
+            # คำตอบหาย - REQ socket ค้างสถานะรอรับ ต้องสร้างใหม่ก่อนส่งอีกครั้ง
+            self._callStats.increment('timeouts')
+            self._reconnect()
+            if attempt + 1 < attempts:
+                self._callStats.increment('retries')
+        else:
+            raise RemoteAPITimeout(f'{statsKey}: no reply within {timeout}s ({attempts} attempts)')
+        
+        elapsed = time.perf_counter() - start
+        frames = ()
+        if multipart:
+            responseRaw, frames = responseRaw[0].bytes, responseRaw[1:]
+        response = _loads(responseRaw)
+        
+        received = len(responseRaw) + sum(len(frame) for frame in frames)
+        self._callStats.record(statsKey, elapsed, len(rawMsg), received)
+        if self._recorder is not None:
+            # trace เก็บเป็นคำตอบ frame เดียว (ข้อมูลดิบ inline) - เล่นซ้ำได้กับทุก client
+            if frames:
+                inlined = dict(response, ret=_attachFrames(response.get('ret'), frames, copy=True))
+                self._recorder.write(rawMsg, _dumps(inlined), start, elapsed)
+            else:
+                self._recorder.write(rawMsg, responseRaw, start, elapsed)
+        
+        if frames:
+            response['ret'] = _attachFrames(response.get('ret'), frames)
+        
+        if self.verbose:
+            print(f'Received: {response}')
+        
+        return response
+    
+    def _connect(self):
+        self.socket = self.context.socket(zmq.REQ)
+        self.socket.setsockopt(zmq.LINGER, 0)
+        self.socket.connect(self._endpoint)
+        self._poller = zmq.Poller()
+        self._poller.register(self.socket, zmq.POLLIN)
+    
+    def _reconnect(self):
+        """ทิ้ง socket ที่ค้างแล้วสร้างใหม่"""
+        self._poller.unregister(self.socket)
+        self.socket.close()
+        self._connect()
+        self._callStats.increment('reconnects')
+        if self.verbose:
+            print(f'Reconnected to {self._endpoint}')
+    
+    def stats(self):
+        """
+        สถิติการเรียกใช้แยกตามฟังก์ชัน: จำนวนครั้ง, latency (mean/p50/p90/p99/max),
+        เวลารวม และ bytes ที่ส่ง/รับ พร้อมจำนวน timeouts/reconnects/retries ใน 'events'
+        
+        Returns:
+            dict: snapshot ของสถิติ
+        """
+        return self._callStats.snapshot()
+    
+    def reset_stats(self):
+        """ล้างสถิติการเรียกใช้"""
+        self._callStats.reset()
+    
+    def start_stats_dump(self, interval=10.0, path=None):
+        """dump สถิติอัตโนมัติทุก interval วินาที (path = ไฟล์ .jsonl หรือ None = พิมพ์)"""
+        self._callStats.start_dump(interval, path)
+    
+    def stop_stats_dump(self):
+        """หยุด dump สถิติอัตโนมัติ"""
+        self._callStats.stop_dump()
+    
+    def start_recording(self, path):
+        """
+        บันทึก request, reply และเวลาของทุกคำสั่งลงไฟล์ trace
+        
+        เล่นซ้ำได้ด้วย remote_api_trace.TraceReplayServer (ไม่ต้องมี simulator)
+        
+        Args:
+            path: ไฟล์ trace ปลายทาง
+            
+        Returns:
+            TraceWriter
+        """
+        from remote_api_trace import TraceWriter
+        
+        with self._lock:
+            if self._recorder is not None:
+                self._recorder.close()
+            self._recorder = TraceWriter(path)
+        if self.verbose:
+            print(f'Recording remote API trace to {path}')
+        return self._recorder
+    
+    def stop_recording(self):
+        """หยุดบันทึกและปิดไฟล์ trace (คืนจำนวนคำสั่งที่บันทึก)"""
+        with self._lock:
+            recorder, self._recorder = self._recorder, None
+        if recorder is None:
+            return 0
+        recorder.close()
+        return recorder.records
+    
+    def subscribe(self, topics, rate_hz=100, callback=None, maxsize=256):
+        """
+        อ่านสถานะ (ตำแหน่ง, orientation, proximity) ต่อเนื่องใน background
+        
+        Usage:
+            stream = client.subscribe(['pose:/Quadcopter',
+                                       'proximity:/Quadcopter/proximitySensor'], rate_hz=100)
+            pose = stream.latest('pose:/Quadcopter')   # ไม่มี round trip
+            stream.stop()
+        
+        Args:
+            topics: list ของ 'ชนิด:path' (pose, position, orientation, proximity)
+            rate_hz: จำนวนรอบอ่านต่อวินาที
+            callback: callback(topic, value, timestamp) เรียกจาก worker thread
+            maxsize: ขนาด queue ของ updates
+            
+        Returns:
+            RemoteAPISubscription
+        """
+        return RemoteAPISubscription(self, topics, rate_hz, callback, maxsize)
+    
+    def batch(self, pipelined=True):
+        """
+        สร้าง batch context สำหรับส่งหลายคำสั่งใน round trip เดียว
+        
+        Usage:
+            with client.batch() as b:
+                sim = b.getObject('sim')
+                h = sim.createPrimitiveShape(shapeType, size)
+                sim.setObjectPosition(h, position)
+            handle = h.result()
+        
+        ถ้า simulator ไม่รองรับ multi-call (CoppeliaSim จริง) batch ถูกส่งผ่าน Lua helper
+        ใน sandbox script ด้วย sim.callScriptFunction ครั้งเดียวแทน (ดู RemoteAPIBatch)
+        
+        Args:
+            pipelined: ส่งเป็น multi-call message เดียว (False = ส่งทีละคำสั่ง)
+            
+        Returns:
+            RemoteAPIBatch
+        """
+        return RemoteAPIBatch(self, pipelined=pipelined and self._batchSupported,
+                              scriptType=_fetchConstants(self, 'sim').get('scripttype_sandboxscript'))
+    
     def getObject(self, name):
         """
         สร้าง object สำหรับเรียกใช้ฟังก์ชัน
@@ -89,31 +624,1273 @@ class RemoteAPIClient:
             name: ชื่อ object เช่น 'sim'
             
         Returns:
-            RemoteAPIObject ที่สามารถเรียกใช้ฟังก์ชันได้
+            RemoteAPIObject ที่สามารถเรียกใช้ฟังก์ชันได้ (ค่าคงที่ เช่น
+            sim.primitiveshape_cuboid อ่านได้ทันทีโดยไม่ต้องส่งคำสั่ง)
+        """
+        return RemoteAPIObject(name, self, _fetchConstants(self, name))
+    
+    def getVisionSensorImage(self, sensorHandle, timeout=None, contiguous=False):
+        """
+        อ่านภาพจาก vision sensor เป็น numpy array โดยตรง (ไม่ผ่านไฟล์)
+        
+        ขอคำตอบแบบ multipart: ภาพมาเป็น ZMQ frame แยก รับแบบ copy=False แล้วห่อด้วย
+        np.frombuffer จึงไม่มีการ copy ข้อมูลภาพ - server ที่ไม่รองรับจะตอบเป็น CBOR
+        ปกติ ซึ่งยังใช้ np.frombuffer กับ bytes ที่ decode ได้เช่นกัน
+        
+        Args:
+            sensorHandle: handle ของ vision sensor
+            timeout: เวลารอคำตอบ (วินาที) - ไม่ระบุจะใช้ self.timeout
+            contiguous: True = คืนสำเนาที่เรียงต่อกันในหน่วยความจำ (แก้ไขได้, ส่งต่อ library
+                ที่ต้องการ C-contiguous ได้ตรงๆ) - False = คืน view บน buffer ของ ZMQ
+            
+        Returns:
+            numpy array ขนาด (H, W, 3) uint8 แบบ RGB แถวบนสุดคือด้านบนของภาพ
+            ค่าเริ่มต้นเป็น view กลับแนวตั้ง (stride ติดลบ, ไม่ contiguous) ที่อ่านอย่างเดียว
+            - ใช้ contiguous=True หรือ .copy() ถ้าต้องการแก้ไข
         """
-        return RemoteAPIObject(name, self)
+        if np is None:
+            raise RuntimeError('numpy is required for getVisionSensorImage')
+        
+        funcName = 'sim.getVisionSensorImg'
+        msg = {'func': funcName, 'args': [sensorHandle], 'id': next(self._ids), 'binary': True}
+        with self._lock:
+            response = self._exchange(_dumps(msg), funcName, timeout, multipart=True)
+        
+        if not response.get('success', False):
+            error_msg = response.get('error', 'Unknown error')
+            raise Exception(f"Remote function call failed: {error_msg}")
+        
+        image, (resX, resY) = response['ret'][:2]
+        frame = np.frombuffer(image, dtype=np.uint8).reshape(resY, resX, 3)
+        
+        # CoppeliaSim เก็บภาพจากล่างขึ้นบน - กลับแนวตั้งแบบ view (ไม่ copy)
+        frame = frame[::-1]
+        if contiguous:
+            return np.ascontiguousarray(frame)
+        # buffer ของ zmq.Frame เขียนได้ - ปิดการเขียนเพื่อไม่ให้แก้ข้อมูลของ ZMQ โดยไม่ตั้งใจ
+        frame.setflags(write=False)
+        return frame
+
+def create_client(config=None, **kwargs):
+    """
+    สร้าง client ตามการตั้งค่า COPPELIA_CONFIG ใน config.py (หรือ dict ที่ระบุ)
+    
+    ถ้าตั้ง 'endpoint' (ipc://, inproc://), 'timeout' หรือระบุ kwargs จะใช้ RemoteAPIClient
+    ของไฟล์นี้ ไม่เช่นนั้นใช้ coppeliasim_zmqremoteapi_client ถ้าติดตั้งไว้ (เหมือนเดิม)
+    
+    Args:
+        config: dict การตั้งค่า (host, port, endpoint) - ไม่ระบุจะอ่านจาก config.py
+        **kwargs: argument อื่นของ RemoteAPIClient (เช่น context สำหรับ inproc://)
+    """
+    if config is None:
+        try:
+            from config import COPPELIA_CONFIG as config
+        except ImportError:
+            config = {}
+    
+    if not config.get('endpoint') and config.get('timeout') is None and not kwargs:
+        try:
+            from coppeliasim_zmqremoteapi_client import RemoteAPIClient as OfficialClient
+            return OfficialClient(config.get('host', 'localhost'), config.get('port', 23000))
+        except ImportError:
+            pass
+    return RemoteAPIClient.from_config(config, **kwargs)
+
+def _fetchConstants(client, name):
+    """
+    ดึงตารางค่าคงที่ของ object ครั้งเดียวด้วย zmqRemoteApi.info แล้ว cache ไว้ใน client
+    
+    zmqRemoteApi.info คืน dict ของสมาชิกทั้งหมด - ฟังก์ชันเป็น {'func': ...} ส่วนค่าคงที่เป็น
+    {'const': ค่า} (ค่าที่ไม่ใช่ dict ถือเป็นค่าคงที่ด้วย เผื่อ server รุ่นที่ส่งค่าตรงๆ)
+    server ทางการห่อค่าที่คืนไว้ใน list ของ 'ret' จึงแกะ list สมาชิกเดียวออกก่อน
+    """
+    if name not in client._constants:
+        try:
+            members = client.call('zmqRemoteApi.info', [name])
+        except Exception as e:
+            if client.verbose:
+                print(f'Constant table for {name} not available: {e}')
+            members = None
+        if isinstance(members, (list, tuple)) and len(members) == 1:
+            members = members[0]
+        if isinstance(members, dict):
+            client._constants[name] = _constantMembers(members)
+        else:
+            client._constants[name] = {}
+        if not client._constants[name]:
+            print(f'⚠️ No constants loaded for {name} - its constant attributes will not be available')
+    return client._constants[name]
+
+def _constantMembers(members):
+    """แยกค่าคงที่ออกจากผลของ zmqRemoteApi.info (ข้ามฟังก์ชัน)"""
+    constants = {}
+    for key, value in members.items():
+        if isinstance(value, dict):
+            if 'const' in value:
+                constants[key] = value['const']
+        else:
+            constants[key] = value
+    return constants
 
 class RemoteAPIObject:
-    def __init__(self, name, client):
+    def __init__(self, name, client, constants=None):
         """
         Object สำหรับเรียกใช้ฟังก์ชันใน CoppeliaSim
         
         Args:
             name: ชื่อ object
-            client: RemoteAPIClient instance
+            client: RemoteAPIClient, AsyncRemoteAPIClient หรือ RemoteAPIBatch
+            constants: dict ค่าคงที่ของ object (อ่านเป็น attribute ได้โดยไม่ส่งคำสั่ง)
         """
         self._name = name
         self._client = client
+        
+        # ค่าคงที่เป็น attribute ของ instance โดยตรง - ไม่ผ่าน __getattr__
+        if constants:
+            self.__dict__.update(constants)
     
     def __getattr__(self, name):
-        """สร้างฟังก์ชันสำหรับเรียกใช้ method ต่างๆ"""
+        """สร้างฟังก์ชันสำหรับเรียกใช้ method ต่างๆ (สร้างครั้งเดียวต่อชื่อแล้วเก็บไว้)"""
+        if name.startswith('__'):
+            raise AttributeError(name)
+        
+        call = self._client.call
+        full_func_name = f'{self._name}.{name}'
         def wrapper(*args):
-            full_func_name = f'{self._name}.{name}'
-            return self._client.call(full_func_name, args)
+            return call(full_func_name, args)
+        
+        # เก็บไว้ใน instance - ครั้งต่อไปจะไม่ผ่าน __getattr__ อีก
+        self.__dict__[name] = wrapper
         return wrapper
     
     def __call__(self, *args):
         """เรียกใช้ object เป็นฟังก์ชัน"""
         return self._client.call(self._name, args)
     
-    
\ No newline at end of file
+    
+def _statsKey(msg):
+    """ชื่อที่ใช้เก็บสถิติของ message (multi-call ถูกรวมเป็น '<batch>')"""
+    return msg['func'] if 'func' in msg else '<batch>'
+
+class _PooledSocket:
+    def __init__(self, index, socket):
+        """REQ socket หนึ่งตัวใน RemoteAPIClientPool"""
+        self.index = index
+        self.socket = socket
+        self.calls = 0
+        self.owner = None
+        self.depth = 0
+        self.encoder = None
+        self.poller = zmq.Poller()
+        self.poller.register(socket, zmq.POLLIN)
+
+class RemoteAPIClientPool:
+    def __init__(self, host='localhost', port=23000, size=4, verbose=None,
+                 timeout=None, retries=2, typedArrays=False, endpoint=None, context=None):
+        """
+        Client ที่ใช้ได้หลาย thread พร้อมกัน - แต่ละ thread ได้ REQ socket ของตัวเอง
+        
+        socket ถูกยืมจาก pool ที่มีขนาดจำกัด ถ้าทุกตัวถูกใช้อยู่ thread จะรอ
+        จนกว่าจะมีตัวว่าง (เวลารอถูกบันทึกใน stats())
+        
+        Usage:
+            pool = RemoteAPIClientPool(size=4)
+            sim = pool.getObject('sim')
+            sim.getObjectPosition(handle, -1)   # ยืม socket เฉพาะคำสั่งนี้
+            
+            with pool.lease():                  # ผูก socket กับ thread นี้ทั้ง block
+                for p in trajectory:
+                    sim.setObjectPosition(handle, -1, p)
+        
+        Args:
+            host: ที่อยู่ของ CoppeliaSim (ปกติ localhost)
+            port: พอร์ตหลัก (ปกติ 23000)
+            size: จำนวน socket สูงสุดใน pool
+            verbose: แสดงข้อความ debug หรือไม่
+            timeout: เวลารอคำตอบสูงสุดต่อคำสั่ง (วินาที, None = รอไม่จำกัด - ค่าเริ่มต้น)
+            retries: จำนวนครั้งที่ส่งซ้ำหลัง timeout สำหรับคำสั่งอ่านค่า
+            typedArrays: ส่ง float array เป็น CBOR typed array (ดู RemoteAPIClient)
+            endpoint: ZMQ endpoint แทน host/port (ipc://, inproc://)
+            context: zmq.Context ที่ใช้ร่วม (จำเป็นสำหรับ inproc://)
+        """
+        if size < 1:
+            raise ValueError('Pool size must be at least 1')
+        
+        self._ownContext = context is None
+        self.context = context if context is not None else zmq.Context()
+        self.verbose = verbose
+        self.size = size
+        self.timeout = timeout
+        self.retries = retries
+        self.typedArrays = typedArrays
+        self._endpoint = endpoint or f'tcp://{host}:{port}'
+        self._batchSupported = True
+        
+        self._sockets = []
+        self._ids = itertools.count(1)
+        self._encodedNames = {}
+        self._constants = {}
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        
+        # สถิติการยืม socket
+        self._acquires = 0
+        self._waits = 0
+        self._waitTotal = 0.0
+        self._waitMax = 0.0
+        self._callStats = CallStats()
+        
+        if self.verbose:
+            print(f"Connection pool ({size} sockets) for CoppeliaSim at {self._endpoint}")
+    
+    def __del__(self):
+        """ปิดการเชื่อมต่อเมื่อ object ถูกลบ"""
+        try:
+            self.close()
+        except:
+            pass
+    
+    def close(self):
+        """ปิดทุก socket ใน pool"""
+        with self._lock:
+            for slot in self._sockets:
+                slot.socket.close(linger=0)
+            self._sockets = []
+        if self._ownContext:
+            self.context.term()
+    
+    @contextmanager
+    def lease(self):
+        """ผูก socket หนึ่งตัวกับ thread ปัจจุบันตลอด with block (ซ้อนกันได้)"""
+        slot = getattr(self._local, 'slot', None)
+        if slot is None:
+            slot = self._acquire()
+            self._local.slot = slot
+        slot.depth += 1
+        try:
+            yield slot
+        finally:
+            slot.depth -= 1
+            if slot.depth == 0:
+                self._local.slot = None
+                self._release(slot)
+    
+    def call(self, funcName, args, timeout=None):
+        """
+        เรียกใช้ฟังก์ชันใน CoppeliaSim (thread-safe)
+        
+        Args:
+            funcName: ชื่อฟังก์ชัน เช่น 'sim.startSimulation'
+            args: arguments ของฟังก์ชัน
+            timeout: เวลารอคำตอบ (วินาที) - ไม่ระบุจะใช้ self.timeout
+            
+        Returns:
+            ผลลัพธ์จากฟังก์ชัน
+        """
+        if self.verbose:
+            print(f'Sending: {funcName}({args})')
+        
+        with self.lease() as slot:
+            rawMsg = slot.encoder.encode(funcName, args, next(self._ids))
+            response = self._exchange(slot, rawMsg, funcName, timeout)
+        
+        if response.get('success', False):
+            return response.get('ret')
+        else:
+            error_msg = response.get('error', 'Unknown error')
+            raise Exception(f"Remote function call failed: {error_msg}")
+    
+    def _request(self, msg):
+        with self.lease() as slot:
+            return self._exchange(slot, _dumps(msg, self.typedArrays), _statsKey(msg))
+    
+    def _exchange(self, slot, rawMsg, statsKey, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        attempts = 1 + (self.retries if _isIdempotent(statsKey) else 0)
+        
+        for attempt in range(attempts):
+            start = time.perf_counter()
+            slot.socket.send(rawMsg)
+            responseRaw = _receive(slot.socket, slot.poller, timeout)
+            slot.calls += 1
+            if responseRaw is not None:
+                break
+            
+            self._callStats.increment('timeouts')
+            self._reconnect(slot)
+            if attempt + 1 < attempts:
+                self._callStats.increment('retries')
+        else:
+            raise RemoteAPITimeout(f'{statsKey}: no reply within {timeout}s ({attempts} attempts)')
+        
+        response = _loads(responseRaw)
+        
+        self._callStats.record(statsKey, time.perf_counter() - start,
+                               len(rawMsg), len(responseRaw))
+        
+        if self.verbose:
+            print(f'Received: {response}')
+        
+        return response
+    
+    def batch(self, pipelined=True):
+        """สร้าง batch context (ดู RemoteAPIClient.batch)"""
+        return RemoteAPIBatch(self, pipelined=pipelined and self._batchSupported,
+                              scriptType=_fetchConstants(self, 'sim').get('scripttype_sandboxscript'))
+    
+    def subscribe(self, topics, rate_hz=100, callback=None, maxsize=256):
+        """อ่านสถานะต่อเนื่องใน background ด้วย socket แยกจาก pool (ดู RemoteAPIClient.subscribe)"""
+        return RemoteAPISubscription(self, topics, rate_hz, callback, maxsize)
+    
+    def getObject(self, name):
+        """สร้าง object สำหรับเรียกใช้ฟังก์ชันผ่าน pool"""
+        return RemoteAPIObject(name, self, _fetchConstants(self, name))
+    
+    def stats(self):
+        """
+        สถิติของ pool
+        
+        Returns:
+            dict: size, created, in_use, acquires, waits, wait_total/avg/max (วินาที),
+                  calls_per_socket และ 'remote_calls' (เหมือน RemoteAPIClient.stats())
+        """
+        with self._lock:
+            in_use = sum(1 for slot in self._sockets if slot.owner is not None)
+            return {
+                'size': self.size,
+                'created': len(self._sockets),
+                'in_use': in_use,
+                'acquires': self._acquires,
+                'waits': self._waits,
+                'wait_total': self._waitTotal,
+                'wait_avg': self._waitTotal / self._acquires if self._acquires else 0.0,
+                'wait_max': self._waitMax,
+                'calls_per_socket': {slot.index: slot.calls for slot in self._sockets},
+                'remote_calls': self._callStats.snapshot()
+            }
+    
+    def _acquire(self):
+        start = time.perf_counter()
+        slot = None
+        try:
+            slot = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                if len(self._sockets) < self.size:
+                    socket = self.context.socket(zmq.REQ)
+                    socket.setsockopt(zmq.LINGER, 0)
+                    socket.connect(self._endpoint)
+                    slot = _PooledSocket(len(self._sockets), socket)
+                    slot.encoder = _CallEncoder(self._encodedNames, self.typedArrays)
+                    self._sockets.append(slot)
+        
+        waited = False
+        if slot is None:
+            # pool เต็ม - รอจนมี thread คืน socket
+            slot = self._idle.get()
+            waited = True
+        
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            slot.owner = threading.get_ident()
+            self._acquires += 1
+            if waited:
+                self._waits += 1
+                self._waitTotal += elapsed
+                self._waitMax = max(self._waitMax, elapsed)
+        return slot
+    
+    def _reconnect(self, slot):
+        """สร้าง socket ของ slot ใหม่หลัง timeout"""
+        slot.poller.unregister(slot.socket)
+        slot.socket.close()
+        slot.socket = self.context.socket(zmq.REQ)
+        slot.socket.setsockopt(zmq.LINGER, 0)
+        slot.socket.connect(self._endpoint)
+        slot.poller.register(slot.socket, zmq.POLLIN)
+        self._callStats.increment('reconnects')
+    
+    def _release(self, slot):
+        with self._lock:
+            slot.owner = None
+        self._idle.put(slot)
+
+class AsyncRemoteAPIClient:
+    def __init__(self, host='localhost', port=23000, verbose=None, endpoint=None, timeout=None):
+        """
+        เชื่อมต่อกับ CoppeliaSim แบบ asyncio - ส่งหลายคำสั่งพร้อมกันได้
+        
+        ใช้ DEALER socket แทน REQ จึงไม่ต้องรอคำตอบก่อนส่งคำสั่งถัดไป
+        คำตอบถูกจับคู่กับคำสั่งด้วย 'id' ของ message
+        
+        Usage:
+            client = AsyncRemoteAPIClient()
+            sim = client.getObject('sim')
+            pos, img = await asyncio.gather(
+                sim.getObjectPosition(drone, -1),
+                sim.getStringSignal('image_saved'))
+        
+        Args:
+            host: ที่อยู่ของ CoppeliaSim (ปกติ localhost)
+            port: พอร์ตหลัก (ปกติ 23000)
+            verbose: แสดงข้อความ debug หรือไม่
+            endpoint: ZMQ endpoint แทน host/port (เช่น ipc://)
+            timeout: เวลารอคำตอบสูงสุดต่อคำสั่ง (วินาที, None = รอไม่จำกัด - ค่าเริ่มต้น)
+        """
+        self.context = zmq.asyncio.Context()
+        self.verbose = verbose
+        self.timeout = timeout
+        self._endpoint = endpoint or f'tcp://{host}:{port}'
+        
+        # latency และ bytes ของทุกคำสั่ง (รูปแบบเดียวกับ RemoteAPIClient.stats())
+        self._callStats = CallStats()
+        
+        # RemoteAPIClient แบบ blocking สำหรับดึงค่าคงที่ใน getObject (สร้างเมื่อใช้ครั้งแรก)
+        self._setupClient = None
+        
+        # DEALER socket - ส่งได้หลายคำสั่งโดยไม่ต้องรอคำตอบ
+        self.socket = self.context.socket(zmq.DEALER)
+        self.socket.connect(self._endpoint)
+        
+        # id -> Future ของคำสั่งที่ยังไม่ได้คำตอบ (id เป็นเลขเพิ่มขึ้นแบบเดียวกับ RemoteAPIClient)
+        self._ids = itertools.count(1)
+        self._pending = {}
+        # ลำดับการส่ง (ใช้เมื่อ server ไม่ส่ง id กลับมา - REP ตอบตามลำดับ)
+        self._sendOrder = deque()
+        self._receiver = None
+        
+        if self.verbose:
+            print(f"Connected to CoppeliaSim (async) at {self._endpoint}")
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+        return False
+    
+    async def close(self):
+        """ยกเลิกคำสั่งที่ค้างและปิดการเชื่อมต่อ"""
+        if self._receiver is not None:
+            self._receiver.cancel()
+            try:
+                await self._receiver
+            except asyncio.CancelledError:
+                pass
+            self._receiver = None
+        self._failPending(ConnectionError('Client closed'))
+        if self._setupClient is not None:
+            self._setupClient.socket.close()
+            if hasattr(self._setupClient, 'cntSocket'):
+                self._setupClient.cntSocket.close()
+            self._setupClient = None
+        self.socket.close()
+        self.context.term()
+    
+    def pending_count(self):
+        """จำนวนคำสั่งที่ยังรอคำตอบ"""
+        return len(self._pending)
+    
+    def stats(self):
+        """สถิติการเรียกใช้แยกตามฟังก์ชัน (เหมือน RemoteAPIClient.stats())"""
+        return self._callStats.snapshot()
+    
+    def reset_stats(self):
+        """ล้างสถิติการเรียกใช้"""
+        self._callStats.reset()
+    
+    async def call(self, funcName, args, timeout=None):
+        """
+        เรียกใช้ฟังก์ชันใน CoppeliaSim (awaitable)
+        
+        Args:
+            funcName: ชื่อฟังก์ชัน เช่น 'sim.startSimulation'
+            args: arguments ของฟังก์ชัน
+            timeout: เวลารอคำตอบ (วินาที) - ไม่ระบุจะใช้ self.timeout
+            
+        Returns:
+            ผลลัพธ์จากฟังก์ชัน
+            
+        Raises:
+            RemoteAPITimeout: ไม่ได้รับคำตอบภายในเวลาที่กำหนด
+        """
+        if self._receiver is None:
+            self._receiver = asyncio.ensure_future(self._receiveLoop())
+        
+        reqId = next(self._ids)
+        msg = {
+            'func': funcName,
+            'args': args,
+            'id': reqId
+        }
+        
+        future = asyncio.get_running_loop().create_future()
+        self._pending[reqId] = future
+        self._sendOrder.append(reqId)
+        
+        if self.verbose:
+            print(f'Sending: {funcName}({args})')
+        
+        timeout = self.timeout if timeout is None else timeout
+        rawMsg = _dumps(msg)
+        start = time.perf_counter()
+        
+        # frame ว่างนำหน้า = delimiter ที่ REP socket ฝั่ง server ต้องการ
+        # (ลงทะเบียน Future ก่อนส่งเพื่อไม่ให้คำตอบมาถึงก่อน - ส่งไม่สำเร็จต้องถอนออก)
+        try:
+            await self.socket.send_multipart([b'', rawMsg])
+        except BaseException:
+            self._pending.pop(reqId, None)
+            if reqId in self._sendOrder:
+                self._sendOrder.remove(reqId)
+            raise
+        try:
+            response, received = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            # เลิกรอ - id ยังอยู่ใน _sendOrder เพื่อให้คำตอบที่มาช้าไม่ถูกจับคู่กับคำสั่งอื่น
+            self._pending.pop(reqId, None)
+            self._callStats.increment('timeouts')
+            raise RemoteAPITimeout(f'{funcName}: no reply within {timeout}s') from None
+        self._callStats.record(funcName, time.perf_counter() - start, len(rawMsg), received)
+        
+        if response.get('success', False):
+            return response.get('ret')
+        else:
+            error_msg = response.get('error', 'Unknown error')
+            raise Exception(f"Remote function call failed: {error_msg}")
+    
+    def getObject(self, name):
+        """
+        สร้าง object สำหรับเรียกใช้ฟังก์ชัน - ทุก method คืน awaitable
+        
+        ค่าคงที่ (เช่น sim.primitiveshape_cuboid) ถูกดึงแบบ blocking ครั้งเดียวต่อชื่อ
+        ผ่าน RemoteAPIClient ที่ใช้ timeout และสถิติร่วมกับ client นี้
+        
+        Args:
+            name: ชื่อ object เช่น 'sim'
+        """
+        return RemoteAPIObject(name, self, _fetchConstants(self._blockingClient(), name))
+    
+    def _blockingClient(self):
+        """RemoteAPIClient ไปยัง endpoint เดียวกัน (context ร่วม - ใช้กับ inproc:// ได้)"""
+        if self._setupClient is None:
+            context = zmq.Context.shadow(self.context.underlying)
+            self._setupClient = RemoteAPIClient(endpoint=self._endpoint, verbose=self.verbose,
+                                                timeout=self.timeout, context=context)
+            self._setupClient._callStats = self._callStats
+        return self._setupClient
+    
+    async def _receiveLoop(self):
+        """รับคำตอบทั้งหมดแล้วส่งต่อให้ Future ที่ตรงกับ id"""
+        try:
+            while True:
+                frames = await self.socket.recv_multipart()
+                response = _loads(frames[-1])
+                
+                if self.verbose:
+                    print(f'Received: {response}')
+                
+                reqId = response.get('id')
+                if reqId not in self._pending and reqId not in self._sendOrder:
+                    # server ไม่ส่ง id กลับ - REP ตอบตามลำดับที่ส่ง
+                    if not self._sendOrder:
+                        continue
+                    reqId = self._sendOrder[0]
+                
+                self._sendOrder.remove(reqId)
+                # ไม่มี Future = คำสั่งที่ timeout ไปแล้ว ทิ้งคำตอบ
+                future = self._pending.pop(reqId, None)
+                if future is not None and not future.done():
+                    future.set_result((response, len(frames[-1])))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._failPending(e)
+            self._receiver = None
+    
+    def _failPending(self, error):
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
+        self._sendOrder.clear()
+
+class BatchResult:
+    def __init__(self, batch, index, funcName):
+        """
+        ผลลัพธ์ที่ยังไม่ได้รับ (deferred) ของคำสั่งใน batch
+        
+        Args:
+            batch: RemoteAPIBatch ที่เป็นเจ้าของ
+            index: ลำดับของคำสั่งใน batch
+            funcName: ชื่อฟังก์ชัน
+        """
+        self._batch = batch
+        self.index = index
+        self.funcName = funcName
+        self._done = False
+        self._value = None
+        self._error = None
+        self._callbacks = []
+    
+    def done(self):
+        """ตรวจสอบว่าได้รับผลลัพธ์แล้วหรือยัง"""
+        return self._done
+    
+    def exception(self):
+        """error ของคำสั่งนี้ (None ถ้าสำเร็จ) - ส่ง batch ทันทีถ้ายังไม่ได้ส่ง"""
+        if not self._done:
+            self._batch.flush()
+        return self._error
+    
+    def add_done_callback(self, callback):
+        """เรียก callback(result) เมื่อได้ผลลัพธ์ (ทันทีถ้าได้แล้ว) - เช่นแจ้งผลหลังส่ง batch"""
+        if self._done:
+            callback(self)
+        else:
+            self._callbacks.append(callback)
+    
+    def result(self):
+        """คืนผลลัพธ์ (ส่ง batch ทันทีถ้ายังไม่ได้ส่ง)"""
+        if not self._done:
+            self._batch.flush()
+        if self._error is not None:
+            raise self._error
+        return self._value
+    
+    def _set(self, value=None, error=None):
+        self._value = value
+        self._error = error
+        self._done = True
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback(self)
+    
+    def __repr__(self):
+        state = repr(self._value) if self._done else 'pending'
+        return f'<BatchResult #{self.index} {self.funcName}: {state}>'
+
+class RemoteAPIBatch:
+    # key ที่ใช้แทน handle ที่ได้จากคำสั่งก่อนหน้าใน batch เดียวกัน
+    REF_KEY = '@ref'
+    
+    # Lua helper ที่ติดตั้งใน sandbox script ด้วย sim.executeScriptString - รันคำสั่งทั้ง batch
+    # ฝั่ง simulator (แต่ละคำสั่งใน pcall, @ref เป็น index เริ่มที่ 0) แล้วคืน {ok, ค่าแรก}
+    # หรือ {false, error} ของทุกคำสั่ง
+    SCRIPT_FUNCTION = 'remoteApiBatch'
+    SCRIPT = """
+function remoteApiBatch(calls)
+    local results, failed, out = {}, {}, {}
+    local function resolve(value)
+        if type(value) ~= 'table' then return value end
+        local ref = value['@ref']
+        if ref ~= nil then
+            if failed[ref] then error('depends on failed call #' .. ref, 0) end
+            return results[ref]
+        end
+        local copy = {}
+        for k, v in pairs(value) do copy[k] = resolve(v) end
+        return copy
+    end
+    for i, call in ipairs(calls) do
+        local ok, value = pcall(function()
+            local f = _G
+            for name in string.gmatch(call.func, '[^.]+') do f = f[name] end
+            return f(table.unpack(resolve(call.args), 1, call.n))
+        end)
+        if ok then
+            results[i - 1] = value
+            out[i] = {true, value}
+        else
+            failed[i - 1] = true
+            out[i] = {false, tostring(value)}
+        end
+    end
+    return out
+end
+"""
+    
+    def __init__(self, client, pipelined=True, scriptType=None):
+        """
+        รวมหลายคำสั่งเป็น multi-call message เดียว
+        
+        คำสั่งภายใน batch คืน BatchResult ซึ่งส่งต่อเป็น argument ของ
+        คำสั่งถัดไปใน batch เดียวกันได้ (เช่น handle จาก createPrimitiveShape)
+        
+        คำสั่งที่ล้มเหลวไม่หยุดคำสั่งอื่นใน batch - error อยู่ใน BatchResult ของคำสั่งนั้น
+        (result() raise) และคำสั่งที่ใช้ผลของมันเป็น argument จะล้มเหลวตามโดยไม่ถูกรัน
+        
+        server ที่ไม่รู้จัก multi-call (CoppeliaSim จริง) ยังส่งได้ใน round trip เดียว: ติดตั้ง
+        SCRIPT ใน sandbox script ครั้งแรก แล้วส่งทั้ง batch เป็น sim.callScriptFunction เดียว
+        (ใช้ได้กับ client ทางการด้วย) - ติดตั้งไม่ได้จึงส่งทีละคำสั่ง
+        
+        Args:
+            client: RemoteAPIClient (หรือ client ใดๆ ที่มี call(funcName, args))
+            pipelined: True = ส่งเป็น multi-call message, False = ใช้ Lua helper หรือส่งทีละคำสั่ง
+            scriptType: ค่า sim.scripttype_sandboxscript ของ simulator (None = ไม่ใช้ Lua helper)
+        """
+        self._client = client
+        self.pipelined = pipelined
+        self.scriptType = scriptType
+        self._calls = []
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        # ถ้ามี exception ภายใน with block ให้ทิ้งคำสั่งที่ค้างไว้
+        if exc_type is None:
+            self.flush()
+        else:
+            self._calls = []
+        return False
+    
+    def __len__(self):
+        return len(self._calls)
+    
+    def call(self, funcName, args):
+        """เพิ่มคำสั่งเข้า batch แล้วคืน BatchResult"""
+        result = BatchResult(self, len(self._calls), funcName)
+        self._calls.append((funcName, args, result))
+        return result
+    
+    def getObject(self, name):
+        """สร้าง object ที่เรียกใช้ฟังก์ชันผ่าน batch นี้"""
+        constants = getattr(self._client, '_constants', {}).get(name)
+        return RemoteAPIObject(name, self, constants)
+    
+    def flush(self):
+        """
+        ส่งคำสั่งทั้งหมดที่ค้างอยู่
+        
+        Returns:
+            list: ผลลัพธ์ของแต่ละคำสั่งตามลำดับ (None สำหรับคำสั่งที่ล้มเหลว)
+            
+        Raises:
+            RemoteAPITimeout: ไม่ได้รับคำตอบ (error ของแต่ละคำสั่งไม่ raise จากที่นี่)
+        """
+        calls, self._calls = self._calls, []
+        if not calls:
+            return []
+        
+        if self.pipelined:
+            self._flushPipelined(calls)
+        else:
+            self._flushUnpipelined(calls)
+        
+        return [result._value for _, _, result in calls]
+    
+    def _flushUnpipelined(self, calls):
+        """ส่งผ่าน Lua helper ถ้าใช้ได้ ไม่เช่นนั้นส่งทีละคำสั่ง"""
+        if self.scriptType is not None and self._installScript():
+            self._flushScript(calls)
+        else:
+            self._flushSequential(calls)
+    
+    def _flushPipelined(self, calls):
+        """ส่งทุกคำสั่งใน message เดียว"""
+        msg = {
+            'batch': [
+                {'func': funcName, 'args': self._encodeArgs(args)}
+                for funcName, args, _ in calls
+            ],
+            'id': next(self._client._ids)
+        }
+        
+        if self._client.verbose:
+            print(f'Sending batch: {len(calls)} calls')
+        
+        # timeout ไม่ได้แปลว่า server ไม่รองรับ multi-call (อาจแค่ช้าและรัน batch ไปแล้ว)
+        # จึงปล่อย RemoteAPITimeout ออกไป - ส่งซ้ำทีละคำสั่งอาจสร้างวัตถุซ้ำทั้งสนาม
+        response = self._client._request(msg)
+        
+        if response.get('success', False):
+            # errors: [[index, ข้อความ], ...] ของคำสั่งที่ล้มเหลว - คำสั่งอื่นยังถูกรัน
+            errors = {index: message for index, message in response.get('errors', [])}
+            for i, ((funcName, _, result), value) in enumerate(zip(calls, response.get('ret', []))):
+                if i in errors:
+                    result._set(error=Exception(f'Remote function call failed: {errors[i]}'))
+                else:
+                    result._set(value)
+            return
+        
+        if 'index' not in response:
+            # server ไม่รู้จัก multi-call (ตอบ error ทั้ง message) - ยังไม่มีคำสั่งใดถูกรัน
+            # จึงส่งทีละคำสั่งแทน
+            self._client._batchSupported = False
+            self.pipelined = False
+            self._flushUnpipelined(calls)
+            return
+        
+        # server ที่หยุดทั้ง batch ที่คำสั่งแรกที่ล้มเหลว (index) - คำสั่งหลังจากนั้นไม่ถูกรัน
+        failed = response['index']
+        values = response.get('ret', [])
+        error = Exception(f"Remote function call failed: {response.get('error', 'Unknown error')}")
+        for i, (funcName, _, result) in enumerate(calls):
+            if i < failed and i < len(values):
+                result._set(values[i])
+            elif i == failed:
+                result._set(error=error)
+            else:
+                result._set(error=Exception(f'{funcName} not executed: batch aborted at #{failed}'))
+    
+    def _installScript(self):
+        """ติดตั้ง Lua helper ใน sandbox script (ครั้งเดียวต่อ client) - คืน True ถ้าใช้ได้"""
+        client = self._client
+        installed = getattr(client, '_batchScript', None)
+        if installed is None:
+            try:
+                # CoppeliaSim 4.6+ ต้องใช้ handle ของ sandbox script - รุ่นก่อนหน้าใช้ script type
+                try:
+                    self.scriptType = client.call('sim.getScript', [self.scriptType])
+                except RemoteAPITimeout:
+                    raise
+                except Exception:
+                    pass
+                client.call('sim.executeScriptString', [self.SCRIPT, self.scriptType])
+                installed = True
+            except RemoteAPITimeout:
+                raise
+            except Exception as e:
+                if getattr(client, 'verbose', False):
+                    print(f'Batch script not available, sending calls one by one: {e}')
+                installed = False
+            client._batchScript = installed
+            client._batchScriptHandle = self.scriptType
+        self.scriptType = getattr(client, '_batchScriptHandle', self.scriptType)
+        return installed
+    
+    def _flushScript(self, calls):
+        """ส่งทุกคำสั่งใน sim.callScriptFunction ครั้งเดียว (ใช้กับ CoppeliaSim จริงได้)"""
+        payload = [
+            {'func': funcName, 'args': self._encodeArgs(list(args)), 'n': len(args)}
+            for funcName, args, _ in calls
+        ]
+        
+        if getattr(self._client, 'verbose', False):
+            print(f'Sending batch through {self.SCRIPT_FUNCTION}: {len(calls)} calls')
+        
+        try:
+            entries = self._client.call('sim.callScriptFunction',
+                                        [self.SCRIPT_FUNCTION, self.scriptType, payload])
+        except RemoteAPITimeout:
+            raise
+        except Exception as e:
+            # helper หายไป (เช่น sandbox ถูก reset) - ยังไม่มีคำสั่งใดถูกรัน
+            if getattr(self._client, 'verbose', False):
+                print(f'Batch script failed, sending calls one by one: {e}')
+            self._client._batchScript = False
+            self._flushSequential(calls)
+            return
+        
+        # server ทางการห่อค่าที่คืนเป็น list เมื่อเรียกผ่าน RemoteAPIClient ของไฟล์นี้
+        if entries and isinstance(entries[0], list) and entries[0] and not isinstance(entries[0][0], bool):
+            entries = entries[0]
+        
+        for (funcName, _, result), entry in zip(calls, entries):
+            if entry[0]:
+                result._set(entry[1] if len(entry) > 1 else None)
+            else:
+                result._set(error=Exception(f'Remote function call failed: {entry[1]}'))
+    
+    def _flushSequential(self, calls):
+        """ส่งทีละคำสั่ง (สำหรับ server ที่ไม่รองรับ multi-call) - ข้ามเฉพาะคำสั่งที่ล้มเหลว"""
+        for funcName, args, result in calls:
+            try:
+                args = self._resolveArgs(args)
+            except Exception as e:
+                result._set(error=Exception(f'{funcName} not executed: depends on a failed call ({e})'))
+                continue
+            try:
+                result._set(self._client.call(funcName, args))
+            except RemoteAPITimeout:
+                raise
+            except Exception as e:
+                result._set(error=e)
+    
+    def _encodeArgs(self, value):
+        """แทน BatchResult ที่ยังค้างด้วย reference ไปยังคำสั่งใน message เดียวกัน"""
+        if isinstance(value, BatchResult):
+            if value._batch is self and not value._done:
+                return {self.REF_KEY: value.index}
+            return value.result()
+        if isinstance(value, (list, tuple)):
+            return [self._encodeArgs(v) for v in value]
+        if isinstance(value, dict):
+            return {k: self._encodeArgs(v) for k, v in value.items()}
+        return value
+    
+    def _resolveArgs(self, value):
+        """แทน BatchResult ด้วยค่าจริงที่ได้รับแล้ว"""
+        if isinstance(value, BatchResult):
+            return value.result()
+        if isinstance(value, (list, tuple)):
+            return [self._resolveArgs(v) for v in value]
+        if isinstance(value, dict):
+            return {k: self._resolveArgs(v) for k, v in value.items()}
+        return value
+
+class HandleCache:
+    def __init__(self, client):
+        """
+        cache ของ object handle ตาม path - resolve ด้วย sim.getObject ครั้งเดียวต่อ path
+        
+        path ที่ไม่มีใน scene ก็ถูกจำไว้ (negative cache) ครั้งถัดไปจึงไม่ต้องรอ error
+        จาก simulator - ต้องเรียก invalidate() เมื่อ scene เปลี่ยน (ลบ object, โหลดโมเดล,
+        เริ่ม/หยุด simulation)
+        
+        Args:
+            client: remote API client ใดก็ได้ที่มี call(funcName, args)
+        """
+        self._client = client
+        self._handles = {}
+        self._missing = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.invalidations = 0
+    
+    @classmethod
+    def of(cls, client):
+        """cache ที่ใช้ร่วมกันของ client (สร้างและผูกกับ client ครั้งแรกที่เรียก)"""
+        cache = getattr(client, '_handleCache', None)
+        if cache is None:
+            cache = client._handleCache = cls(client)
+        return cache
+    
+    def resolve(self, path):
+        """
+        handle ของ object ที่ path
+        
+        Raises:
+            Exception: เดียวกับที่ sim.getObject แจ้งเมื่อไม่พบ object (รวมถึงครั้งที่มาจาก cache)
+        """
+        with self._lock:
+            handle = self._handles.get(path)
+            if handle is not None:
+                self.hits += 1
+                return handle
+            error = self._missing.get(path)
+            if error is not None:
+                self.negative_hits += 1
+                raise error
+            self.misses += 1
+        
+        try:
+            handle = self._client.call('sim.getObject', [path])
+        except RemoteAPITimeout:
+            # simulator ไม่ตอบ - ไม่ได้แปลว่าไม่มี object จึงไม่จำไว้
+            raise
+        except Exception as e:
+            with self._lock:
+                self._missing[path] = e
+            raise
+        
+        with self._lock:
+            self._handles[path] = handle
+        return handle
+    
+    def resolve_first(self, paths):
+        """
+        path แรกที่มีอยู่ใน scene
+        
+        Returns:
+            (path, handle) หรือ (None, None) ถ้าไม่พบเลย
+        """
+        for path in paths:
+            try:
+                return path, self.resolve(path)
+            except RemoteAPITimeout:
+                raise
+            except Exception:
+                continue
+        return None, None
+    
+    def invalidate(self, path=None):
+        """ล้าง cache ทั้งหมด (หรือเฉพาะ path)"""
+        with self._lock:
+            if path is None:
+                self._handles.clear()
+                self._missing.clear()
+            else:
+                self._handles.pop(path, None)
+                self._missing.pop(path, None)
+            self.invalidations += 1
+    
+    def stats(self):
+        """จำนวน hits, misses, negative_hits, invalidations และจำนวน path ใน cache"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'negative_hits': self.negative_hits,
+                'invalidations': self.invalidations,
+                'cached': len(self._handles),
+                'missing': len(self._missing),
+            }
+
+class RemoteAPISubscription:
+    # คำสั่งที่อ่านค่าของแต่ละชนิด topic: (ชื่อ field ในค่า, ฟังก์ชัน, args ต่อจาก handle)
+    READERS = {
+        'pose': [('position', 'sim.getObjectPosition', [-1]),
+                 ('orientation', 'sim.getObjectOrientation', [-1])],
+        'position': [(None, 'sim.getObjectPosition', [-1])],
+        'orientation': [(None, 'sim.getObjectOrientation', [-1])],
+        'proximity': [(None, 'sim.readProximitySensor', [])],
+    }
+    
+    # เวลารอคำตอบต่อรอบเมื่อ client ไม่ได้ตั้ง timeout (วินาที)
+    DEFAULT_TIMEOUT = 1.0
+    
+    # ค่าแทนผลของคำสั่งอ่านที่ล้มเหลว - topic ที่มีค่านี้ไม่ถูกอัปเดตในรอบนั้น
+    _FAILED = object()
+    
+    def __init__(self, client, topics, rate_hz=100, callback=None, maxsize=256):
+        """
+        อ่านสถานะใน background ด้วย socket แยก แล้วเก็บค่าล่าสุดของแต่ละ topic ไว้ในเครื่อง
+        
+        ทุกรอบส่งคำสั่งอ่านของทุก topic เป็น multi-call message เดียว (1 round trip ต่อรอบ)
+        ผู้ใช้อ่านค่าจาก latest() โดยไม่ต้องรอ round trip และไม่แย่ง socket หลัก
+        
+        Args:
+            client: RemoteAPIClient หรือ RemoteAPIClientPool (ใช้ resolve handle และ endpoint)
+            topics: list ของ 'ชนิด:path' เช่น 'pose:/Quadcopter',
+                    'proximity:/Quadcopter/proximitySensor' (ชนิดดูได้จาก READERS)
+            rate_hz: จำนวนรอบอ่านต่อวินาที
+            callback: ฟังก์ชัน callback(topic, value, timestamp) เรียกจาก worker thread
+            maxsize: ขนาด queue ของ updates (เต็มแล้วทิ้งค่าเก่าสุด)
+        """
+        if rate_hz <= 0:
+            raise ValueError('rate_hz must be positive')
+        
+        self.topics = list(topics)
+        self.rate_hz = rate_hz
+        self.callback = callback
+        self.updates = queue.Queue(maxsize)
+        self.verbose = client.verbose
+        self._endpoint = client._endpoint
+        self._context = client.context
+        # อ่านค่าอย่างเดียว - รอไม่จำกัดไม่ได้ (stop() จะค้างถ้า simulator หยุดตอบ)
+        self._timeout = client.timeout if client.timeout is not None else self.DEFAULT_TIMEOUT
+        self._batchSupported = client._batchSupported
+        self._typedArrays = client.typedArrays
+        self._ids = itertools.count(1)
+        
+        # (topic, field, funcName, args) ของทุกคำสั่งที่อ่านในแต่ละรอบ
+        handles = HandleCache.of(client)
+        self._reads = []
+        for topic in self.topics:
+            kind, _, path = topic.partition(':')
+            if kind not in self.READERS or not path:
+                raise ValueError(f'Unknown topic: {topic} (expected one of {list(self.READERS)}:<path>)')
+            handle = handles.resolve(path)
+            for field, funcName, extra in self.READERS[kind]:
+                self._reads.append((topic, field, funcName, [handle] + extra))
+        
+        # ค่าล่าสุด: topic -> (value, timestamp) - timestamp คือเวลาที่ส่งคำสั่งอ่าน
+        self._latest = {}
+        # ตัวนับแก้จาก worker thread (และ callback) แต่ stats() อ่านจาก thread อื่น
+        self._lock = threading.Lock()
+        self.ticks = 0
+        self.dropped = 0
+        self.overruns = 0
+        self.errors = 0
+        self.timeouts = 0
+        self._latency = LatencyHistogram()
+        self._startedAt = time.perf_counter()
+        
+        self._running = threading.Event()
+        self._running.set()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        return False
+    
+    def latest(self, topic, since=None):
+        """
+        ค่าล่าสุดของ topic (ไม่มีการสื่อสารกับ simulator)
+        
+        Args:
+            topic: ชื่อ topic ตามที่ subscribe
+            since: เวลา time.perf_counter() - ไม่คืนค่าที่อ่านก่อนเวลานี้
+            
+        Returns:
+            ค่าล่าสุด หรือ None ถ้ายังไม่มีค่า (หรือค่าเก่ากว่า since)
+        """
+        sample = self._latest.get(topic)
+        if sample is None or (since is not None and sample[1] < since):
+            return None
+        return sample[0]
+    
+    def get(self, timeout=None):
+        """รอ update ถัดไปจาก queue - คืน (topic, value, timestamp) หรือ None เมื่อหมดเวลา"""
+        try:
+            return self.updates.get(timeout=timeout)
+        except queue.Empty:
+            return None
+    
+    def stop(self):
+        """หยุด worker thread"""
+        self._running.clear()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+    
+    @property
+    def running(self):
+        return self._running.is_set()
+    
+    def stats(self):
+        """
+        สถิติของ subscription: จำนวนรอบ, อัตราที่ทำได้จริง, latency ต่อรอบ,
+        updates ที่ถูกทิ้ง, รอบที่เกินเวลา (overruns), timeouts และ errors
+        """
+        with self._lock:
+            elapsed = time.perf_counter() - self._startedAt
+            return {
+                'topics': list(self.topics),
+                'rate_hz': self.rate_hz,
+                'ticks': self.ticks,
+                'achieved_hz': self.ticks / elapsed if elapsed > 0 else 0.0,
+                'latency': self._latency.snapshot(),
+                'dropped': self.dropped,
+                'overruns': self.overruns,
+                'timeouts': self.timeouts,
+                'errors': self.errors,
+            }
+    
+    def _run(self):
+        socket, poller = self._open()
+        period = 1.0 / self.rate_hz
+        deadline = time.perf_counter()
+        try:
+            while self._running.is_set():
+                start = time.perf_counter()
+                values = self._poll(socket, poller)
+                if values is None:
+                    # หมดเวลา - REQ socket ค้างสถานะ ต้องสร้างใหม่
+                    self._count('timeouts')
+                    socket.close()
+                    socket, poller = self._open()
+                else:
+                    with self._lock:
+                        self._latency.record(time.perf_counter() - start)
+                    self._publish(values, start)
+                    self._count('ticks')
+                
+                deadline += period
+                delay = deadline - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    # ช้ากว่ากำหนด - ข้ามรอบที่พลาดไปแทนการรัวส่งเพื่อไล่ตาม
+                    self._count('overruns')
+                    deadline = time.perf_counter()
+        finally:
+            socket.close()
+    
+    def _open(self):
+        socket = self._context.socket(zmq.REQ)
+        socket.setsockopt(zmq.LINGER, 0)
+        socket.connect(self._endpoint)
+        poller = zmq.Poller()
+        poller.register(socket, zmq.POLLIN)
+        return socket, poller
+    
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+    
+    def _poll(self, socket, poller):
+        """อ่านค่าของทุกคำสั่งหนึ่งรอบ - คืน list ของผลลัพธ์ หรือ None เมื่อหมดเวลา
+        
+        คำสั่งที่ล้มเหลวได้ค่า _FAILED (ไม่กระทบคำสั่งอื่นในรอบเดียวกัน)
+        """
+        if self._batchSupported:
+            msg = {
+                'batch': [{'func': funcName, 'args': args} for _, _, funcName, args in self._reads],
+                'id': next(self._ids)
+            }
+            response = self._roundTrip(socket, poller, msg)
+            if response is None:
+                return None
+            if response.get('success', False):
+                values = list(response.get('ret', []))
+                # คำสั่งที่ล้มเหลวใน multi-call: 'errors' = [[index, ข้อความ], ...]
+                for index, error in response.get('errors', []):
+                    self._fail(error)
+                    if index < len(values):
+                        values[index] = self._FAILED
+                return values
+            if 'index' in response:
+                self._fail(response.get('error', 'Unknown error'))
+                return []
+            # server ไม่รู้จัก multi-call - อ่านทีละคำสั่งแทน
+            self._batchSupported = False
+        
+        values = []
+        for _, _, funcName, args in self._reads:
+            response = self._roundTrip(socket, poller, {'func': funcName, 'args': args, 'id': next(self._ids)})
+            if response is None:
+                return None
+            if not response.get('success', False):
+                self._fail(response.get('error', 'Unknown error'))
+                values.append(self._FAILED)
+                continue
+            values.append(response.get('ret'))
+        return values
+    
+    def _roundTrip(self, socket, poller, msg):
+        socket.send(_dumps(msg, self._typedArrays))
+        responseRaw = _receive(socket, poller, self._timeout)
+        if responseRaw is None:
+            return None
+        return _loads(responseRaw)
+    
+    def _fail(self, error):
+        self._count('errors')
+        if self.verbose:
+            print(f'Subscription read failed: {error}')
+    
+    def _publish(self, values, timestamp):
+        """รวมผลลัพธ์ตาม topic แล้วเก็บเป็นค่าล่าสุด / ส่งเข้า queue และ callback"""
+        samples = {}
+        failed = set()
+        for (topic, field, _, _), value in zip(self._reads, values):
+            if value is self._FAILED:
+                failed.add(topic)
+            elif field is None:
+                samples[topic] = value
+            else:
+                samples.setdefault(topic, {})[field] = value
+        
+        for topic, value in samples.items():
+            if topic in failed:
+                continue
+            self._latest[topic] = (value, timestamp)
+            update = (topic, value, timestamp)
+            while True:
+                try:
+                    self.updates.put_nowait(update)
+                    break
+                except queue.Full:
+                    # ทิ้ง update เก่าสุด - ผู้ใช้สนใจค่าล่าสุดมากกว่า
+                    try:
+                        self.updates.get_nowait()
+                        self._count('dropped')
+                    except queue.Empty:
+                        pass
+            if self.callback is not None:
+                try:
+                    self.callback(topic, value, timestamp)
+                except Exception as e:
+                    self._count('errors')
+                    if self.verbose:
+                        print(f'Subscription callback failed: {e}')